@@ -0,0 +1,60 @@
+"""Cold-start import time of the library and the GUI.
+
+Runs ``python -X importtime -c "import <module>"`` in fresh interpreters and
+reports the median cumulative import time of each module, plus the heaviest
+imports it pulled in. ``rossfilter`` and ``rossfilter.gui`` must not load
+xraydb, scipy or matplotlib; those are deferred until first use / first paint.
+
+Usage:
+    python benchmarks/bench_import.py [--repeat 5] [--budget-ms 500]
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ["rossfilter", "rossfilter.gui", "rossfilter.calculator"]
+DEFERRED = {"rossfilter": ("xraydb", "scipy", "matplotlib"),
+            "rossfilter.gui": ("xraydb", "scipy", "matplotlib")}
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """Cumulative import time in microseconds of every module loaded by ``import module``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    profile = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=None,
+                        help="fail if a module guarded in DEFERRED takes longer than this")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        median_ms = statistics.median(r[module] for r in runs) / 1e3
+        heaviest = sorted(((n, us) for n, us in runs[-1].items() if n != module), key=lambda kv: -kv[1])[:5]
+        print(f"{module:24s} {median_ms:8.1f} ms   heaviest: "
+              + ", ".join(f"{name} {us / 1e3:.0f} ms" for name, us in heaviest))
+
+        loaded = [m for m in DEFERRED.get(module, ()) if m in runs[-1]]
+        if loaded:
+            print(f"  ERROR: importing {module} loaded {', '.join(loaded)}")
+            failed = True
+        if args.budget_ms is not None and module in DEFERRED and median_ms > args.budget_ms:
+            print(f"  ERROR: {module} exceeds budget of {args.budget_ms:.0f} ms")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
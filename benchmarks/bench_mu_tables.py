@@ -0,0 +1,62 @@
+"""Validate interpolated mu tables against direct xraydb evaluation.
+
+Builds a MuTable for every named xraydb material and reports the maximum
+relative error on a fine log grid, excluding the +/- EDGE_RTOL bracket
+around each absorption edge (where the jump position is only known to
+that precision).
+
+Usage:
+    python benchmarks/bench_mu_tables.py [--rtol 1e-4] [--points 50000]
+"""
+import argparse
+import time
+
+import numpy as np
+import xraydb
+
+from rossfilter.mu_table import EDGE_RTOL, ELAM_MAX_EV, ELAM_MIN_EV, MuTable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtol", type=float, default=1e-4, help="table accuracy bound")
+    parser.add_argument("--points", type=int, default=50_000, help="validation grid size")
+    args = parser.parse_args()
+
+    energy = np.geomspace(ELAM_MIN_EV, ELAM_MAX_EV, args.points)
+    worst = (0.0, "", 0.0)
+    t_build = t_table = t_direct = 0.0
+    sizes = []
+
+    for name in sorted(xraydb.get_materials()):
+        t0 = time.perf_counter()
+        table = MuTable(name, rtol=args.rtol)
+        t1 = time.perf_counter()
+        approx = table(energy)
+        t2 = time.perf_counter()
+        direct = xraydb.material_mu(name, energy)
+        t3 = time.perf_counter()
+        t_build += t1 - t0
+        t_table += t2 - t1
+        t_direct += t3 - t2
+        sizes.append(len(table))
+
+        err = np.abs(approx / direct - 1.0)
+        for edge in table.edges:
+            err[(energy > edge * (1 - EDGE_RTOL)) & (energy < edge * (1 + EDGE_RTOL))] = 0.0
+        i = int(np.argmax(err))
+        print(f"{name:24s} points={len(table):5d} max_rel_err={err[i]:.2e} at {energy[i]:.1f} eV")
+        if err[i] > worst[0]:
+            worst = (float(err[i]), name, float(energy[i]))
+
+    print()
+    print(f"materials:          {len(sizes)}")
+    print(f"table points:       median {int(np.median(sizes))}, max {max(sizes)}")
+    print(f"build time (total): {t_build:.2f} s")
+    print(f"lookup time:        {t_table:.3f} s table vs {t_direct:.3f} s direct "
+          f"({t_direct / t_table:.1f}x)")
+    print(f"max relative error: {worst[0]:.2e} ({worst[1]} at {worst[2]:.1f} eV), rtol={args.rtol:g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Scaling of parallel channel evaluation with worker count.
+
+Builds several channels over distinct materials on a fine grid and times
+RossFilterCalculator.calculate_transmission serially and with thread and
+process pools of increasing size (the attenuation cache is cleared before
+every run).
+
+Usage:
+    python benchmarks/bench_parallel.py [--step 0.005] [--split materials|energy]
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from rossfilter.attenuation import get_attenuation_cache
+from rossfilter.calculator import RossFilterCalculator
+
+MATERIALS = ["Be", "Al", "Cu", "kapton", "lead", "silicon", "iron", "nickel"]
+
+
+def build() -> RossFilterCalculator:
+    calc = RossFilterCalculator()
+    for i, material in enumerate(MATERIALS):
+        idx = calc.add_channel()
+        calc.add_filter_to_channel(idx, "Be", 25.0)
+        calc.add_filter_to_channel(idx, material, 5.0 + i)
+    return calc
+
+
+def run(args, executor=None, workers=None):
+    get_attenuation_cache().clear()
+    calc = build()
+    t0 = time.perf_counter()
+    ok, result = calc.calculate_transmission(args.start, args.stop, args.step, executor=executor,
+                                             max_workers=workers, split=args.split)
+    elapsed = time.perf_counter() - t0
+    if not ok:
+        raise SystemExit(result)
+    return elapsed, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=float, default=1.0, help="start energy (keV)")
+    parser.add_argument("--stop", type=float, default=50.0, help="stop energy (keV)")
+    parser.add_argument("--step", type=float, default=0.005, help="step (keV)")
+    parser.add_argument("--split", choices=["materials", "energy"], default="energy")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, *(2 ** k for k in range(1, 7) if 2 ** k <= cpus), cpus})
+
+    run(args)  # warm up xraydb's table cache so the serial timing is fair
+    t_serial, reference = run(args)
+    print(f"grid points: {reference.energies_ev.size}, channels: {len(MATERIALS)}, cpus: {cpus}")
+    print(f"serial              {t_serial:8.3f} s")
+    for kind in ("thread", "process"):
+        for n in counts:
+            elapsed, result = run(args, kind, n)
+            same = all(np.array_equal(a, b) for a, b in zip(reference.transmissions, result.transmissions))
+            print(f"{kind:7s} x{n:<3d}        {elapsed:8.3f} s  speedup {t_serial / elapsed:5.2f}x  identical={same}")
+
+
+if __name__ == "__main__":
+    main()
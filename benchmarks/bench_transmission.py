@@ -0,0 +1,55 @@
+"""Compare the per-point and vectorized channel transmission paths.
+
+Usage:
+    python benchmarks/bench_transmission.py [--start 0.1] [--stop 100] [--step 0.001]
+"""
+import argparse
+import time
+
+import numpy as np
+import xraydb
+
+from rossfilter.filter import Channel
+
+
+def per_point_transmission(channel: Channel, energy_ev):
+    """Reference implementation: one xraydb call per energy point."""
+    transmission = np.ones_like(energy_ev)
+    for flt in channel.filters:
+        mu = np.array([xraydb.material_mu(flt.material, e, density=flt.density) for e in energy_ev])
+        transmission *= np.exp(-mu * flt.thickness)
+    return transmission
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--start", type=float, default=0.1, help="start energy (keV)")
+    parser.add_argument("--stop", type=float, default=100.0, help="stop energy (keV)")
+    parser.add_argument("--step", type=float, default=0.01, help="step (keV)")
+    args = parser.parse_args()
+
+    energy_ev = np.arange(args.start, args.stop + args.step, args.step) * 1e3
+
+    channel = Channel()
+    channel.add_filter("Be", 25e-4)
+    channel.add_filter("Al", 10e-4)
+    channel.add_filter("Cu", 2e-4, density=8.96)
+
+    t0 = time.perf_counter()
+    reference = per_point_transmission(channel, energy_ev)
+    t_ref = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    vectorized = channel.calculate_transmission(energy_ev)
+    t_vec = time.perf_counter() - t0
+
+    max_err = float(np.max(np.abs(vectorized - reference)))
+    print(f"points:      {energy_ev.size}")
+    print(f"per-point:   {t_ref:.3f} s")
+    print(f"vectorized:  {t_vec:.4f} s")
+    print(f"speedup:     {t_ref / t_vec:.1f}x")
+    print(f"max |error|: {max_err:.3e}")
+
+
+if __name__ == "__main__":
+    main()
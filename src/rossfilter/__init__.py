@@ -4,4 +4,11 @@ __all__ = [
     "RossFilterCalculator",
 ]
 
-from .calculator import RossFilterCalculator
+
+def __getattr__(name):
+    # Loaded on first use: the calculator pulls in xraydb (and with it scipy
+    # and sqlalchemy), which the GUI wants to defer until after its first paint.
+    if name == "RossFilterCalculator":
+        from .calculator import RossFilterCalculator
+        return RossFilterCalculator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
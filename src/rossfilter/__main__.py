@@ -1,12 +1,20 @@
-from .calculator import RossFilterCalculator
-from .gui import RossFilterGUI
+import sys
 
 
-def main() -> None:
-    calculator = RossFilterCalculator()
-    app = RossFilterGUI(calculator)
+def main(argv=None) -> int | None:
+    """``rossfilter`` opens the GUI; ``rossfilter run ...`` is the headless batch runner."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "run":
+        from .cli import main as run_main
+        return run_main(argv[1:])
+
+    # GUI toolkits are only imported here, so the batch runner works without a display.
+    # The GUI itself loads the calculator, disk cache and matplotlib after its first paint.
+    from .gui import RossFilterGUI
+
+    app = RossFilterGUI()
     app.run()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,96 @@
+from functools import lru_cache
+
+import numpy as np
+
+from .attenuation import stacks_transmission
+from .mu_table import EDGE_RTOL, edge_energies, material_elements
+
+DEFAULT_MAX_POINTS = 20_000
+
+
+def refine_grid(evaluate, energy_ev, *, edges=(), tol: float = 1e-3,
+                max_points: int = DEFAULT_MAX_POINTS, min_rel_width: float = 1e-7) -> np.ndarray:
+    """Refine a coarse energy grid until linear interpolation of ``evaluate`` is within ``tol``.
+
+    Each absorption edge in ``edges`` is bracketed by points at
+    E * (1 -/+ EDGE_RTOL) so the jump is kept sharp; the bracketing interval
+    itself is never refined. Every other interval is tested at its midpoint
+    and bisected while ``max |f(mid) - (f(a) + f(b)) / 2|`` exceeds ``tol``,
+    i.e. where the curve bends. Only new midpoints are evaluated.
+
+    Args:
+        evaluate: f(E) -> (E,) or (C, E) array, e.g. channel transmissions
+        energy_ev: sorted starting grid (eV); its end points are kept
+        edges: edge energies (eV) to bracket
+        tol: absolute interpolation tolerance on f
+        max_points: upper bound on the size of the returned grid
+        min_rel_width: intervals narrower than this (relative) are not split
+    """
+    energy_ev = np.asarray(energy_ev, dtype=np.float64)
+    start, stop = energy_ev[0], energy_ev[-1]
+    edges = np.sort(np.asarray(edges, dtype=np.float64))
+    edges = edges[(edges > start) & (edges < stop)]
+    brackets = np.concatenate([edges * (1 - EDGE_RTOL), edges * (1 + EDGE_RTOL)])
+    grid = np.unique(np.concatenate([energy_ev, np.clip(brackets, start, stop)]))
+    values = np.atleast_2d(evaluate(grid))
+
+    # Intervals still to be tested, as indices of their left end point.
+    todo = np.arange(grid.size - 1)
+    while todo.size and grid.size < max_points:
+        lo, hi = grid[todo], grid[todo + 1]
+        splittable = (hi - lo > min_rel_width * np.abs(lo)) & (
+            np.searchsorted(edges, lo, side="right") == np.searchsorted(edges, hi, side="left"))
+        todo, lo, hi = todo[splittable], lo[splittable], hi[splittable]
+        if not todo.size:
+            break
+
+        mid = 0.5 * (lo + hi)
+        mid_values = np.atleast_2d(evaluate(mid))
+        error = np.max(np.abs(mid_values - 0.5 * (values[:, todo] + values[:, todo + 1])), axis=0)
+        split = np.flatnonzero(error > tol)
+        if split.size > max_points - grid.size:
+            split = np.sort(np.argsort(error)[::-1][:max_points - grid.size])
+        if not split.size:
+            break
+
+        # Insert the accepted midpoints; each split interval becomes two to test next round.
+        at = todo[split] + 1
+        grid = np.insert(grid, at, mid[split])
+        values = np.insert(values, at, mid_values[:, split], axis=1)
+        new_left = at + np.arange(split.size)  # index of each inserted point
+        todo = np.sort(np.concatenate([new_left - 1, new_left]))
+    return grid
+
+
+def adaptive_grid(layers, start_ev: float, stop_ev: float, step_ev: float, tol: float,
+                  table_rtol: float | None = None, max_points: int = DEFAULT_MAX_POINTS) -> np.ndarray:
+    """Energy grid (eV) refined for the transmissions of several filter stacks.
+
+    Starts from the uniform grid ``start:stop:step``, brackets the absorption
+    edges of every element in the stacks, and refines until each stack's
+    transmission is linear between grid points to within ``tol``. Results
+    are memoized, so the GUI can build a grid on its worker thread and the
+    calculator reuses it.
+
+    Args:
+        layers: one sequence of ``(material, density, thickness_cm)`` per stack
+    """
+    layers = tuple(tuple((m, d, float(t)) for m, d, t in stack) for stack in layers)
+    return _adaptive_grid(layers, float(start_ev), float(stop_ev), float(step_ev), float(tol),
+                          table_rtol, int(max_points))
+
+
+@lru_cache(maxsize=32)
+def _adaptive_grid(layers, start_ev, stop_ev, step_ev, tol, table_rtol, max_points):
+    from .calculator import energy_grid
+
+    elements = {e for stack in layers for m, _, _ in stack for e in material_elements(m)}
+    coarse = energy_grid(start_ev, stop_ev, step_ev)
+
+    def evaluate(energy_ev):
+        return stacks_transmission(layers, energy_ev, table_rtol)
+
+    grid = refine_grid(evaluate, coarse, edges=edge_energies(elements, coarse[0], coarse[-1]),
+                       tol=tol, max_points=max_points)
+    grid.setflags(write=False)
+    return grid
@@ -0,0 +1,219 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import elam
+from .disk_cache import get_disk_cache
+from .material import MaterialInfo, get_material_registry
+from .mu_table import get_mu_table
+
+
+def material_mu(material: str, energy_ev, density: float | None = None) -> np.ndarray:
+    """Linear attenuation coefficient mu(E) in 1/cm for a whole energy array.
+
+    Evaluated by ``elam.material_mu``: the material's element tables come
+    from one query and the Elam splines are evaluated on the full array.
+    """
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    return elam.material_mu(material, energy_ev, density)
+
+
+def evaluate_mu(material: str, energy_ev, density: float | None = None,
+                table_rtol: float | None = None) -> np.ndarray:
+    """Uncached mu(E): direct Elam evaluation, or a ``MuTable`` lookup with ``table_rtol``."""
+    compound = get_material_registry().compound(material)
+    if compound is not None:
+        return compound_mu(compound, energy_ev, density, table_rtol, element_mu=evaluate_mu)
+    if table_rtol is None:
+        return material_mu(material, energy_ev, density)
+    return get_mu_table(material, density, table_rtol)(energy_ev)
+
+
+def compound_mu(compound: MaterialInfo, energy_ev, density: float | None = None,
+                table_rtol: float | None = None, element_mu=None) -> np.ndarray:
+    """mu(E) of a custom compound: density * sum_e w_e * (mu/rho)_e(E).
+
+    The elemental mass attenuation rows come from ``element_mu`` (the shared
+    cache by default), so a new mixture of known elements is one small
+    matrix-vector product.
+    """
+    element_mu = cached_mu if element_mu is None else element_mu
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    elements = list(compound.mass_fractions)
+    weights = np.fromiter(compound.mass_fractions.values(), dtype=np.float64, count=len(elements))
+    mass_mu = np.array([element_mu(elem, energy_ev, 1.0, table_rtol) for elem in elements])
+    return (compound.density if density is None else density) * (weights @ mass_mu)
+
+
+def grid_key(energy_ev) -> tuple:
+    """Hashable key for an energy grid: (start, stop, step, length).
+
+    Values are rounded to 12 significant digits so that grids built in keV
+    and in eV (which differ only by round-off) share a key. Non-uniform
+    grids get a content digest appended so they never collide with a
+    uniform grid of the same extent.
+    """
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    n = energy_ev.size
+    if n == 0:
+        return (0.0, 0.0, 0.0, 0)
+    start, stop = _round(energy_ev[0]), _round(energy_ev[-1])
+    if n == 1:
+        return (start, stop, 0.0, 1)
+    step = (float(energy_ev[-1]) - float(energy_ev[0])) / (n - 1)
+    if np.allclose(np.diff(energy_ev), step, rtol=1e-9, atol=0.0):
+        return (start, stop, _round(step), n)
+    digest = hashlib.blake2b(energy_ev.tobytes(), digest_size=16).hexdigest()
+    return (start, stop, None, n, digest)
+
+
+DEFAULT_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def _round(value) -> float:
+    return float(f"{float(value):.12g}")
+
+
+class AttenuationCache:
+    """LRU cache of mu(E) arrays keyed by (material, density, grid).
+
+    The cache is bounded by the total ``nbytes`` of its arrays
+    (``max_bytes``); the least recently used arrays are dropped first, but
+    the newest one is always kept.
+
+    With ``table_rtol`` set, misses are served by log-log interpolation of a
+    ``MuTable`` with that accuracy bound instead of direct Elam evaluation.
+    If a disk cache is enabled (``enable_disk_cache``), misses are first
+    looked up there as memory-mapped arrays and new arrays are written back.
+    Custom compounds are combined from the cached elemental arrays instead.
+    Cached arrays are read-only; copy before modifying them in place.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._data: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @staticmethod
+    def key(material: str, energy_ev, density: float | None = None, table_rtol: float | None = None) -> tuple:
+        return (material, density, grid_key(energy_ev), table_rtol)
+
+    def __contains__(self, key: tuple) -> bool:
+        with self._lock:
+            return key in self._data
+
+    def get(self, material: str, energy_ev, density: float | None = None,
+            table_rtol: float | None = None) -> np.ndarray:
+        energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+        key = self.key(material, energy_ev, density, table_rtol)
+        with self._lock:
+            mu = self._data.get(key)
+            if mu is not None:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return mu
+            self.misses += 1
+
+        compound = get_material_registry().compound(material)
+        if compound is not None:
+            # Built from cached elemental rows; compound names are not
+            # stable across sessions, so they stay out of the disk cache.
+            mu = compound_mu(compound, energy_ev, density, table_rtol)
+            self._insert(key, mu)
+            return mu
+
+        disk = get_disk_cache()
+        mu = disk.load(key) if disk is not None else None
+        if mu is None:
+            mu = evaluate_mu(material, energy_ev, density, table_rtol)
+            if disk is not None:
+                disk.store(key, mu)
+        self._insert(key, mu)
+        return mu
+
+    def put(self, key: tuple, mu: np.ndarray):
+        """Insert an array computed elsewhere (e.g. by worker processes)."""
+        mu = np.asarray(mu, dtype=np.float64)
+        disk = get_disk_cache()
+        if disk is not None:
+            disk.store(key, mu)
+        self._insert(key, mu)
+
+    def _insert(self, key: tuple, mu: np.ndarray):
+        mu.setflags(write=False)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._data[key] = mu
+            self.nbytes += mu.nbytes
+            self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and len(self._data) > 1:
+            _, mu = self._data.popitem(last=False)
+            self.nbytes -= mu.nbytes
+
+    def resize(self, max_bytes: int):
+        """Change the byte budget, evicting arrays if the cache is now over it."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self._data),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_cache = AttenuationCache()
+
+
+def get_attenuation_cache() -> AttenuationCache:
+    """Return the process-wide attenuation cache shared by channels, calculator and GUI."""
+    return _cache
+
+
+def cached_mu(material: str, energy_ev, density: float | None = None,
+              table_rtol: float | None = None) -> np.ndarray:
+    """Like ``material_mu`` but served from the shared attenuation cache."""
+    return _cache.get(material, energy_ev, density, table_rtol)
+
+
+def stacks_transmission(stacks, energy_ev, table_rtol: float | None = None) -> np.ndarray:
+    """(S, E) transmission of ``(material, density, thickness_cm)`` stacks.
+
+    mu is evaluated once per distinct (material, density) and not cached;
+    used for probe and streaming grids that would only churn the cache.
+    """
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    materials = list(dict.fromkeys((m, d) for stack in stacks for m, d, _ in stack))
+    mu = {md: evaluate_mu(md[0], energy_ev, md[1], table_rtol) for md in materials}
+    depth = np.zeros((len(stacks), energy_ev.size))
+    for i, stack in enumerate(stacks):
+        for m, d, t in stack:
+            depth[i] += mu[(m, d)] * t
+    return np.exp(-depth, out=depth)
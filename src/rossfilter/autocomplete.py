@@ -0,0 +1,62 @@
+import heapq
+
+WORD_STARTS = " -_(/,"
+
+
+class MaterialIndex:
+    """Case-insensitive substring search over material names.
+
+    Names are lowercased once, ordered shortest first, and indexed by
+    trigram; a query of three or more characters only checks the names in
+    its rarest trigram's posting list. Typing forward narrows the previous
+    hits instead of searching again. Matches rank exact, then prefix, then
+    word-start, then any substring match, earlier and shorter first.
+    """
+
+    def __init__(self, names=()):
+        self.names = list(names)
+        # Internal ids follow (length, name), so any id-ordered hit list is
+        # already sorted by the ranking's tie-breakers.
+        order = sorted(range(len(self.names)), key=lambda i: (len(self.names[i]), self.names[i].lower()))
+        self._names = [self.names[i] for i in order]
+        self._lower = [name.lower() for name in self._names]
+        self._grams: dict[str, list[int]] = {}
+        for i, low in enumerate(self._lower):
+            for gram in {low[j:j + 3] for j in range(len(low) - 2)}:
+                self._grams.setdefault(gram, []).append(i)
+        self._last_query = None
+        self._last_hits: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def search(self, text: str, limit: int | None = None) -> list[str]:
+        """Names containing ``text``, best first, at most ``limit`` of them."""
+        query = text.strip().lower()
+        if not query:
+            return self.names[:limit]
+        lower = self._lower
+        hits = [i for i in self._candidates(query) if query in lower[i]]
+        self._last_query, self._last_hits = query, hits
+
+        # An exact match is the shortest prefix match, so it comes first.
+        prefix = [i for i in hits if lower[i].startswith(query)]
+        if limit is not None and len(prefix) >= limit:
+            return [self._names[i] for i in prefix[:limit]]
+
+        def rank(i):
+            pos = lower[i].find(query)
+            return lower[i][pos - 1] not in WORD_STARTS, pos
+
+        rest = [i for i in hits if not lower[i].startswith(query)]
+        more = None if limit is None else limit - len(prefix)
+        rest = sorted(rest, key=rank) if more is None else heapq.nsmallest(more, rest, key=rank)
+        return [self._names[i] for i in prefix + rest]
+
+    def _candidates(self, query: str):
+        if self._last_query and query.startswith(self._last_query):
+            return self._last_hits
+        if len(query) < 3:
+            return range(len(self._lower))
+        postings = [self._grams.get(query[j:j + 3], ()) for j in range(len(query) - 2)]
+        return min(postings, key=len)
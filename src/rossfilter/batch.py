@@ -0,0 +1,141 @@
+import numpy as np
+
+from .attenuation import cached_mu
+from .filter import get_material_table
+from .material import get_material_registry
+
+# One layer of a stack description. Thickness is in cm; a layer with zero
+# thickness is an empty slot. A NaN density means the material's default.
+LAYER_DTYPE = np.dtype([
+    ("material", np.int32),
+    ("thickness", np.float64),
+    ("density", np.float64),
+])
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+
+
+def make_stacks(material, thickness_cm, density=None) -> np.ndarray:
+    """Build an (N, L) ``LAYER_DTYPE`` array from per-field (N, L) arrays."""
+    material = np.asarray(material)
+    stacks = np.zeros(material.shape, dtype=LAYER_DTYPE)
+    stacks["material"] = material
+    stacks["thickness"] = thickness_cm
+    stacks["density"] = np.nan if density is None else density
+    return stacks
+
+
+def stacks_from_channels(channels) -> tuple[list[str], np.ndarray]:
+    """Convert ``Channel`` objects into (materials, (N, L) stacks).
+
+    Copies the channels' layer columns directly; ``materials`` lists the
+    distinct materials in interned-id order.
+    """
+    table = get_material_table()
+    used = np.unique(np.concatenate([c.material_ids for c in channels])) if channels else np.empty(0, np.int32)
+    materials = [table.name(i) for i in used]
+    n_layers = max((len(c) for c in channels), default=0)
+    stacks = np.zeros((len(channels), n_layers), dtype=LAYER_DTYPE)
+    stacks["density"] = np.nan
+    for n, channel in enumerate(channels):
+        k = len(channel)
+        stacks["material"][n, :k] = np.searchsorted(used, channel.material_ids)
+        stacks["thickness"][n, :k] = channel.thickness
+        stacks["density"][n, :k] = channel.density
+    return materials, stacks
+
+
+def default_densities(materials) -> np.ndarray:
+    """Default density per material: the xraydb material density, else the
+    elemental density for a bare element symbol, else NaN."""
+    registry = get_material_registry()
+    out = np.full(len(materials), np.nan)
+    for i, name in enumerate(materials):
+        info = registry.resolve(name)
+        if info is not None and info.density is not None:
+            out[i] = info.density
+    return out
+
+
+def mass_attenuation_matrix(materials, energy_ev, table_rtol: float | None = None) -> np.ndarray:
+    """(M, E) matrix of mass attenuation mu/rho (cm^2/g), one cached row per material."""
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    mu = np.empty((len(materials), energy_ev.size))
+    for i, name in enumerate(materials):
+        # mu at unit density is the mass attenuation coefficient.
+        mu[i] = cached_mu(name, energy_ev, density=1.0, table_rtol=table_rtol)
+    return mu
+
+
+def areal_density_matrix(stacks: np.ndarray, n_materials: int, defaults=None) -> np.ndarray:
+    """(N, M) matrix of summed areal density rho*t (g/cm^2) per stack and material.
+
+    Raises ValueError for negative or non-finite thicknesses; only 0 marks an empty slot.
+    """
+    stacks = np.atleast_2d(stacks)
+    n = stacks.shape[0]
+    material = stacks["material"]
+    density = stacks["density"]
+    thickness = stacks["thickness"]
+    if not np.all(np.isfinite(thickness) & (thickness >= 0)):
+        raise ValueError("Thickness must be positive (0 marks an empty slot)")
+    active = thickness != 0
+    if np.any(active & ((material < 0) | (material >= n_materials))):
+        raise ValueError("Material index out of range")
+    if defaults is not None:
+        density = np.where(np.isnan(density), np.asarray(defaults)[np.clip(material, 0, n_materials - 1)], density)
+    if np.any(active & np.isnan(density)):
+        raise ValueError("Density required for materials without a default density")
+
+    weight = np.where(active, thickness * np.where(active, density, 0.0), 0.0)
+    flat = np.arange(n)[:, None] * n_materials + np.where(active, material, 0)
+    return np.bincount(flat.ravel(), weights=weight.ravel(), minlength=n * n_materials).reshape(n, n_materials)
+
+
+def iter_batch_transmission(materials, stacks: np.ndarray, energy_ev, *,
+                            chunk_size: int | None = None,
+                            table_rtol: float | None = None):
+    """Yield ``(row_slice, transmission_block)`` for consecutive chunks of stacks.
+
+    The per-material mu/rho matrix is built once; each chunk is
+    ``exp(-T @ MU)`` with T the chunk's areal density matrix. By default
+    chunks are sized so one (chunk, E) block stays near 64 MB.
+    """
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    stacks = np.atleast_2d(stacks)
+    mu = mass_attenuation_matrix(materials, energy_ev, table_rtol=table_rtol)
+    defaults = default_densities(materials)
+    if chunk_size is None:
+        chunk_size = max(1, DEFAULT_CHUNK_BYTES // (8 * max(energy_ev.size, 1)))
+
+    for start in range(0, stacks.shape[0], chunk_size):
+        rows = slice(start, min(start + chunk_size, stacks.shape[0]))
+        t = areal_density_matrix(stacks[rows], len(materials), defaults)
+        block = t @ mu
+        np.negative(block, out=block)
+        np.exp(block, out=block)
+        yield rows, block
+
+
+def batch_transmission(materials, stacks: np.ndarray, energy_ev, *,
+                       chunk_size: int | None = None,
+                       table_rtol: float | None = None,
+                       out: np.ndarray | None = None) -> np.ndarray:
+    """(N, E) transmission matrix for N stacks of up to L layers.
+
+    Args:
+        materials: material names; ``stacks["material"]`` indexes this list
+        stacks: (N, L) array of ``LAYER_DTYPE`` (thickness in cm)
+        energy_ev: energy grid in eV
+        chunk_size: stacks per chunk (bounds temporary memory)
+        table_rtol: use interpolated mu tables with this accuracy
+        out: optional preallocated (N, E) array, e.g. an ``np.memmap``
+    """
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    stacks = np.atleast_2d(stacks)
+    if out is None:
+        out = np.empty((stacks.shape[0], energy_ev.size))
+    for rows, block in iter_batch_transmission(materials, stacks, energy_ev,
+                                               chunk_size=chunk_size, table_rtol=table_rtol):
+        out[rows] = block
+    return out
@@ -4,24 +4,106 @@ from dataclasses import dataclass, field
 
 import numpy as np
 
+from .adaptive import adaptive_grid
+from .attenuation import get_attenuation_cache
+from .batch import batch_transmission
+from .edges import BAND_LEVELS, DifferenceBand, difference_bands, get_edge_index
 from .filter import Channel
+from .material import MaterialError, define_compound
+from .optimizer import match_pair
+from .parallel import prefetch_mu
+from .stream import DEFAULT_CHUNK_POINTS, energy_chunks, iter_transmission_chunks, reduce_chunks
 from .units import kev_to_ev, um_to_cm
 
 
+def energy_grid(start_ev: float, stop_ev: float, step_ev: float) -> np.ndarray:
+    """Uniform energy grid in eV, inclusive of ``stop_ev`` (as in the GUI)."""
+    return np.arange(start_ev, stop_ev + step_ev, step_ev)
+
+
 @dataclass
 class TransmissionResult:
+    # Uniform, or non-uniform when calculated with ``adaptive_tol``
     energies_ev: np.ndarray
     transmissions: list[np.ndarray] = field(default_factory=list)
     differences: list[np.ndarray] = field(default_factory=list)
+    # filter_transmissions[c][f] is the transmission of filter f in channel c alone
+    filter_transmissions: list[list[np.ndarray]] = field(default_factory=list)
+    # bands[i] is the passband of differences[i] between the channels' K/L edges
+    bands: list[DifferenceBand] = field(default_factory=list)
 
 
 class RossFilterCalculator:
-    def __init__(self):
+    def __init__(self, table_rtol: float | None = None):
+        """Create an empty calculator.
+
+        Args:
+            table_rtol: if set, evaluate mu(E) from interpolated tables
+                (``MuTable``) with this relative accuracy instead of calling
+                xraydb for every grid point ("table mode").
+        """
         self.channels: list[Channel] = []
+        self.table_rtol = table_rtol
+        self.version = 0
+        self._last_key: tuple | None = None
+        self._last_result: TransmissionResult | None = None
+
+    def _state_key(self, *grid) -> tuple:
+        channels = tuple((id(c), c.version) for c in self.channels)
+        return (self.version, channels, grid)
+
+    @property
+    def last_result(self) -> TransmissionResult | None:
+        """The most recent result, or None if channels changed since."""
+        if self._last_result is None or self._last_key is None:
+            return None
+        if self._last_key[:2] != self._state_key()[:2]:
+            return None
+        return self._last_result
+
+    @staticmethod
+    def cache_stats() -> dict:
+        """Hit/miss statistics of the shared attenuation cache."""
+        return get_attenuation_cache().stats()
+
+    def set_table_mode(self, table_rtol: float | None):
+        """Enable table mode with the given accuracy bound, or disable it with None."""
+        self.table_rtol = table_rtol
+        for channel in self.channels:
+            channel.set_table_rtol(table_rtol)
+
+    def channel_layers(self) -> list[list[tuple]]:
+        """``(material, density, thickness_cm)`` of every filter, per channel."""
+        return [c.layers() for c in self.channels]
+
+    def state_token(self) -> tuple:
+        """Changes whenever a channel is added, removed or edited; a ``snapshot`` has the same token."""
+        return (self.version, tuple(c.version for c in self.channels))
+
+    def snapshot(self) -> RossFilterCalculator:
+        """Copy of the channels that can be calculated on a worker thread while this one is edited."""
+        other = RossFilterCalculator(table_rtol=self.table_rtol)
+        other.channels = [c.copy() for c in self.channels]
+        other.version = self.version
+        return other
+
+    def adopt(self, snapshot: RossFilterCalculator) -> bool:
+        """Take over the channels of a calculated ``snapshot``, with their optical depths and
+        result, if nothing was edited since it was taken. The snapshot must not be used afterwards.
+
+        Returns:
+            whether the snapshot was adopted
+        """
+        if snapshot.state_token() != self.state_token() or snapshot.table_rtol != self.table_rtol:
+            return False
+        self.channels = snapshot.channels
+        self._last_key, self._last_result = snapshot._last_key, snapshot._last_result
+        return True
 
     def reset(self):
         """Reset all channels."""
         self.channels = []
+        self.version += 1
         return True, "All channels reset successfully"
 
     def add_channel(self) -> int:
@@ -30,13 +112,15 @@ class RossFilterCalculator:
         Returns:
             index of the new channel
         """
-        self.channels.append(Channel())
+        self.channels.append(Channel(table_rtol=self.table_rtol))
+        self.version += 1
         return len(self.channels) - 1
 
     def remove_channel(self, channel_idx: int):
         """Remove a channel by index."""
         if 0 <= channel_idx < len(self.channels):
             self.channels.pop(channel_idx)
+            self.version += 1
             return True, f"Removed Channel {channel_idx + 1}"
         return False, f"Invalid channel index {channel_idx}"
 
@@ -86,28 +170,60 @@ class RossFilterCalculator:
         except ValueError:
             return False, "Invalid thickness value"
 
-    def calculate_transmission(self, energy_start_kev, energy_stop_kev, energy_step_kev):
+    @staticmethod
+    def define_compound(name: str, density: float, formula: str | None = None,
+                        mass_fractions: dict | None = None):
+        """Register a custom compound (see ``material.define_compound``)."""
+        try:
+            define_compound(name, density, formula=formula, mass_fractions=mass_fractions)
+            return True, f"Defined compound '{name}'"
+        except MaterialError as e:
+            return False, str(e)
+
+    def calculate_transmission(self, energy_start_kev, energy_stop_kev, energy_step_kev,
+                               executor=None, max_workers: int | None = None, split: str = "materials",
+                               adaptive_tol: float | None = None):
         """Calculate transmission for all channels and sequential differences.
 
-        GUI inputs are in keV; internal computations are in eV.
-        """
-        try:
-            start_ev = float(kev_to_ev(float(energy_start_kev)))
-            stop_ev = float(kev_to_ev(float(energy_stop_kev)))
-            step_ev = float(kev_to_ev(float(energy_step_kev)))
+        GUI inputs are in keV; internal computations are in eV. The last
+        result is returned as-is while neither the channels nor the energy
+        grid have changed.
 
-            if start_ev >= stop_ev:
-                return False, "Start energy must be less than stop energy"
-            if step_ev <= 0:
-                return False, "Step size must be positive"
-            if start_ev < 0:
-                return False, "Start energy must be positive"
+        With ``executor`` (``"thread"``, ``"process"`` or an ``Executor``),
+        attenuation for all layers is first evaluated in parallel (see
+        ``parallel.prefetch_mu``); the result is identical to the serial one.
 
+        With ``adaptive_tol``, the step is only the starting resolution: the
+        grid is refined around absorption edges and wherever a channel's
+        transmission deviates from linear interpolation by more than
+        ``adaptive_tol`` (see ``adaptive.adaptive_grid``), so
+        ``result.energies_ev`` is non-uniform.
+        """
+        try:
+            start_ev, stop_ev, step_ev = self._energy_range_ev(energy_start_kev, energy_stop_kev, energy_step_kev)
+        except ValueError as e:
+            return False, str(e)
+        try:
             if not self.channels:
                 return False, "No channels added."
 
-            energies = np.arange(start_ev, stop_ev + step_ev, step_ev)
-            
+            if adaptive_tol is not None and adaptive_tol <= 0:
+                return False, "Adaptive tolerance must be positive"
+
+            key = self._state_key(start_ev, stop_ev, step_ev, adaptive_tol)
+            if key == self._last_key and self._last_result is not None:
+                return True, self._last_result
+
+            if adaptive_tol is None:
+                energies = energy_grid(start_ev, stop_ev, step_ev)
+            else:
+                energies = adaptive_grid(self.channel_layers(), start_ev, stop_ev, step_ev,
+                                         adaptive_tol, table_rtol=self.table_rtol)
+            if executor is not None:
+                layers = [(m, d) for c in self.channels for m, d, _ in c.layers()]
+                prefetch_mu(layers, energies, executor=executor, max_workers=max_workers,
+                            split=split, table_rtol=self.table_rtol)
+
             transmissions = []
             for channel in self.channels:
                 transmissions.append(channel.calculate_transmission(energies))
@@ -117,16 +233,156 @@ class RossFilterCalculator:
             for i in range(len(transmissions) - 1):
                 diff = np.abs(transmissions[i] - transmissions[i+1])
                 differences.append(diff)
+            bands = difference_bands(energies, differences, self._band_boundaries(energies))
+
+            filter_transmissions = [
+                [channel.calculate_single_filter(i, energies) for i in range(len(channel))]
+                for channel in self.channels
+            ]
 
             result = TransmissionResult(
                 energies_ev=energies,
                 transmissions=transmissions,
-                differences=differences
+                differences=differences,
+                filter_transmissions=filter_transmissions,
+                bands=bands,
             )
+            self._last_key, self._last_result = key, result
 
             return True, result
 
-        except ValueError:
-            return False, "Invalid energy values"
         except Exception as e:
             return False, f"Calculation error: {str(e)}"
+
+    def _band_boundaries(self, energies) -> list[np.ndarray]:
+        """K/L edges of the elements in each pair of neighbouring channels, inside the grid."""
+        index = get_edge_index()
+        materials = [[m for m, _, _ in c.layers()] for c in self.channels]
+        return [
+            index.energies(energies[0], energies[-1], materials=materials[i] + materials[i + 1], levels=BAND_LEVELS)
+            for i in range(len(self.channels) - 1)
+        ]
+
+    def absorption_edges(self, emin_ev: float, emax_ev: float, channel_indices=None, levels=BAND_LEVELS):
+        """Absorption edges of the elements in some (default: all) channels, from the edge index.
+
+        Returns:
+            (success, (energies_ev, labels) or error message)
+        """
+        try:
+            indices = range(len(self.channels)) if channel_indices is None else channel_indices
+            materials = [m for i in indices for m, _, _ in self.channels[i].layers()]
+            index = get_edge_index()
+            idx = index.select(emin_ev, emax_ev, materials=materials, levels=levels)
+            return True, (index.energy_ev[idx], index.labels(idx))
+        except IndexError:
+            return False, "Invalid channel index"
+        except Exception as e:
+            return False, f"Edge lookup error: {str(e)}"
+
+    @staticmethod
+    def _energy_range_ev(energy_start_kev, energy_stop_kev, energy_step_kev) -> tuple[float, float, float]:
+        """Validated (start, stop, step) in eV; raises ValueError with a user-facing message."""
+        try:
+            start_ev = float(kev_to_ev(float(energy_start_kev)))
+            stop_ev = float(kev_to_ev(float(energy_stop_kev)))
+            step_ev = float(kev_to_ev(float(energy_step_kev)))
+        except (TypeError, ValueError):
+            raise ValueError("Invalid energy values") from None
+        if start_ev >= stop_ev:
+            raise ValueError("Start energy must be less than stop energy")
+        if step_ev <= 0:
+            raise ValueError("Step size must be positive")
+        if start_ev < 0:
+            raise ValueError("Start energy must be positive")
+        return start_ev, stop_ev, step_ev
+
+    def iter_transmission(self, energy_start_kev, energy_stop_kev, energy_step_kev,
+                          chunk_points: int = DEFAULT_CHUNK_POINTS):
+        """Stream transmissions over the grid of ``calculate_transmission`` in chunks.
+
+        Yields ``stream.TransmissionChunk`` objects of at most ``chunk_points``
+        energies, with per-channel transmissions and sequential differences,
+        so grids with 10^7+ points never have to fit in memory. The channel
+        layout is captured when this is called. Raises ValueError for an
+        invalid energy range or when there are no channels.
+        """
+        start_ev, stop_ev, step_ev = self._energy_range_ev(energy_start_kev, energy_stop_kev, energy_step_kev)
+        if not self.channels:
+            raise ValueError("No channels added.")
+        return iter_transmission_chunks(self.channel_layers(),
+                                        energy_chunks(start_ev, stop_ev, step_ev, chunk_points),
+                                        table_rtol=self.table_rtol)
+
+    def reduce_transmission(self, energy_start_kev, energy_stop_kev, energy_step_kev, reducers,
+                            chunk_points: int = DEFAULT_CHUNK_POINTS):
+        """Run constant-memory reducers (``stream.BandIntegral``, ``MaxDifference``,
+        ``EdgeLocator``) over the streamed transmissions.
+
+        Returns:
+            (success, list of reducer results or error message)
+        """
+        try:
+            chunks = self.iter_transmission(energy_start_kev, energy_stop_kev, energy_step_kev, chunk_points)
+            return True, reduce_chunks(chunks, reducers)
+        except ValueError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Calculation error: {str(e)}"
+
+    def calculate_batch(self, materials, stacks, energy_start_kev, energy_stop_kev, energy_step_kev,
+                        chunk_size: int | None = None, out=None):
+        """Transmission of many candidate stacks at once.
+
+        Args:
+            materials: material names indexed by ``stacks["material"]``
+            stacks: (N, L) array of ``batch.LAYER_DTYPE``; thickness in cm
+                (as in ``Filter``), NaN density for the material default
+            energy_*_kev: energy grid in keV, as for ``calculate_transmission``
+            chunk_size: stacks evaluated per chunk (bounds temporary memory)
+            out: optional preallocated (N, E) array, e.g. an ``np.memmap``
+
+        Returns:
+            (success, (energies_ev, transmission[N, E]) or error message)
+        """
+        try:
+            start_ev, stop_ev, step_ev = self._energy_range_ev(energy_start_kev, energy_stop_kev, energy_step_kev)
+        except ValueError as e:
+            return False, str(e)
+        try:
+            energies = energy_grid(start_ev, stop_ev, step_ev)
+            transmission = batch_transmission(materials, stacks, energies, chunk_size=chunk_size,
+                                              table_rtol=self.table_rtol, out=out)
+            return True, (energies, transmission)
+        except ValueError as e:
+            return False, f"Invalid batch input: {str(e)}"
+        except Exception as e:
+            return False, f"Batch calculation error: {str(e)}"
+
+    def optimize_ross_pair(self, material1: str, material2: str, band_start_kev, band_stop_kev,
+                           thickness1_um: float, energy_start_kev, energy_stop_kev, energy_step_kev):
+        """Find the thickness of ``material2`` that matches ``material1`` outside a band.
+
+        Returns:
+            (success, PairSolution or error message); thicknesses in the
+            solution are in cm, as in ``Filter``.
+        """
+        try:
+            start_ev, stop_ev, step_ev = self._energy_range_ev(energy_start_kev, energy_stop_kev, energy_step_kev)
+        except ValueError as e:
+            return False, str(e)
+        try:
+            band = (float(kev_to_ev(float(band_start_kev))), float(kev_to_ev(float(band_stop_kev))))
+            if band[0] >= band[1]:
+                return False, "Band start must be less than band stop"
+            thickness1_cm = um_to_cm(thickness1_um)
+            if thickness1_cm <= 0:
+                return False, "Thickness must be positive"
+
+            energies = energy_grid(start_ev, stop_ev, step_ev)
+            return True, match_pair(material1, material2, band, thickness1_cm, energies,
+                                    table_rtol=self.table_rtol)
+        except ValueError as e:
+            return False, f"Optimization error: {str(e)}"
+        except Exception as e:
+            return False, f"Unexpected error: {str(e)}"
@@ -0,0 +1,253 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from .calculator import RossFilterCalculator, TransmissionResult
+from .disk_cache import enable_disk_cache, get_disk_cache
+from .parallel import make_executor
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    try:
+        import tomli as tomllib
+    except ImportError:
+        tomllib = None
+
+CONFIG_SUFFIXES = (".json", ".toml")
+FORMATS = ("csv", "npz", "parquet")
+
+
+class ConfigError(ValueError):
+    """Raised when a run configuration is malformed."""
+
+
+def load_config(path: str | Path) -> dict:
+    """Read one run configuration from a ``.json`` or ``.toml`` file.
+
+    A configuration looks like (TOML)::
+
+        [energy]
+        start_kev = 1.0
+        stop_kev = 30.0
+        step_kev = 0.05
+
+        [[channels]]
+        filters = [{material = "Al", thickness_um = 10.0}]
+
+    ``density`` (g/cm^3) per filter, ``energy.adaptive_tol`` (refine the grid
+    near edges, see ``adaptive.adaptive_grid``), ``table_rtol`` and ``name``
+    are optional.
+    """
+    path = Path(path)
+    if path.suffix == ".toml":
+        if tomllib is None:
+            raise ConfigError("Reading TOML configs requires Python 3.11+ or the 'tomli' package")
+        with open(path, "rb") as f:
+            config = tomllib.load(f)
+    elif path.suffix == ".json":
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+    else:
+        raise ConfigError(f"Unsupported config type '{path.suffix}' (expected .json or .toml)")
+    if not isinstance(config, dict):
+        raise ConfigError("Config must be a JSON object / TOML table at the top level")
+    return config
+
+
+def collect_configs(paths) -> list[Path]:
+    """Expand directories into their ``.json``/``.toml`` files, sorted by name."""
+    configs = []
+    for p in map(Path, paths):
+        if p.is_dir():
+            configs.extend(sorted(c for c in p.iterdir() if c.suffix in CONFIG_SUFFIXES))
+        else:
+            configs.append(p)
+    return configs
+
+
+def build_calculator(config: dict) -> RossFilterCalculator:
+    """Create a calculator holding the channels described by ``config``."""
+    calculator = RossFilterCalculator(table_rtol=config.get("table_rtol"))
+    channels = config.get("channels")
+    if not channels:
+        raise ConfigError("Config defines no channels")
+    for c_idx, channel in enumerate(channels):
+        idx = calculator.add_channel()
+        for flt in channel.get("filters", []):
+            try:
+                material, thickness_um = flt["material"], float(flt["thickness_um"])
+            except (KeyError, TypeError, ValueError):
+                raise ConfigError(f"Channel {c_idx + 1}: each filter needs 'material' and 'thickness_um'")
+            success, msg = calculator.add_filter_to_channel(idx, material, thickness_um, flt.get("density"))
+            if not success:
+                raise ConfigError(f"Channel {c_idx + 1}: {msg}")
+    return calculator
+
+
+def run_config(config: dict, executor=None, max_workers: int | None = None) -> TransmissionResult:
+    """Calculate transmission for one configuration; raises ``ConfigError`` on failure."""
+    energy = config.get("energy", {})
+    try:
+        erange = (energy["start_kev"], energy["stop_kev"], energy["step_kev"])
+    except KeyError as e:
+        raise ConfigError(f"Missing energy setting {e}")
+    calculator = build_calculator(config)
+    success, result = calculator.calculate_transmission(*erange, executor=executor, max_workers=max_workers,
+                                                        adaptive_tol=energy.get("adaptive_tol"))
+    if not success:
+        raise ConfigError(result)
+    return result
+
+
+def result_columns(result: TransmissionResult) -> dict[str, np.ndarray]:
+    """Flatten a result into named columns (energy in keV first)."""
+    columns = {"energy_kev": result.energies_ev / 1e3}
+    for i, t in enumerate(result.transmissions):
+        columns[f"channel_{i + 1}"] = t
+    for i, d in enumerate(result.differences):
+        columns[f"diff_{i + 1}_{i + 2}"] = d
+    return columns
+
+
+def write_csv(path: Path, result: TransmissionResult):
+    columns = result_columns(result)
+    np.savetxt(path, np.column_stack(list(columns.values())), delimiter=",",
+               header=",".join(columns), comments="", fmt="%.10g")
+
+
+def write_npz(path: Path, result: TransmissionResult):
+    n = result.energies_ev.size
+    np.savez(
+        path,
+        energies_ev=result.energies_ev,
+        transmissions=np.array(result.transmissions).reshape(-1, n),
+        differences=np.array(result.differences).reshape(-1, n),
+    )
+
+
+def write_parquet(path: Path, result: TransmissionResult):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ConfigError("Parquet output requires the 'pyarrow' package")
+    pq.write_table(pa.table(result_columns(result)), path)
+
+
+WRITERS = {"csv": write_csv, "npz": write_npz, "parquet": write_parquet}
+
+
+def output_name(config_path, config: dict) -> str:
+    """File name (without suffix) of a config's output: its ``name``, else the file stem.
+
+    Raises ``ConfigError`` if ``name`` is not a plain file name, so outputs stay in the output directory.
+    """
+    name = str(config.get("name", Path(config_path).stem))
+    if not name or "/" in name or "\\" in name or Path(name).is_absolute() or Path(name).name != name:
+        raise ConfigError(f"Config name '{name}' must be a file name without directories")
+    return name
+
+
+def _init_worker(cache_dir, max_bytes):
+    """Pool initializer: open the parent's disk cache, which spawned workers do not inherit."""
+    if cache_dir is not None:
+        try:
+            enable_disk_cache(cache_dir, max_bytes=max_bytes)
+        except OSError:
+            pass
+
+
+def _run_one(task) -> tuple[bool, Path | str]:
+    """Run one config and write its result; executed in worker processes too.
+
+    Returns:
+        (success, output path or error message)
+    """
+    config, out_path, fmt, executor, max_workers = task
+    try:
+        result = run_config(config, executor=executor, max_workers=max_workers)
+        WRITERS[fmt](out_path, result)
+        return True, out_path
+    except Exception as e:
+        return False, str(e)
+
+
+def run_configs(paths, out_dir, fmt: str = "csv", jobs: int = 1):
+    """Run every config in ``paths`` and yield ``(config_path, success, output path or error)``.
+
+    A failing config is reported and the others still run. Configs that
+    would write the same output file are rejected with ``ConfigError``
+    before anything runs. With ``jobs > 1`` several configs run in separate
+    processes; a single config instead spreads its materials over ``jobs``
+    processes.
+    """
+    if fmt not in WRITERS:
+        raise ConfigError(f"Unknown format '{fmt}' (expected one of {', '.join(FORMATS)})")
+    out_dir = Path(out_dir)
+    tasks, failed, outputs = [], [], {}
+    for config_path in collect_configs(paths):
+        try:
+            config = load_config(config_path)
+            out_path = out_dir / f"{output_name(config_path, config)}.{fmt}"
+        except (ValueError, OSError) as e:
+            failed.append((config_path, False, str(e)))
+            continue
+        outputs.setdefault(out_path, []).append(config_path)
+        tasks.append((config_path, config, out_path))
+    clashes = [f"{p.name} ({', '.join(map(str, cs))})" for p, cs in outputs.items() if len(cs) > 1]
+    if clashes:
+        raise ConfigError(f"Configs would overwrite each other's output: {'; '.join(clashes)}")
+
+    yield from failed
+    out_dir.mkdir(parents=True, exist_ok=True)
+    if jobs <= 1 or len(tasks) <= 1:
+        executor = "process" if jobs > 1 else None
+        for config_path, config, out_path in tasks:
+            yield (config_path, *_run_one((config, out_path, fmt, executor, jobs)))
+        return
+    disk = get_disk_cache()
+    initargs = (disk.root, disk.max_bytes) if disk is not None else (None, None)
+    with make_executor("process", jobs, initializer=_init_worker, initargs=initargs) as pool:
+        outcomes = pool.map(_run_one, [(config, out_path, fmt, None, None) for _, config, out_path in tasks])
+        for (config_path, _, _), outcome in zip(tasks, outcomes):
+            yield (config_path, *outcome)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="rossfilter run",
+        description="Calculate Ross filter transmissions from JSON/TOML configs without the GUI.",
+    )
+    parser.add_argument("configs", nargs="+", help="config files or directories of configs")
+    parser.add_argument("-o", "--output", default=".", help="output directory (default: current)")
+    parser.add_argument("-f", "--format", choices=FORMATS, default="csv", help="output format")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes")
+    parser.add_argument("--no-disk-cache", action="store_true", help="do not use the persistent mu cache")
+    args = parser.parse_args(argv)
+
+    if not args.no_disk_cache:
+        try:
+            enable_disk_cache()
+        except OSError as e:
+            print(f"Disk cache disabled: {str(e)}", file=sys.stderr)
+
+    failures = 0
+    try:
+        for config_path, success, outcome in run_configs(args.configs, args.output, args.format, args.jobs):
+            if success:
+                print(outcome)
+            else:
+                failures += 1
+                print(f"Error: {config_path}: {outcome}", file=sys.stderr)
+    except (ValueError, OSError) as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,183 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import numpy as np
+import xraydb
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+# Bump when the stored mu values change (e.g. rossfilter.elam), so old entries are not reused.
+CACHE_FORMAT = 2
+
+
+def default_cache_dir() -> Path:
+    """``$ROSSFILTER_CACHE_DIR``, else the platform's per-user cache directory."""
+    env = os.environ.get("ROSSFILTER_CACHE_DIR")
+    if env:
+        return Path(env)
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "rossfilter"
+
+
+class DiskMuCache:
+    """Persistent cache of mu arrays as ``.npy`` files, opened memory-mapped.
+
+    Files live in a subdirectory per xraydb version and ``CACHE_FORMAT``,
+    so installs with different versions can share a cache root. Each file
+    name is a digest of its key (material, density, grid, ...), so separate
+    processes can share entries with zero copies. ``max_bytes`` caps the
+    whole root, other versions included: the size is tracked as files are
+    written, and when it grows beyond the cap the root is rescanned and the
+    least recently used files (by mtime, refreshed on load) are evicted, so
+    stale versions go first.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(directory) if directory is not None else default_cache_dir()
+        self.version = xraydb.__version__
+        self.directory = self.root / f"xraydb-{self.version}-v{CACHE_FORMAT}"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = self.size_bytes()  # running total, resynced by evict()
+
+    def remove_other_versions(self):
+        """Delete the directories written by other xraydb versions under ``root``."""
+        for path in self.root.glob("xraydb-*"):
+            if path.is_dir() and path != self.directory:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def path_for(self, key: tuple) -> Path:
+        digest = hashlib.blake2b(repr((self.version, CACHE_FORMAT) + tuple(key)).encode(),
+                                 digest_size=20).hexdigest()
+        return self.directory / f"{digest}.npy"
+
+    def load(self, key: tuple) -> np.ndarray | None:
+        """Return the memory-mapped (read-only) array for ``key``, or None."""
+        path = self.path_for(key)
+        try:
+            arr = np.load(path, mmap_mode="r")
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # Truncated or corrupt file; drop it and recompute.
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return arr
+
+    def store(self, key: tuple, arr: np.ndarray):
+        """Write ``arr`` atomically; evict old entries once the size cap is exceeded."""
+        path = self.path_for(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, np.ascontiguousarray(arr))
+            size = Path(tmp).stat().st_size
+            replaced = self._file_size(path)
+            os.replace(tmp, path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._size += size - replaced
+            over = self._size > self.max_bytes
+        if over:
+            self.evict()
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _remove(self, path: Path):
+        size = self._file_size(path)
+        path.unlink(missing_ok=True)
+        with self._lock:
+            self._size -= size
+
+    def _entries(self):
+        return self.root.glob("xraydb-*/*.npy")
+
+    def size_bytes(self) -> int:
+        """Current size of the entries of all versions under ``root`` (scans it)."""
+        return sum(self._file_size(p) for p in self._entries())
+
+    def evict(self, max_bytes: int | None = None):
+        """Delete least recently used files until the cache fits in ``max_bytes``."""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        entries = []
+        for p in self._entries():
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= limit:
+                break
+            try:
+                p.unlink()
+                total -= size
+            except OSError:
+                # Still mapped by another process on Windows; try again later.
+                continue
+        with self._lock:
+            self._size = total
+        for path in self.root.glob("xraydb-*"):
+            if path != self.directory:
+                try:
+                    path.rmdir()  # only succeeds once a stale version is empty
+                except OSError:
+                    pass
+
+    def clear(self):
+        self.evict(max_bytes=0)
+
+    def stats(self) -> dict:
+        size = self.size_bytes()  # scanned outside the lock so writers are not held up
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size_bytes": size,
+                "max_bytes": self.max_bytes,
+                "directory": str(self.directory),
+            }
+
+
+_disk_cache: DiskMuCache | None = None
+
+
+def enable_disk_cache(directory: str | os.PathLike | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> DiskMuCache:
+    """Back the shared attenuation cache and mu tables with a persistent directory."""
+    global _disk_cache
+    _disk_cache = DiskMuCache(directory, max_bytes=max_bytes)
+    return _disk_cache
+
+
+def disable_disk_cache():
+    global _disk_cache
+    _disk_cache = None
+
+
+def get_disk_cache() -> DiskMuCache | None:
+    return _disk_cache
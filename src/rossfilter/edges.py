@@ -0,0 +1,169 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .elam import get_connection
+from .material import get_material_registry
+
+# Edges that delimit Ross filter passbands.
+BAND_LEVELS = ("K", "L1", "L2", "L3")
+
+
+class EdgeIndex:
+    """Every absorption edge in xraydb, sorted by energy.
+
+    ``energy_ev[i]`` is the edge energy, ``element[i]`` and ``level[i]``
+    index ``elements`` and ``levels``. Range queries are a ``searchsorted``
+    on the energies plus a mask on the codes, so no database access is
+    needed after construction.
+    """
+
+    def __init__(self, energy_ev, element, level, elements, levels):
+        self.energy_ev = np.asarray(energy_ev, dtype=np.float64)
+        self.element = np.asarray(element, dtype=np.int16)
+        self.level = np.asarray(level, dtype=np.int16)
+        self.elements = list(elements)
+        self.levels = list(levels)
+        self._element_code = {e: i for i, e in enumerate(self.elements)}
+        self._level_code = {lv: i for i, lv in enumerate(self.levels)}
+        self._material_codes: dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_database(cls, conn=None) -> "EdgeIndex":
+        """Build the index from xraydb's ``xray_levels`` table in one query."""
+        conn = get_connection() if conn is None else conn
+        rows = conn.execute(
+            "SELECT element, iupac_symbol, absorption_edge FROM xray_levels ORDER BY absorption_edge, id"
+        ).fetchall()
+        elements = list(dict.fromkeys(r[0] for r in rows))
+        levels = list(dict.fromkeys(r[1] for r in rows))
+        element_code = {e: i for i, e in enumerate(elements)}
+        level_code = {lv: i for i, lv in enumerate(levels)}
+        return cls([r[2] for r in rows], [element_code[r[0]] for r in rows], [level_code[r[1]] for r in rows],
+                   elements, levels)
+
+    def __len__(self) -> int:
+        return self.energy_ev.size
+
+    def element_codes(self, elements) -> np.ndarray:
+        """Codes of the known symbols in ``elements``."""
+        return np.array(sorted({self._element_code[e] for e in elements if e in self._element_code}), dtype=np.int16)
+
+    def material_codes(self, materials) -> np.ndarray:
+        """Codes of the elements in ``materials`` (named, formulas or custom compounds)."""
+        codes = []
+        for material in materials:
+            material_codes = self._material_codes.get(material)
+            if material_codes is None:
+                info = get_material_registry().resolve(material)
+                material_codes = self.element_codes(info.composition if info is not None else ())
+                self._material_codes[material] = material_codes
+            codes.append(material_codes)
+        return np.unique(np.concatenate(codes)) if codes else np.empty(0, dtype=np.int16)
+
+    def select(self, emin: float = -np.inf, emax: float = np.inf, *, elements=None, materials=None,
+               levels=None) -> np.ndarray:
+        """Indices of the edges strictly inside (emin, emax), in energy order.
+
+        ``elements`` (symbols), ``materials`` and ``levels`` (e.g.
+        ``BAND_LEVELS``) restrict the result; None means all.
+        """
+        lo = int(np.searchsorted(self.energy_ev, emin, side="right"))
+        hi = int(np.searchsorted(self.energy_ev, emax, side="left"))
+        idx = np.arange(lo, max(hi, lo))
+        if elements is not None or materials is not None:
+            codes = self.element_codes(elements or ())
+            if materials is not None:
+                codes = np.union1d(codes, self.material_codes(materials))
+            idx = idx[np.isin(self.element[idx], codes)]
+        if levels is not None:
+            level_codes = [self._level_code[lv] for lv in levels if lv in self._level_code]
+            idx = idx[np.isin(self.level[idx], level_codes)]
+        return idx
+
+    def energies(self, emin: float = -np.inf, emax: float = np.inf, **kwargs) -> np.ndarray:
+        """Sorted, unique edge energies (eV) of ``select(emin, emax, **kwargs)``."""
+        return np.unique(self.energy_ev[self.select(emin, emax, **kwargs)])
+
+    def labels(self, idx) -> list[str]:
+        """``"Cu K"``-style labels of the edges at ``idx``."""
+        return [f"{self.elements[e]} {self.levels[lv]}" for e, lv in zip(self.element[idx], self.level[idx])]
+
+
+_index: EdgeIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_edge_index() -> EdgeIndex:
+    """The process-wide edge index, built on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = EdgeIndex.from_database()
+    return _index
+
+
+@dataclass
+class DifferenceBand:
+    """Passband of one channel difference: the stretch between consecutive
+    absorption edges with the largest integrated difference."""
+    lo_ev: float
+    hi_ev: float
+    peak_ev: float
+    peak: float  # maximum difference inside the band
+    integral: float  # integral of the difference over the band (eV)
+
+
+def difference_bands(energy_ev, differences, boundaries) -> list[DifferenceBand]:
+    """Locate the passband of every difference in one pass over the stacked arrays.
+
+    Args:
+        energy_ev: (N,) increasing energy grid (uniform or not)
+        differences: (P, N) differences on the grid
+        boundaries: per difference, sorted edge energies inside the grid
+
+    The grid ends count as boundaries. Integrals use the trapezoid rule on
+    the cumulative integral, interpolated at the edges.
+    """
+    if len(differences) == 0:
+        return []
+    energy_ev = np.asarray(energy_ev, dtype=np.float64)
+    diffs = np.asarray(differences, dtype=np.float64).reshape(len(differences), -1)
+    n_diff, n = diffs.shape
+
+    cum = np.zeros_like(diffs)
+    cum[:, 1:] = np.cumsum(0.5 * (diffs[:, 1:] + diffs[:, :-1]) * np.diff(energy_ev), axis=1)
+
+    # Boundaries padded with the grid end: padding adds empty segments.
+    width = max((len(b) for b in boundaries), default=0) + 2
+    bounds = np.full((n_diff, width), energy_ev[-1])
+    bounds[:, 0] = energy_ev[0]
+    for p, b in enumerate(boundaries):
+        bounds[p, 1:len(b) + 1] = b
+
+    j = np.clip(np.searchsorted(energy_ev, bounds), 1, n - 1)
+    t = (bounds - energy_ev[j - 1]) / (energy_ev[j] - energy_ev[j - 1])
+    left = np.take_along_axis(cum, j - 1, axis=1)
+    cum_at = left + t * (np.take_along_axis(cum, j, axis=1) - left)
+    integrals = np.diff(cum_at, axis=1)
+
+    rows = np.arange(n_diff)
+    best = np.argmax(integrals, axis=1)
+    lo, hi = bounds[rows, best], bounds[rows, best + 1]
+
+    start = np.searchsorted(energy_ev, lo, side="left")
+    stop = np.searchsorted(energy_ev, hi, side="right")
+    empty = stop <= start  # band narrower than the grid step: use the bracketing points
+    start = np.where(empty, np.maximum(start - 1, 0), start)
+    stop = np.where(empty, np.minimum(stop + 1, n), stop)
+    points = np.arange(n)
+    inside = (points >= start[:, None]) & (points < stop[:, None])
+    peak_at = np.argmax(np.where(inside, diffs, -np.inf), axis=1)
+
+    return [
+        DifferenceBand(float(lo[p]), float(hi[p]), float(energy_ev[peak_at[p]]), float(diffs[p, peak_at[p]]),
+                       float(integrals[p, best[p]]))
+        for p in rows
+    ]
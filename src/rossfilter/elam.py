@@ -0,0 +1,182 @@
+import json
+import os
+import pathlib
+import sqlite3
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from .material import get_db_path, get_material_registry
+
+# Energy range covered by the Elam tables (eV); energies outside are clamped, as in xraydb.
+ELAM_MIN_EV = 100.0
+ELAM_MAX_EV = 800_000.0
+
+MMAP_BYTES = 256 * 1024 * 1024
+
+_local = threading.local()
+
+
+def connect(path: str | None = None) -> sqlite3.Connection:
+    """Open the xraydb database read-only, immutable (no locking) and memory-mapped."""
+    uri = pathlib.Path(os.path.abspath(path or get_db_path())).as_uri()
+    conn = sqlite3.connect(f"{uri}?mode=ro&immutable=1", uri=True)
+    conn.execute("PRAGMA query_only = ON")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+    return conn
+
+
+def get_connection() -> sqlite3.Connection:
+    """The calling thread's connection, opened on first use (and again after a fork)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.pid != os.getpid():
+        conn = _local.conn = connect()
+        _local.pid = os.getpid()
+    return conn
+
+
+@dataclass(frozen=True)
+class ElamTables:
+    """Elam cross-section splines of one element: ``(log E, log sigma, spline)`` per cross section."""
+    element: str
+    molar_mass: float
+    photo: tuple
+    coherent: tuple
+    incoherent: tuple
+
+
+class ElamStore:
+    """Process-wide cache of parsed Elam tables.
+
+    Missing elements are fetched together in one query on the calling
+    thread's connection and parsed once; the arrays are read-only and
+    shared by every thread.
+    """
+
+    _QUERY = (
+        "SELECT e.element, e.molar_mass, p.log_energy, p.log_photoabsorption, p.log_photoabsorption_spline,"
+        " s.log_energy, s.log_coherent_scatter, s.log_coherent_scatter_spline,"
+        " s.log_incoherent_scatter, s.log_incoherent_scatter_spline"
+        " FROM elements e"
+        " JOIN photoabsorption p ON p.element = e.element"
+        " JOIN scattering s ON s.element = e.element"
+        " WHERE e.element IN ({})"
+    )
+
+    def __init__(self):
+        self._tables: dict[str, ElamTables] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, element: str) -> bool:
+        return element in self._tables
+
+    def load(self, elements) -> dict[str, ElamTables]:
+        """Tables of ``elements``, querying the database only for those not yet loaded."""
+        elements = list(dict.fromkeys(elements))
+        missing = [e for e in elements if e not in self._tables]
+        if missing:
+            rows = get_connection().execute(self._QUERY.format(", ".join("?" * len(missing))), missing).fetchall()
+            parsed = {row[0]: self._parse(row) for row in rows}
+            unknown = [e for e in missing if e not in parsed]
+            if unknown:
+                raise ValueError(f"No Elam tables for element(s) {', '.join(unknown)}")
+            with self._lock:
+                for element, tables in parsed.items():
+                    self._tables.setdefault(element, tables)
+        return {e: self._tables[e] for e in elements}
+
+    @staticmethod
+    def _parse(row) -> ElamTables:
+        arrays = []
+        for text in row[2:]:
+            arr = np.array(json.loads(text))
+            arr.flags.writeable = False
+            arrays.append(arr)
+        p_lne, p_val, p_spl, s_lne, c_val, c_spl, i_val, i_spl = arrays
+        return ElamTables(row[0], float(row[1]), (p_lne, p_val, p_spl), (s_lne, c_val, c_spl), (s_lne, i_val, i_spl))
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+
+_store = ElamStore()
+
+
+def get_elam_store() -> ElamStore:
+    return _store
+
+
+def elam_spline(xin: np.ndarray, yin: np.ndarray, yspl: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """Cubic spline through (xin, yin) with second derivatives ``yspl``, at all of ``x`` at once.
+
+    Brackets every point with ``searchsorted`` the way xraydb's point loop
+    does (last knot below, first knot above), so duplicated knots at the
+    edges are handled identically and results are bit-identical.
+    """
+    last = xin.size - 1
+    lo = np.searchsorted(xin, x, side="left") - 1
+    lo[lo < 0] = 0
+    hi = np.searchsorted(xin, x, side="right")
+    hi[hi > last] = last
+    diff = xin[hi] - xin[lo]
+    if np.any(diff <= 0):
+        raise ValueError("x must be strictly increasing")
+    a = (xin[hi] - x) / diff
+    b = (x - xin[lo]) / diff
+    return a * yin[lo] + b * yin[hi] + (diff * diff / 6) * ((a * a - 1) * a * yspl[lo] + (b * b - 1) * b * yspl[hi])
+
+
+def _log_energy(energy_ev) -> np.ndarray:
+    energy_ev = np.atleast_1d(np.array(energy_ev, dtype=np.float64))
+    return np.log(np.clip(energy_ev, ELAM_MIN_EV, ELAM_MAX_EV))
+
+
+def _mu_elam(tables: ElamTables, log_e: np.ndarray) -> np.ndarray:
+    xsec = np.exp(elam_spline(*tables.photo, log_e))
+    xsec += np.exp(elam_spline(*tables.coherent, log_e))
+    xsec += np.exp(elam_spline(*tables.incoherent, log_e))
+    return xsec
+
+
+def mu_elam(element: str, energy_ev) -> np.ndarray:
+    """Total mass attenuation coefficient (cm^2/g) of an element, as ``xraydb.mu_elam``."""
+    return _mu_elam(_store.load([element])[element], _log_energy(energy_ev))
+
+
+def prefetch_elements(materials):
+    """Load the tables of every element in ``materials`` with a single query."""
+    registry = get_material_registry()
+    elements = []
+    for material in materials:
+        info = registry.resolve(material)
+        if info is not None:
+            elements.extend(info.composition)
+    if elements:
+        _store.load(elements)
+
+
+def material_mu(material: str, energy_ev, density: float | None = None) -> np.ndarray:
+    """Linear attenuation coefficient mu(E) in 1/cm, as ``xraydb.material_mu``.
+
+    The composition comes from the material registry and all element tables
+    from one query; log(E) is taken once and the splines are evaluated on
+    the whole array. The mass-weighted sum follows xraydb's order, so
+    results are bit-identical.
+    """
+    info = get_material_registry().resolve(material)
+    if info is None:
+        raise ValueError(f"Unknown material or formula '{material}'")
+    density = info.density if density is None else density
+    if density is None:
+        raise ValueError(f"Density required for unknown material '{material}'")
+    tables = _store.load(info.composition)
+    log_e = _log_energy(energy_ev)
+
+    mass_tot, mu = 0.0, 0.0
+    for elem, frac in info.composition.items():
+        mass = frac * tables[elem].molar_mass
+        mu += mass * _mu_elam(tables[elem], log_e)
+        mass_tot += mass
+    return np.asarray(density * mu / mass_tot, dtype=np.float64)
@@ -1,26 +1,215 @@
-from dataclasses import dataclass
+import threading
+from collections.abc import Sequence
+from dataclasses import dataclass, field
 import numpy as np
-import xraydb
 
+from .attenuation import cached_mu, grid_key
 from .material import (
     InvalidThicknessError,
     MaterialNotFoundError,
+    get_material_registry,
     validate_material,
 )
 
 
-@dataclass
+class MaterialTable:
+    """Interned material names: each distinct name gets a small integer id.
+
+    Ids are stable for the lifetime of the process, so layer arrays can
+    store them instead of strings.
+    """
+
+    def __init__(self):
+        self.names: list[str] = []
+        self._ids: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> int:
+        material_id = self._ids.get(name)
+        if material_id is None:
+            with self._lock:
+                material_id = self._ids.setdefault(name, len(self.names))
+                if material_id == len(self.names):
+                    self.names.append(name)
+        return material_id
+
+    def intern_many(self, names) -> np.ndarray:
+        return np.fromiter((self.intern(n) for n in names), dtype=np.int32)
+
+    def name(self, material_id: int) -> str:
+        return self.names[material_id]
+
+
+_materials = MaterialTable()
+
+
+def get_material_table() -> MaterialTable:
+    """The process-wide table that ``Channel`` material ids refer to."""
+    return _materials
+
+
+@dataclass(slots=True)
 class Filter:
-    """A single filter layer consisting of a material and thickness."""
+    """A single filter layer consisting of a material and thickness.
+
+    ``Channel`` stores its layers as arrays; ``Channel.filters`` hands out
+    ``Filter`` views of them. A view carries the channel's mu(E) for the
+    active grid, so ``transmission`` on it is a single ``exp``.
+    """
     material: str
     thickness: float  # cm
     density: float | None = None  # g/cm^3
+    _mu: np.ndarray | None = field(default=None, init=False, repr=False, compare=False)
+    _grid: tuple | None = field(default=None, init=False, repr=False, compare=False)
+
+    def mu(self, energy_ev, table_rtol: float | None = None, key: tuple | None = None) -> np.ndarray:
+        """Linear attenuation coefficient (1/cm) on ``energy_ev``.
+
+        ``table_rtol`` selects interpolated mu tables (see ``MuTable``);
+        ``key`` is a precomputed ``(grid_key(energy_ev), table_rtol)``.
+        """
+        key = (grid_key(energy_ev), table_rtol) if key is None else key
+        if self._mu is None or self._grid != key:
+            self._mu = cached_mu(self.material, energy_ev, density=self.density, table_rtol=table_rtol)
+            self._grid = key
+        return self._mu
+
+    def optical_depth(self, energy_ev, table_rtol: float | None = None, key: tuple | None = None) -> np.ndarray:
+        return self.mu(energy_ev, table_rtol, key) * self.thickness
+
+    def transmission(self, energy_ev, table_rtol: float | None = None, key: tuple | None = None) -> np.ndarray:
+        return np.exp(-self.optical_depth(energy_ev, table_rtol, key))
+
+
+class FilterView(Sequence):
+    """Read-only ``Sequence[Filter]`` over a channel's layer arrays."""
+
+    def __init__(self, channel: "Channel"):
+        self._channel = channel
+
+    def __len__(self) -> int:
+        return len(self._channel)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._channel.layer(index)
+
+
+def _density_or_nan(density: float | None) -> float:
+    return np.nan if density is None else float(density)
 
 
 class Channel:
-    """A channel consisting of a stack of filters."""
-    def __init__(self):
-        self.filters: list[Filter] = []
+    """A channel consisting of a stack of filters.
+
+    Layers are stored column-wise: interned material ids, thicknesses (cm)
+    and densities (NaN for the material default) in NumPy arrays that grow
+    geometrically, so building large designs does not allocate an object
+    per layer. ``filters`` offers the old list-of-``Filter`` view.
+
+    The summed optical depth sum_i mu_i(E) * t_i is kept for the active
+    energy grid and updated incrementally when layers are added, removed or
+    re-sized, so the transmission is a single ``exp`` away.
+
+    ``version`` is bumped on every successful edit so callers can tell
+    whether results computed earlier are still valid. ``table_rtol`` (None
+    for direct xraydb evaluation) switches to interpolated mu tables.
+    """
+    def __init__(self, table_rtol: float | None = None):
+        self.version = 0
+        self.table_rtol = table_rtol
+        self._n = 0
+        self._material = np.empty(4, dtype=np.int32)
+        self._thickness = np.empty(4, dtype=np.float64)
+        self._density = np.empty(4, dtype=np.float64)
+        self._energy_ev: np.ndarray | None = None
+        self._grid: tuple | None = None
+        self._depth: np.ndarray | None = None
+        self._mu: list[np.ndarray] = []  # per-layer mu(E) on _grid, valid while _depth is set
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def material_ids(self) -> np.ndarray:
+        """Interned material id of each layer (see ``get_material_table``); read-only."""
+        return self._readonly(self._material)
+
+    @property
+    def thickness(self) -> np.ndarray:
+        """Thickness of each layer in cm; read-only."""
+        return self._readonly(self._thickness)
+
+    @property
+    def density(self) -> np.ndarray:
+        """Density of each layer in g/cm^3, NaN for the material default; read-only."""
+        return self._readonly(self._density)
+
+    def _readonly(self, column: np.ndarray) -> np.ndarray:
+        view = column[:self._n]
+        view.flags.writeable = False
+        return view
+
+    @property
+    def filters(self) -> FilterView:
+        return FilterView(self)
+
+    def layer(self, index: int) -> Filter:
+        """``Filter`` view of one layer."""
+        if index < 0:
+            index += self._n
+        if not (0 <= index < self._n):
+            raise IndexError("Invalid filter index")
+        density = self._density[index]
+        flt = Filter(_materials.name(self._material[index]), float(self._thickness[index]),
+                     None if np.isnan(density) else float(density))
+        if self._depth is not None:
+            flt._mu, flt._grid = self._mu[index], self._grid
+        return flt
+
+    def layers(self) -> list[tuple]:
+        """``(material, density, thickness_cm)`` of every layer."""
+        n, names = self._n, _materials.names
+        return [
+            (names[m], None if np.isnan(d) else d, t)
+            for m, d, t in zip(self._material[:n].tolist(), self._density[:n].tolist(), self._thickness[:n].tolist())
+        ]
+
+    def key(self) -> tuple:
+        """Hashable content key: equal for channels with identical layers."""
+        return (self._material[:self._n].tobytes(), self._thickness[:self._n].tobytes(),
+                self._density[:self._n].tobytes(), self.table_rtol)
+
+    def copy(self) -> "Channel":
+        """Independent copy of the layers with the same ``version``, e.g. to calculate on another thread.
+
+        The cached optical depth comes along, so the copy keeps updating it
+        incrementally; the per-layer mu arrays are never modified and are shared.
+        """
+        other = Channel(table_rtol=self.table_rtol)
+        other.version = self.version
+        other._n = self._n
+        other._material = self._material.copy()
+        other._thickness = self._thickness.copy()
+        other._density = self._density.copy()
+        if self._depth is not None:
+            other._energy_ev, other._grid = self._energy_ev, self._grid
+            other._depth = self._depth.copy()
+            other._mu = list(self._mu)
+        return other
+
+    def _reserve(self, n: int):
+        if n > self._material.size:
+            size = max(n, 2 * self._material.size)
+            for name in ("_material", "_thickness", "_density"):
+                column = getattr(self, name)
+                grown = np.empty(size, dtype=column.dtype)
+                grown[:self._n] = column[:self._n]
+                setattr(self, name, grown)
 
     def add_filter(self, material: str, thickness_cm: float, density: float | None = None):
         """Add a filter layer to the channel.
@@ -28,12 +217,47 @@ class Channel:
         Returns:
             (success: bool, message: str)
         """
+        return self.add_filters([material], [thickness_cm], [density])
+
+    def add_filters(self, materials, thicknesses_cm, densities=None):
+        """Append many layers at once; each distinct material is resolved once.
+
+        Args:
+            materials: material names
+            thicknesses_cm: thickness per layer (cm)
+            densities: density per layer, None/NaN for the default (optional)
+
+        Returns:
+            (success: bool, message: str); nothing is added on failure
+        """
         try:
-            is_valid, error_message = validate_material(material, thickness_cm)
-            if not is_valid:
-                return False, error_message
+            materials = list(materials)
+            thickness = np.asarray(thicknesses_cm, dtype=np.float64).reshape(-1)
+            if densities is None:
+                density = np.full(len(materials), np.nan)
+            else:
+                density = np.array([_density_or_nan(d) for d in densities], dtype=np.float64)
+            if not (len(materials) == thickness.size == density.size):
+                return False, "Materials, thicknesses and densities differ in length"
+
+            valid, messages = get_material_registry().validate_many(materials, densities=density)
+            if not valid.all():
+                return False, messages[int(np.argmin(valid))]
+            if np.any(~(thickness > 0)):
+                return False, "Thickness must be positive"
 
-            self.filters.append(Filter(material, thickness_cm, density))
+            start, stop = self._n, self._n + len(materials)
+            self._reserve(stop)
+            self._material[start:stop] = _materials.intern_many(materials)
+            self._thickness[start:stop] = thickness
+            self._density[start:stop] = density
+            self._n = stop
+            if self._depth is not None:
+                for i in range(start, stop):
+                    mu = self._layer_mu(i, self._energy_ev)
+                    self._mu.append(mu)
+                    self._depth += mu * self._thickness[i]
+            self.version += 1
             return True, ""
 
         except MaterialNotFoundError as e:
@@ -45,44 +269,87 @@ class Channel:
 
     def remove_filter(self, index: int):
         """Remove a filter by index."""
-        if 0 <= index < len(self.filters):
-            self.filters.pop(index)
+        if 0 <= index < self._n:
+            if self._depth is not None:
+                self._depth -= self._mu.pop(index) * self._thickness[index]
+            for column in (self._material, self._thickness, self._density):
+                column[index:self._n - 1] = column[index + 1:self._n]
+            self._n -= 1
+            if self._n == 0 and self._depth is not None:
+                self._depth = np.zeros_like(self._depth)  # drop accumulated round-off
+            self.version += 1
             return True, ""
         return False, "Invalid filter index"
 
     def update_filter(self, index: int, material: str, thickness_cm: float, density: float | None = None):
         """Update an existing filter."""
-        if not (0 <= index < len(self.filters)):
+        if not (0 <= index < self._n):
             return False, "Invalid filter index"
 
         try:
-            is_valid, error_message = validate_material(material, thickness_cm)
+            is_valid, error_message = validate_material(material, thickness_cm, density)
             if not is_valid:
                 return False, error_message
 
-            self.filters[index] = Filter(material, thickness_cm, density)
+            material_id = _materials.intern(material)
+            new_density = _density_or_nan(density)
+            same = (material_id == self._material[index]
+                    and (new_density == self._density[index]
+                         or (np.isnan(new_density) and np.isnan(self._density[index]))))
+            old_thickness = self._thickness[index]
+            self._material[index] = material_id
+            self._thickness[index] = thickness_cm
+            self._density[index] = new_density
+            if self._depth is not None:
+                if same:
+                    self._depth += self._mu[index] * (thickness_cm - old_thickness)
+                else:
+                    self._depth -= self._mu[index] * old_thickness
+                    self._mu[index] = self._layer_mu(index, self._energy_ev)
+                    self._depth += self._mu[index] * thickness_cm
+            self.version += 1
             return True, ""
         except Exception as e:
             return False, f"Update error: {str(e)}"
 
-    def calculate_transmission(self, energy_ev):
-        energy_ev = np.array(energy_ev, dtype=np.float64)
-        transmission = np.ones_like(energy_ev, dtype=np.float64)
+    def _layer_mu(self, index: int, energy_ev) -> np.ndarray:
+        density = self._density[index]
+        return cached_mu(_materials.name(self._material[index]), energy_ev,
+                         density=None if np.isnan(density) else float(density), table_rtol=self.table_rtol)
 
-        for filter_layer in self.filters:
-            mu = np.array([xraydb.material_mu(filter_layer.material, e, density=filter_layer.density) for e in energy_ev])
-            transmission *= np.exp(-mu * filter_layer.thickness)
+    def set_table_rtol(self, table_rtol: float | None):
+        """Switch between direct (None) and interpolated mu evaluation."""
+        if table_rtol != self.table_rtol:
+            self.table_rtol = table_rtol
+            self._depth = None
+            self.version += 1
 
-        return transmission
+    def _optical_depth(self, energy_ev) -> np.ndarray:
+        key = (grid_key(energy_ev), self.table_rtol)
+        if self._depth is None or self._grid != key:
+            # One mu(E) per distinct (material, density); duplicates share it
+            # and their thicknesses are summed before the product.
+            n = self._n
+            pairs = np.column_stack([self._material[:n], np.nan_to_num(self._density[:n], nan=-1.0)])
+            _, first, inverse = np.unique(pairs, axis=0, return_index=True, return_inverse=True)
+            inverse = inverse.reshape(-1)
+            unique_mu = [self._layer_mu(i, energy_ev) for i in first]
+            weights = np.bincount(inverse, weights=self._thickness[:n], minlength=len(first))
+            depth = weights @ np.array(unique_mu) if n else np.zeros_like(energy_ev)
+            mu = [unique_mu[j] for j in inverse]
+            self._energy_ev, self._grid, self._depth, self._mu = energy_ev, key, depth, mu
+        return self._depth
+
+    def calculate_transmission(self, energy_ev):
+        energy_ev = np.array(energy_ev, dtype=np.float64)
+        return np.exp(-self._optical_depth(energy_ev))
 
     def calculate_single_filter(self, index: int, energy_ev):
         energy_ev = np.array(energy_ev, dtype=np.float64)
-        if not (0 <= index < len(self.filters)):
+        if not (0 <= index < self._n):
             raise IndexError("Invalid filter index")
 
-        target = self.filters[index]
-        mu = np.array([xraydb.material_mu(target.material, e, density=target.density) for e in energy_ev])
-        return np.exp(-mu * target.thickness)
+        return self.layer(index).transmission(energy_ev, self.table_rtol)
 
     @staticmethod
     def difference(transmission1, transmission2):
@@ -1,13 +1,63 @@
+from __future__ import annotations
+
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
 import customtkinter as ctk
 import numpy as np
-import xraydb
 
-from .calculator import RossFilterCalculator
-from .material import get_material_list
-from .plot_manager import PlotManager
+from .autocomplete import MaterialIndex
 from .plot_selection import PlotSelectionPanel
 from .units import um_to_cm, kev_to_ev
+from .virtual_list import VirtualList
+
+# xraydb (with scipy/sqlalchemy) and matplotlib are imported by _load_backend()
+# on the worker thread once the window is up, not when this module is imported.
+if TYPE_CHECKING:
+    from .calculator import RossFilterCalculator
+
+STARTUP_DELAY_MS = 100  # let the first frame paint before loading the backend
+JOB_POLL_MS = 30  # how often finished background jobs are picked up
+INPUT_DEBOUNCE_MS = 300  # quiet period after the last keystroke before recomputing
+SUGGEST_DEBOUNCE_MS = 60  # pause in typing before the material dropdown is redrawn
+MAX_SUGGESTIONS = 50  # entries shown in the material dropdown while filtering
+ADAPTIVE_TOL = 1e-3  # transmission tolerance of the "Refine near edges" grid
+
+
+def _load_backend():
+    """Import the backend modules, open the disk cache, read the material list and build the edge index.
+
+    Returns the material list and the reason the disk cache is off (None if it is on).
+    """
+    from . import attenuation, calculator, parallel, plot_manager  # noqa: F401
+    from .disk_cache import enable_disk_cache
+    from .edges import get_edge_index
+    from .material import get_material_list, get_material_registry
+
+    cache_error = None
+    try:
+        enable_disk_cache()
+    except OSError as e:
+        cache_error = str(e)
+    materials = get_material_list()
+    get_edge_index()
+    get_material_registry().warm_up_async()
+    return materials, cache_error
+
+
+def _parse_composition(text):
+    """``"Fe0.7Cr0.3"`` -> (formula, None); ``"kapton: 0.95, W: 0.05"`` -> (None, fractions)."""
+    text = text.strip()
+    if not text:
+        raise ValueError("Composition is empty")
+    if ":" not in text:
+        return text, None
+    fractions = {}
+    for part in text.split(","):
+        component, _, weight = part.partition(":")
+        fractions[component.strip()] = float(weight)
+    return None, fractions
 
 
 class AutocompleteComboBox(ctk.CTkComboBox):
@@ -15,6 +65,7 @@ class AutocompleteComboBox(ctk.CTkComboBox):
         super().__init__(*args, **kwargs)
         self.placeholder = placeholder
         self.all_values = self._values
+        self._suggest_job = None
         
         self.set(placeholder)
         self.configure(text_color="gray")
@@ -23,6 +74,14 @@ class AutocompleteComboBox(ctk.CTkComboBox):
         self._entry.bind("<FocusOut>", self._on_focus_out)
         self._entry.bind("<KeyRelease>", self._on_key_release)
 
+    @property
+    def all_values(self):
+        return self._index.names
+
+    @all_values.setter
+    def all_values(self, values):
+        self._index = MaterialIndex(values)
+
     def _on_focus_in(self, event):
         if self.get() == self.placeholder:
             self.set("")
@@ -37,12 +96,18 @@ class AutocompleteComboBox(ctk.CTkComboBox):
         if event.keysym in ["Up", "Down", "Return", "Escape", "Tab"]:
             return
 
+        # Redraw the dropdown once typing pauses, not on every keystroke.
+        if self._suggest_job is not None:
+            self.after_cancel(self._suggest_job)
+        self._suggest_job = self.after(SUGGEST_DEBOUNCE_MS, self._show_suggestions)
+
+    def _show_suggestions(self):
+        self._suggest_job = None
         current_text = self.get()
-        value = current_text.lower()
-        
-        if value:
-            filtered_values = [item for item in self.all_values if value in item.lower()]
-            self.configure(values=filtered_values if filtered_values else self.all_values)
+
+        if current_text:
+            filtered_values = self._index.search(current_text, MAX_SUGGESTIONS)
+            self.configure(values=filtered_values if filtered_values else self.all_values[:MAX_SUGGESTIONS])
             
             if filtered_values:
                 try:
@@ -55,85 +120,108 @@ class AutocompleteComboBox(ctk.CTkComboBox):
                 # Ensure focus remains on the entry widget so typing can continue
                 self._entry.focus_set()
         else:
-            self.configure(values=self.all_values)
+            self.configure(values=self.all_values[:MAX_SUGGESTIONS])
 
 
-class ChannelWidget(ctk.CTkFrame):
-    """Widget representing a single channel in the list (CRUD only)."""
+class ChannelList(VirtualList):
+    """Channel list (CRUD only): a header row per channel followed by its filters.
 
-    def __init__(self, master, channel_idx, channel, 
-                 on_select_callback, 
-                 on_delete_channel_callback,
-                 on_edit_filter_callback,
-                 on_delete_filter_callback,
-                 is_selected=False, **kwargs):
-        super().__init__(master, **kwargs)
-        self.channel_idx = channel_idx
-        self.channel = channel
+    Rows are built per channel and reused until the channel's ``version``
+    changes, and only the visible ones exist as widgets. Selecting a
+    channel recolors the rows of the old and new selection only.
+    """
+
+    selected_color = ("#3B8ED0", "#1F6AA5")  # ctk theme color
+    default_color = ("#EBEBEB", "#2B2B2B")   # ctk frame color
+
+    def __init__(self, master, on_select_callback, on_delete_channel_callback,
+                 on_edit_filter_callback, on_delete_filter_callback, **kwargs):
+        super().__init__(master, self._make_row, self._bind_row, row_height=26, **kwargs)
         self.on_select_callback = on_select_callback
         self.on_delete_channel_callback = on_delete_channel_callback
         self.on_edit_filter_callback = on_edit_filter_callback
         self.on_delete_filter_callback = on_delete_filter_callback
-        
-        self.selected_color = ("#3B8ED0", "#1F6AA5")  # ctk theme color
-        self.default_color = ("#EBEBEB", "#2B2B2B")   # ctk frame color
-        
-        self.configure(fg_color=self.selected_color if is_selected else self.default_color)
-        self.bind("<Button-1>", self._on_click)
-        self.bind("<Button-3>", self._show_header_menu)
-        
-        self.grid_columnconfigure(0, weight=1)
-        
-        header_frame = ctk.CTkFrame(self, fg_color="transparent")
-        header_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(5, 2))
-        header_frame.grid_columnconfigure(1, weight=1)
-        header_frame.bind("<Button-1>", self._on_click, add=True)
-        header_frame.bind("<Button-3>", self._show_header_menu, add=True)
-
-        chan_label = ctk.CTkLabel(header_frame, text=f"Channel {channel_idx + 1}", font=ctk.CTkFont(weight="bold"))
-        chan_label.grid(row=0, column=0, sticky="w")
-        chan_label.bind("<Button-1>", self._on_click, add="+")
-        chan_label.bind("<Button-3>", self._show_header_menu, add="+")
-        
-        # Header Context Menu
-        self.header_menu = tk.Menu(self, tearoff=0)
-        self.header_menu.add_command(label="Delete Channel", command=lambda: self.on_delete_channel_callback(self.channel_idx))
-
-        # Filters list (display only; CRUD via context menu)
-        self.filters_frame = ctk.CTkFrame(self, fg_color="transparent")
-        self.filters_frame.grid(row=1, column=0, sticky="ew", padx=10, pady=(0, 5))
-        self.filters_frame.bind("<Button-1>", self._on_click, add=True)
-        self.filters_frame.bind("<Button-3>", self._show_header_menu, add=True)
-        
-        if not channel.filters:
-            lbl = ctk.CTkLabel(self.filters_frame, text="(Empty)", text_color="gray", font=ctk.CTkFont(size=11))
-            lbl.grid(row=0, column=0, sticky="w")
-            lbl.bind("<Button-1>", self._on_click, add="+")
-            lbl.bind("<Button-3>", self._show_header_menu, add="+")
+        self.selected_idx = -1
+        self._channel_rows = {}  # index -> (channel, version, rows)
+        self._header_font = ctk.CTkFont(weight="bold")
+        self._filter_font = ctk.CTkFont()
+        self._empty_font = ctk.CTkFont(size=11)
+        self._text_color = ctk.ThemeManager.theme["CTkLabel"]["text_color"]
+
+    def refresh(self, channels, selected_idx):
+        items = []
+        cache = {}
+        selected_row = None
+        for idx, channel in enumerate(channels):
+            cached = self._channel_rows.get(idx)
+            if cached is None or cached[0] is not channel or cached[1] != channel.version:
+                cached = (channel, channel.version, self._rows_for_channel(idx, channel))
+            cache[idx] = cached
+            if idx == selected_idx:
+                selected_row = len(items)
+            items.extend(cached[2])
+        self._channel_rows = cache
+
+        old = self.selected_idx
+        self.selected_idx = selected_idx
+        self.set_items(items)
+        self.rebind(lambda item: item[1] in (old, selected_idx), self._recolor)
+        if selected_row is not None and selected_idx != old:
+            self.see(selected_row)
+
+    def select(self, idx):
+        old, self.selected_idx = self.selected_idx, idx
+        if old != idx:
+            self.rebind(lambda item: item[1] in (old, idx), self._recolor)
+
+    @staticmethod
+    def _rows_for_channel(idx, channel):
+        rows = [("channel", idx, f"Channel {idx + 1}")]
+        layers = channel.layers()
+        if not layers:
+            rows.append(("empty", idx, "(Empty)"))
+        for f_idx, (material, density, thickness) in enumerate(layers):
+            text = f"• {material} ({thickness*1e4:.1f} µm)"
+            if density:
+                text += f" [{density} g/cm³]"
+            rows.append(("filter", idx, text, f_idx))
+        return rows
+
+    def _make_row(self, parent):
+        row = ctk.CTkFrame(parent, corner_radius=0)
+        row.item = None
+        row.label = ctk.CTkLabel(row, text="", anchor="w")
+        row.label.pack(fill="x", padx=10)
+        for widget in (row, row.label):
+            widget.bind("<Button-1>", lambda e, r=row: self.on_select_callback(r.item[1]), add="+")
+            widget.bind("<Button-3>", lambda e, r=row: self._show_menu(e, r.item), add="+")
+        return row
+
+    def _bind_row(self, row, item):
+        row.item = item
+        kind, _, text = item[:3]
+        if kind == "channel":
+            row.label.configure(text=text, font=self._header_font, text_color=self._text_color)
+            row.label.pack_configure(padx=10)
+        elif kind == "empty":
+            row.label.configure(text=text, font=self._empty_font, text_color="gray")
+            row.label.pack_configure(padx=20)
         else:
-            for i, flt in enumerate(channel.filters):
-                text = f"• {flt.material} ({flt.thickness*1e4:.1f} µm)"
-                if flt.density:
-                    text += f" [{flt.density} g/cm³]"
-
-                lbl = ctk.CTkLabel(self.filters_frame, text=text, anchor="w")
-                lbl.grid(row=i, column=0, sticky="w")
-                lbl.bind("<Button-1>", self._on_click, add="+")
-                lbl.bind("<Button-3>", lambda e, f_idx=i: self._show_filter_menu(e, f_idx), add="+")
+            row.label.configure(text=text, font=self._filter_font, text_color=self._text_color)
+            row.label.pack_configure(padx=20)
+        self._recolor(row, item)
 
-    def _on_click(self, event):
-        self.on_select_callback(self.channel_idx)
+    def _recolor(self, row, item):
+        row.configure(fg_color=self.selected_color if item[1] == self.selected_idx else self.default_color)
 
-    def _show_header_menu(self, event):
-        try:
-            self.header_menu.tk_popup(event.x_root, event.y_root)
-        finally:
-            self.header_menu.grab_release()
-
-    def _show_filter_menu(self, event, filter_idx):
+    def _show_menu(self, event, item):
         menu = tk.Menu(self, tearoff=0)
-        menu.add_command(label="Edit Filter", command=lambda: self.on_edit_filter_callback(self.channel_idx, filter_idx))
-        menu.add_command(label="Delete Filter", command=lambda: self.on_delete_filter_callback(self.channel_idx, filter_idx))
+        if item[0] == "filter":
+            channel_idx, filter_idx = item[1], item[3]
+            menu.add_command(label="Edit Filter", command=lambda: self.on_edit_filter_callback(channel_idx, filter_idx))
+            menu.add_command(label="Delete Filter", command=lambda: self.on_delete_filter_callback(channel_idx, filter_idx))
+        else:
+            menu.add_command(label="Delete Channel", command=lambda: self.on_delete_channel_callback(item[1]))
         try:
             menu.tk_popup(event.x_root, event.y_root)
         finally:
@@ -141,8 +229,10 @@ class ChannelWidget(ctk.CTkFrame):
 
 
 class RossFilterGUI:
-    def __init__(self, calculator: RossFilterCalculator):
+    def __init__(self, calculator: RossFilterCalculator | None = None):
+        """Build the window; without ``calculator`` one is created once the backend has loaded."""
         self.calculator = calculator
+        self.plot_manager = None
         self.window = ctk.CTk()
         self.window.title("Ross Filter Calculator")
         self.window.geometry("1400x900")
@@ -154,9 +244,18 @@ class RossFilterGUI:
         self.selected_channel_idx = -1
         self.editing_filter_idx = None # (channel_idx, filter_idx) or None
         self.selection_panel = None
+        self.last_result = None
+        self._last_token = None  # _result_token() of last_result
+        self._energies_kev = (None, None)  # (result, its energies in keV) for plotting
         self._channel_refresh_job = None
         self._channel_refresh_preserve = True
 
+        # Heavy attenuation work runs on one worker thread; see _run_in_background().
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rossfilter-calc")
+        self._jobs = {}  # tag -> (sequence number, future)
+        self._job_seq = 0
+        self._debounce_jobs = {}  # name -> Tk after() id
+
         # Main Layout
         self.window.grid_columnconfigure(1, weight=1)
         self.window.grid_rowconfigure(0, weight=1)
@@ -171,9 +270,10 @@ class RossFilterGUI:
         self._setup_left_panel()
         self._setup_right_panel()
         
-        # Initial state
-        self._refresh_channel_list()
+        # Initial state: controls that need the calculator wait for the backend
+        self._set_backend_controls("disabled")
         self._update_filter_creator_state()
+        self.window.after(STARTUP_DELAY_MS, self._start_backend_load)
 
     def _setup_left_panel(self):
         self.left_panel.grid_columnconfigure(0, weight=1)
@@ -191,11 +291,17 @@ class RossFilterGUI:
         lbl = ctk.CTkLabel(self.channel_header_frame, text="Channels", font=ctk.CTkFont(size=16, weight="bold"))
         lbl.pack(side="left")
         
-        add_btn = ctk.CTkButton(self.channel_header_frame, text="+ Add Channel", width=100, command=self._add_channel)
-        add_btn.pack(side="right")
+        self.add_channel_btn = ctk.CTkButton(self.channel_header_frame, text="+ Add Channel", width=100, command=self._add_channel)
+        self.add_channel_btn.pack(side="right")
 
         # 3. Channel List
-        self.channel_list_frame = ctk.CTkScrollableFrame(self.left_panel)
+        self.channel_list_frame = ChannelList(
+            self.left_panel,
+            on_select_callback=self._select_channel,
+            on_delete_channel_callback=self._delete_channel,
+            on_edit_filter_callback=self._edit_filter,
+            on_delete_filter_callback=self._delete_filter,
+        )
         self.channel_list_frame.grid(row=2, column=0, padx=10, pady=5, sticky="nsew")
 
         # 4. Filter Creator
@@ -213,6 +319,9 @@ class RossFilterGUI:
         self.reset_btn = ctk.CTkButton(self.action_frame, text="Reset", width=80, height=40, fg_color="darkred", hover_color="red", command=self._reset)
         self.reset_btn.pack(side="right", padx=(5, 0))
 
+        # Shown only while a background calculation is running
+        self.progress = ctk.CTkProgressBar(self.action_frame, mode="indeterminate", height=6)
+
         # 6. Console
         self.console = ctk.CTkTextbox(self.left_panel, height=120, font=ctk.CTkFont(size=12))
         self.console.grid(row=5, column=0, padx=10, pady=10, sticky="ew")
@@ -238,29 +347,47 @@ class RossFilterGUI:
         self.energy_step.insert(0, "0.5")
         self.energy_step.grid(row=1, column=5, padx=5, pady=5, sticky="ew")
 
+        for entry in (self.energy_start, self.energy_stop, self.energy_step):
+            entry.bind("<KeyRelease>", self._on_energy_input, add="+")
+
+        # Step becomes the coarse starting resolution when refinement is on
+        self.adaptive_var = ctk.BooleanVar(value=False)
+        self.adaptive_check = ctk.CTkCheckBox(self.energy_frame, text="Refine near edges",
+                                              variable=self.adaptive_var, command=self._on_energy_input)
+        self.adaptive_check.grid(row=2, column=0, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+        self.edges_var = ctk.BooleanVar(value=False)
+        self.edges_check = ctk.CTkCheckBox(self.energy_frame, text="Show edges", variable=self.edges_var,
+                                           command=self._plot_selected_series)
+        self.edges_check.grid(row=2, column=3, columnspan=3, padx=5, pady=(0, 5), sticky="w")
+
     def _setup_filter_creator(self):
         self.filter_creator_frame.grid_columnconfigure(1, weight=1)
         
         self.creator_label = ctk.CTkLabel(self.filter_creator_frame, text="Add Filter", font=ctk.CTkFont(weight="bold"))
-        self.creator_label.grid(row=0, column=0, columnspan=2, pady=5)
+        self.creator_label.grid(row=0, column=0, columnspan=3, pady=5)
         
         ctk.CTkLabel(self.filter_creator_frame, text="Material:").grid(row=1, column=0, padx=10, sticky="w")
-        self.material_combo = AutocompleteComboBox(self.filter_creator_frame, values=get_material_list())
-        self.material_combo.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+        self.material_combo = AutocompleteComboBox(self.filter_creator_frame, values=[])
+        self.material_combo.grid(row=1, column=1, padx=(10, 0), pady=5, sticky="ew")
+        self.compound_btn = ctk.CTkButton(self.filter_creator_frame, text="+", width=28,
+                                          command=self._open_compound_dialog)
+        self.compound_btn.grid(row=1, column=2, padx=(4, 10), pady=5)
         
         ctk.CTkLabel(self.filter_creator_frame, text="Thickness (µm):").grid(row=2, column=0, padx=10, sticky="w")
         self.thickness_var = ctk.StringVar(value="0.0")
         self.thickness_entry = ctk.CTkEntry(self.filter_creator_frame, textvariable=self.thickness_var)
-        self.thickness_entry.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
+        # Only typing previews; programmatic set() (edit, reset) must not replace the plot
+        self.thickness_entry.bind("<KeyRelease>", self._on_thickness_input, add="+")
+        self.thickness_entry.grid(row=2, column=1, columnspan=2, padx=10, pady=5, sticky="ew")
 
         ctk.CTkLabel(self.filter_creator_frame, text="Density (g/cm³):").grid(row=3, column=0, padx=10, sticky="w")
         self.density_var = ctk.StringVar(value="")
         self.density_entry = ctk.CTkEntry(self.filter_creator_frame, textvariable=self.density_var, placeholder_text="Optional")
-        self.density_entry.grid(row=3, column=1, padx=10, pady=5, sticky="ew")
+        self.density_entry.grid(row=3, column=1, columnspan=2, padx=10, pady=5, sticky="ew")
         
         # Buttons
         btn_frame = ctk.CTkFrame(self.filter_creator_frame, fg_color="transparent")
-        btn_frame.grid(row=4, column=0, columnspan=2, pady=10, sticky="ew")
+        btn_frame.grid(row=4, column=0, columnspan=3, pady=10, sticky="ew")
         btn_frame.grid_columnconfigure((0, 1), weight=1)
         
         self.preview_btn = ctk.CTkButton(btn_frame, text="Preview", command=self._preview_filter, fg_color="gray")
@@ -274,8 +401,9 @@ class RossFilterGUI:
         self.right_panel.grid_columnconfigure(0, weight=3)
         self.right_panel.grid_columnconfigure(1, weight=1)
 
-        self.plot_manager = PlotManager(self.right_panel)
-        self.plot_manager.widget.grid(row=0, column=0, sticky="nsew")
+        # Replaced by the PlotManager once matplotlib has been imported
+        self.plot_placeholder = ctk.CTkLabel(self.right_panel, text="Loading…", text_color="gray")
+        self.plot_placeholder.grid(row=0, column=0, sticky="nsew")
 
         self.selection_panel = PlotSelectionPanel(self.right_panel, on_change=self._on_selection_changed)
         self.selection_panel.grid(row=0, column=1, sticky="ns", padx=8, pady=8)
@@ -284,6 +412,154 @@ class RossFilterGUI:
         self.console.insert("end", f"{msg}\n")
         self.console.see("end")
 
+    def _set_backend_controls(self, state):
+        for widget in (self.add_channel_btn, self.calc_btn, self.reset_btn, self.adaptive_check, self.edges_check):
+            widget.configure(state=state)
+
+    def _start_backend_load(self):
+        self._run_in_background("startup", _load_backend, self._on_backend_loaded,
+                                lambda e: self._log(f"Error loading backend: {str(e)}"))
+
+    def _on_backend_loaded(self, loaded):
+        from .calculator import RossFilterCalculator
+        from .plot_manager import PlotManager
+
+        if self.calculator is None:
+            self.calculator = RossFilterCalculator()
+        self.plot_placeholder.destroy()
+        self.plot_manager = PlotManager(self.right_panel)
+        self.plot_manager.widget.grid(row=0, column=0, sticky="nsew")
+
+        materials, cache_error = loaded
+        if cache_error:
+            self._log(f"Disk cache disabled: {cache_error}")
+        self.material_combo.all_values = materials
+        self.material_combo.configure(values=materials[:MAX_SUGGESTIONS])
+        self._set_backend_controls("normal")
+        self._refresh_channel_list()
+        self._update_filter_creator_state()
+
+    def _run_in_background(self, tag, work, on_done, on_error=None):
+        """Run ``work()`` on the worker thread, then ``on_done(result)`` on the Tk thread.
+
+        A newer job with the same tag supersedes the older one: if it has not
+        started it is cancelled, otherwise its result is dropped.
+        """
+        self._cancel_job(tag)
+        self._job_seq += 1
+        seq = self._job_seq
+        future = self._executor.submit(work)
+        self._jobs[tag] = (seq, future)
+        self._set_busy(True)
+        self.window.after(JOB_POLL_MS, self._poll_job, tag, seq, future, on_done, on_error)
+
+    def _poll_job(self, tag, seq, future, on_done, on_error):
+        if not future.done():
+            self.window.after(JOB_POLL_MS, self._poll_job, tag, seq, future, on_done, on_error)
+            return
+        current = self._jobs.get(tag)
+        if current is None or current[0] != seq:
+            return  # superseded or cancelled
+        del self._jobs[tag]
+        self._set_busy(bool(self._jobs))
+
+        error = future.exception()
+        if error is not None:
+            if on_error:
+                on_error(error)
+            else:
+                self._log(f"Error: {str(error)}")
+            return
+        on_done(future.result())
+
+    def _cancel_job(self, tag):
+        job = self._jobs.pop(tag, None)
+        if job is not None:
+            job[1].cancel()
+            self._set_busy(bool(self._jobs))
+
+    def _set_busy(self, busy):
+        if busy and not self.progress.winfo_ismapped():
+            self.progress.pack(side="bottom", fill="x", pady=(6, 0), before=self.calc_btn)
+            self.progress.start()
+        elif not busy and self.progress.winfo_ismapped():
+            self.progress.stop()
+            self.progress.pack_forget()
+
+    def _result_token(self, erange):
+        """Identifies the inputs of a calculation: channel state, energy range and grid mode."""
+        return (self.calculator.state_token(), erange, self._adaptive_tol())
+
+    def _calculate_in_background(self, tag, erange, on_done, on_error=None):
+        """Run ``calculate_transmission`` on the worker thread, then ``on_done(result)`` on the Tk thread.
+
+        The worker calculates a snapshot of the channels, so they can be
+        edited meanwhile. The result is only used if the channels, energy
+        range and grid mode are still the ones it was calculated for;
+        otherwise it is dropped.
+        """
+        token = self._result_token(erange)
+        snapshot = self.calculator.snapshot()
+        adaptive_tol = self._adaptive_tol()
+
+        def work():
+            return snapshot.calculate_transmission(*erange, adaptive_tol=adaptive_tol)
+
+        def done(outcome):
+            if self._result_token(self._get_energy_range()) != token:
+                if tag == "calculate":
+                    self._log("Inputs changed during the calculation; press Calculate again.")
+                return
+            success, result = outcome
+            if not success:
+                if on_error:
+                    on_error(result)
+                else:
+                    self._log(f"Error: {result}")
+                return
+            # Keep the snapshot's optical depths so the next edit updates them incrementally.
+            self.calculator.adopt(snapshot)
+            self.last_result, self._last_token = result, token
+            on_done(result)
+
+        self._run_in_background(tag, work, done, on_error)
+
+    def _adaptive_tol(self):
+        return ADAPTIVE_TOL if self.adaptive_var.get() else None
+
+    def _debounce(self, name, callback, delay_ms=INPUT_DEBOUNCE_MS):
+        """Call ``callback`` once input named ``name`` has been quiet for ``delay_ms``."""
+        job = self._debounce_jobs.pop(name, None)
+        if job is not None:
+            self.window.after_cancel(job)
+        self._debounce_jobs[name] = self.window.after(delay_ms, self._run_debounced, name, callback)
+
+    def _run_debounced(self, name, callback):
+        self._debounce_jobs.pop(name, None)
+        callback()
+
+    def _on_energy_input(self, event=None):
+        self._cancel_job("calculate")
+        self._debounce("energy", self._on_energy_changed)
+
+    def _on_energy_changed(self):
+        if self._get_energy_range() and self.selection_panel and self.selection_panel.get_selected_keys():
+            self._plot_selected_series()
+
+    def _on_thickness_input(self, event=None):
+        self._cancel_job("preview")
+        self._debounce("thickness", self._on_thickness_changed)
+
+    def _on_thickness_changed(self):
+        if self.material_combo.get() not in self.material_combo.all_values:
+            return
+        try:
+            if float(self.thickness_var.get()) <= 0:
+                return
+        except ValueError:
+            return
+        self._preview_filter(quiet=True)
+
     def _add_channel(self):
         idx = self.calculator.add_channel()
         self._log(f"Added Channel {idx + 1}")
@@ -295,26 +571,11 @@ class RossFilterGUI:
     def _select_channel(self, idx):
         self.selected_channel_idx = idx
         self.editing_filter_idx = None
-        self._request_channel_refresh() # To update selection visuals
+        self.channel_list_frame.select(idx)
         self._update_filter_creator_state()
 
     def _refresh_channel_list(self, preserve_selection=True):
-        for widget in self.channel_list_frame.winfo_children():
-            widget.destroy()
-
-        for i, channel in enumerate(self.calculator.channels):
-            cw = ChannelWidget(
-                self.channel_list_frame, 
-                channel_idx=i, 
-                channel=channel, 
-                on_select_callback=self._select_channel,
-                on_delete_channel_callback=self._delete_channel,
-                on_edit_filter_callback=self._edit_filter,
-                on_delete_filter_callback=self._delete_filter,
-                is_selected=(i == self.selected_channel_idx)
-            )
-            cw.pack(fill="x", pady=2)
-
+        self.channel_list_frame.refresh(self.calculator.channels, self.selected_channel_idx)
         self._refresh_selection_panel(preserve_selection=preserve_selection)
 
     def _refresh_selection_panel(self, preserve_selection=True):
@@ -354,12 +615,14 @@ class RossFilterGUI:
                 self.add_filter_btn.configure(text="Add Filter", state="normal")
                 
             self.material_combo.configure(state="normal")
+            self.compound_btn.configure(state="normal")
             self.thickness_entry.configure(state="normal")
             self.density_entry.configure(state="normal")
             self.preview_btn.configure(state="normal")
         else:
             self.creator_label.configure(text="Select a Channel to Add Filter")
             self.material_combo.configure(state="disabled")
+            self.compound_btn.configure(state="disabled")
             self.thickness_entry.configure(state="disabled")
             self.density_entry.configure(state="disabled")
             self.preview_btn.configure(state="disabled")
@@ -406,6 +669,46 @@ class RossFilterGUI:
             self._update_filter_creator_state()
             self._plot_selected_series()
 
+    def _open_compound_dialog(self):
+        """Small window to define a custom compound by formula or mass fractions."""
+        dialog = ctk.CTkToplevel(self.window)
+        dialog.title("New Compound")
+        dialog.transient(self.window)
+        dialog.grid_columnconfigure(1, weight=1)
+
+        fields = {}
+        for row, (label, hint) in enumerate([
+            ("Name:", "e.g. steel"),
+            ("Composition:", "Fe0.7Cr0.19Ni0.11  or  kapton: 0.95, W: 0.05"),
+            ("Density (g/cm³):", "e.g. 7.9"),
+        ]):
+            ctk.CTkLabel(dialog, text=label).grid(row=row, column=0, padx=10, pady=5, sticky="w")
+            entry = ctk.CTkEntry(dialog, width=280, placeholder_text=hint)
+            entry.grid(row=row, column=1, padx=10, pady=5, sticky="ew")
+            fields[label] = entry
+
+        def create():
+            name = fields["Name:"].get().strip()
+            try:
+                density = float(fields["Density (g/cm³):"].get())
+                formula, mass_fractions = _parse_composition(fields["Composition:"].get())
+            except ValueError as e:
+                self._log(f"Error: {str(e) or 'Invalid compound'}")
+                return
+            success, msg = self.calculator.define_compound(name, density, formula, mass_fractions)
+            self._log(msg if success else f"Error: {msg}")
+            if success:
+                from .material import get_material_list
+
+                self.material_combo.all_values = get_material_list()
+                self.material_combo.configure(values=self.material_combo.all_values[:MAX_SUGGESTIONS])
+                self.material_combo.set(name)
+                self.material_combo.configure(text_color=("black", "white"))
+                dialog.destroy()
+
+        ctk.CTkButton(dialog, text="Create", command=create).grid(row=3, column=0, columnspan=2, pady=10)
+        fields["Name:"].focus_set()
+
     def _get_energy_range(self):
         try:
             start = float(self.energy_start.get())
@@ -454,7 +757,7 @@ class RossFilterGUI:
         self._update_filter_creator_state()
         self._log(f"Editing Filter {filter_idx + 1} in Channel {channel_idx + 1}")
 
-    def _preview_filter(self):
+    def _preview_filter(self, quiet=False):
         # Calculate transmission for just this filter
         material = self.material_combo.get()
         try:
@@ -475,50 +778,62 @@ class RossFilterGUI:
         if not erange:
             self._log("Error: Invalid energy range")
             return
-        
-        start, stop, step = erange
-        energies_kev = np.arange(start, stop + step, step)
-        energies_ev = kev_to_ev(energies_kev)
-        
-        try:
-            # Create a temporary filter to calc transmission
-            # We can use the Channel logic or direct calculation
-            energies_ev = np.asarray(energies_ev)  # Ensure it's always an array
-            mu = np.array([xraydb.material_mu(material, e, density=density) for e in energies_ev])
-            transmission = np.exp(-mu * thickness_cm)
-            
+
+        table_rtol = self.calculator.table_rtol
+
+        def work():
+            from .attenuation import cached_mu
+            from .calculator import energy_grid
+
+            energies_ev = energy_grid(*(kev_to_ev(v) for v in erange))
+            mu = cached_mu(material, energies_ev, density=density, table_rtol=table_rtol)
+            return energies_ev, np.exp(-mu * thickness_cm)
+
+        def show(preview):
+            energies_ev, transmission = preview
             self.plot_manager.clear(title="Preview")
-            self.plot_manager.plot_series(energies_kev, transmission, label='Preview', style='--', color='gray', alpha=0.7)
+            self.plot_manager.plot_series(energies_ev / 1e3, transmission, label='Preview', style='--', color='gray',
+                                          alpha=0.7, key="preview")
             self.plot_manager.draw()
-            self._log(f"Previewing {material} ({thickness_um} µm)")
-            
-        except Exception as e:
-            self._log(f"Preview Error: {str(e)}")
+            if not quiet:
+                self._log(f"Previewing {material} ({thickness_um} µm)")
+
+        def preview_error(e):
+            if not quiet:
+                self._log(f"Preview Error: {str(e)}")
+
+        self._run_in_background("preview", work, show, preview_error)
 
     def _calculate(self):
         erange = self._get_energy_range()
         if not erange:
             self._log("Error: Invalid energy range")
             return
-            
-        success, result = self.calculator.calculate_transmission(*erange)
-        
-        if success:
-            self.difference_count = len(result.differences)
-            self._refresh_selection_panel(preserve_selection=False)
-            if self.selection_panel:
-                self.selection_panel.set_selected_keys([], exclusive=True)
 
-            self.plot_manager.clear(title="Ross Filter Transmission")
-            self.plot_manager.draw()
-            self._log("Filter bands calculated. Select items to plot from Plot Selection.")
-        else:
-            self.difference_count = 0
-            self._refresh_selection_panel(preserve_selection=True)
-            self._log(f"Error: {result}")
+        self._calculate_in_background("calculate", erange, self._finish_calculate, self._calculate_failed)
+
+    def _finish_calculate(self, result):
+        self.difference_count = len(result.differences)
+        self._refresh_selection_panel(preserve_selection=False)
+        if self.selection_panel:
+            self.selection_panel.set_selected_keys([], exclusive=True)
+
+        self.plot_manager.clear(title="Ross Filter Transmission")
+        self.plot_manager.draw()
+        for i, band in enumerate(result.bands):
+            self._log(f"Diff {i + 1}-{i + 2} band: {band.lo_ev / 1e3:.3f}-{band.hi_ev / 1e3:.3f} keV, "
+                      f"peak {band.peak:.3f} at {band.peak_ev / 1e3:.3f} keV")
+        self._log("Filter bands calculated. Select items to plot from Plot Selection.")
+
+    def _calculate_failed(self, error):
+        self.difference_count = 0
+        self._refresh_selection_panel(preserve_selection=True)
+        self._log(f"Error: {str(error)}")
 
     def _reset(self):
         self.calculator.reset()
+        self.last_result = None
+        self._last_token = None
         self.selected_channel_idx = -1
         self.editing_filter_idx = None
         self.difference_count = 0
@@ -528,6 +843,7 @@ class RossFilterGUI:
         if self.selection_panel:
             self.selection_panel.set_selected_keys([], exclusive=True)
         self.plot_manager.clear(title="Ross Filter Transmission")
+        self.plot_manager.forget()
         self.plot_manager.draw()
         self._log("Reset all channels.")
 
@@ -535,55 +851,78 @@ class RossFilterGUI:
         self._plot_selected_series(keys)
 
     def _plot_selected_series(self, selected_keys=None):
+        if self.plot_manager is None:
+            return
+        selected = selected_keys if selected_keys is not None else (
+            self.selection_panel.get_selected_keys() if self.selection_panel else []
+        )
+        if not selected:
+            self._cancel_job("plot")
+            self.plot_manager.clear(title="Selected Transmissions")
+            self.plot_manager.draw()
+            return
+
         erange = self._get_energy_range()
         if not erange:
             self._log("Error: Invalid energy range")
             return
+        if self.last_result is not None and self._last_token == self._result_token(erange):
+            self._cancel_job("plot")
+            self._draw_selected_series(selected, self.last_result)
+            return
+        self._calculate_in_background("plot", erange, lambda result: self._draw_selected_series(selected, result))
 
-        start, stop, step = erange
-        energies_kev = np.arange(start, stop + step, step)
-        energies_ev = kev_to_ev(energies_kev)
-
+    def _draw_selected_series(self, selected, result):
         try:
-            selected = selected_keys if selected_keys is not None else (
-                self.selection_panel.get_selected_keys() if self.selection_panel else []
-            )
-
             self.plot_manager.clear(title="Selected Transmissions")
-
-            if not selected:
-                self.plot_manager.draw()
-                return
+            if self._energies_kev[0] is not result:
+                self._energies_kev = (result, result.energies_ev / 1e3)
+            energies_kev = self._energies_kev[1]
 
             for key in selected:
                 if key[0] == "channel":
                     c_idx = key[1]
-                    channel = self.calculator.channels[c_idx]
-                    transmission = channel.calculate_transmission(energies_ev)
                     label = f"Channel {c_idx + 1}"
-                    self.plot_manager.plot_series(energies_kev, transmission, label=label)
+                    self.plot_manager.plot_series(energies_kev, result.transmissions[c_idx], label=label, key=key)
                 elif key[0] == "filter":
                     c_idx, f_idx = key[1], key[2]
-                    channel = self.calculator.channels[c_idx]
-                    transmission = channel.calculate_single_filter(f_idx, energies_ev)
-                    flt = channel.filters[f_idx]
+                    flt = self.calculator.channels[c_idx].filters[f_idx]
                     label = f"Ch {c_idx + 1}: {flt.material}"
-                    self.plot_manager.plot_series(energies_kev, transmission, label=label)
+                    self.plot_manager.plot_series(energies_kev, result.filter_transmissions[c_idx][f_idx],
+                                                  label=label, key=key)
                 elif key[0] == "diff":
                     d_idx = key[1]
-                    if d_idx + 1 < len(self.calculator.channels):
-                        ch1 = self.calculator.channels[d_idx]
-                        ch2 = self.calculator.channels[d_idx + 1]
-                        t1 = ch1.calculate_transmission(energies_ev)
-                        t2 = ch2.calculate_transmission(energies_ev)
-                        diff = np.abs(t1 - t2)
+                    if d_idx < len(result.differences):
+                        diff = result.differences[d_idx]
                         label = f"Diff {d_idx + 1}-{d_idx + 2}"
-                        self.plot_manager.plot_series(energies_kev, diff, label=label, style="--")
-                        self.plot_manager.fill_between(energies_kev, diff, alpha=0.2)
+                        self.plot_manager.plot_series(energies_kev, diff, label=label, style="--", key=key)
+                        self.plot_manager.fill_between(energies_kev, diff, alpha=0.2, key=key)
 
+            self._show_edges(result, selected)
             self.plot_manager.draw()
         except Exception as e:
             self._log(f"Plot Error: {str(e)}")
 
+    def _show_edges(self, result, selected):
+        """Mark the K/L edges of the plotted channels, from the in-memory edge index."""
+        if not self.edges_var.get():
+            return
+        channels = set()
+        for key in selected:
+            if key[0] in ("channel", "filter"):
+                channels.add(key[1])
+            elif key[0] == "diff":
+                channels.update((key[1], key[1] + 1))
+        success, edges = self.calculator.absorption_edges(result.energies_ev[0], result.energies_ev[-1],
+                                                          sorted(channels))
+        if not success:
+            self._log(f"Error: {edges}")
+            return
+        energies_ev, labels = edges
+        self.plot_manager.set_markers(energies_ev / 1e3, labels)
+
     def run(self):
-        self.window.mainloop()
+        try:
+            self.window.mainloop()
+        finally:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,77 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class PixelColumns:
+    """Points ``lo:hi`` of a sorted x array split into columns of equal width in x.
+
+    ``starts`` holds the first index (relative to ``lo``) of every non-empty
+    column and ``column`` the column of every point; both are None when the
+    range is small enough to draw as is.
+    """
+    lo: int
+    hi: int
+    starts: np.ndarray | None = None
+    column: np.ndarray | None = None
+
+
+def pixel_columns(x, x_min: float, x_max: float, n_columns: int) -> PixelColumns:
+    """Bin the points of sorted ``x`` in [x_min, x_max] into ``n_columns`` columns.
+
+    The neighbours just outside the range are included so lines reach the
+    axes edges. Ranges with at most four points per column are not binned.
+    """
+    x = np.asarray(x)
+    lo = max(int(np.searchsorted(x, x_min, side="left")) - 1, 0)
+    hi = min(int(np.searchsorted(x, x_max, side="right")) + 1, x.size)
+    if hi - lo <= 4 * n_columns:
+        return PixelColumns(lo, hi)
+    xs = x[lo:hi]
+    edges = np.linspace(xs[0], xs[-1], n_columns + 1)[:-1]
+    starts = np.unique(np.searchsorted(xs, edges, side="left"))
+    counts = np.diff(np.append(starts, xs.size))
+    column = np.repeat(np.arange(starts.size), counts)
+    return PixelColumns(lo, hi, starts, column)
+
+
+def _first_in_column(mask: np.ndarray, column: np.ndarray) -> np.ndarray:
+    pos = np.flatnonzero(mask)
+    col = column[pos]
+    first = np.ones(pos.size, dtype=bool)
+    first[1:] = col[1:] != col[:-1]
+    return pos[first]
+
+
+def envelope_indices(y, columns: PixelColumns) -> np.ndarray:
+    """Indices of ``y`` that draw the same picture at the columns' resolution.
+
+    Keeps the first, last, minimum and maximum point of every column, in
+    order (the M4 envelope), so peaks and the vertical jump at an absorption
+    edge survive decimation. NaNs are ignored.
+    """
+    if columns.starts is None:
+        return np.arange(columns.lo, columns.hi)
+    ys = np.asarray(y)[columns.lo:columns.hi]
+    starts, column = columns.starts, columns.column
+    with np.errstate(invalid="ignore"):
+        y_min = np.fmin.reduceat(ys, starts)
+        y_max = np.fmax.reduceat(ys, starts)
+    ends = np.append(starts[1:], ys.size) - 1
+    idx = np.concatenate([
+        starts,
+        ends,
+        _first_in_column(ys == y_min[column], column),
+        _first_in_column(ys == y_max[column], column),
+    ])
+    return columns.lo + np.unique(idx)
+
+
+def decimate(x, y, x_min: float | None = None, x_max: float | None = None, n_columns: int = 2000):
+    """``(x, y)`` reduced to its min/max envelope over ``n_columns`` columns of [x_min, x_max]."""
+    x = np.asarray(x)
+    x_min = x[0] if x_min is None else x_min
+    x_max = x[-1] if x_max is None else x_max
+    idx = envelope_indices(y, pixel_columns(x, x_min, x_max, n_columns))
+    return x[idx], np.asarray(y)[idx]
@@ -1,6 +1,10 @@
 import os
 import sys
+import threading
+from dataclasses import dataclass
+from numbers import Real
 
+import numpy as np
 import xraydb
 
 
@@ -24,10 +28,249 @@ def get_db_path() -> str:
     return os.path.join(os.path.dirname(xraydb.__file__), "xraydb.sqlite")
 
 
+@dataclass(frozen=True)
+class MaterialInfo:
+    """A resolved material: xraydb named material or bare chemical formula."""
+    name: str
+    formula: str
+    composition: dict  # element symbol -> atoms per formula unit
+    density: float | None  # default g/cm^3; None if the formula has none
+    named: bool  # True for an xraydb named material or a custom compound
+    mass_fractions: dict | None = None  # element -> mass fraction, custom compounds only
+
+    @property
+    def custom(self) -> bool:
+        return self.mass_fractions is not None
+
+
+class MaterialRegistry:
+    """Resolves material names and formulas once and caches the result.
+
+    Lookups follow ``xraydb.find_material``: a case-insensitive material
+    name first, then an exact formula of a named material. Anything else is
+    parsed as a chemical formula; bare element symbols get the elemental
+    density as their default. Unknown names are cached too, so repeated
+    validation of the same input is a dict lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name: dict[str, object] | None = None
+        self._by_formula: dict[str, object] = {}
+        self._names: list[str] | None = None
+        self._resolved: dict[str, MaterialInfo | None] = {}
+        self._compounds: dict[str, MaterialInfo] = {}
+        self._warm_thread: threading.Thread | None = None
+
+    def _index(self) -> dict:
+        if self._by_name is None:
+            with self._lock:
+                if self._by_name is None:
+                    materials = xraydb.get_materials()
+                    by_formula = {}
+                    for mat in materials.values():
+                        by_formula.setdefault(mat.formula, mat)
+                    self._by_formula = by_formula
+                    self._names = sorted(materials)
+                    self._by_name = dict(materials)
+        return self._by_name
+
+    def names(self) -> list[str]:
+        """Sorted names of the xraydb named materials and custom compounds."""
+        self._index()
+        if not self._compounds:
+            return list(self._names)
+        return sorted([*self._names, *self._compounds])
+
+    def compound(self, name: str) -> MaterialInfo | None:
+        """The custom compound registered as ``name``, None otherwise."""
+        return self._compounds.get(name)
+
+    def define(self, name: str, density: float, *, formula: str | None = None,
+               mass_fractions: dict | None = None) -> MaterialInfo:
+        """Register a custom compound from a chemical formula or mass fractions.
+
+        ``mass_fractions`` maps components to their share of the mass; a
+        component may be an element, a formula, a named material or another
+        compound, and the fractions are normalised. Defining the same
+        compound twice is a no-op; reusing a name with another definition,
+        or the name of a known material, raises ``MaterialError``.
+        """
+        if not isinstance(name, str) or not name.strip():
+            raise MaterialError("Compound name must be a non-empty string")
+        if (formula is None) == (mass_fractions is None):
+            raise MaterialError("Give either a formula or mass fractions")
+        if not (isinstance(density, Real) and density > 0):
+            raise MaterialError("Density must be positive")
+
+        self._index()
+        fractions = self._element_fractions({formula: 1.0} if formula is not None else mass_fractions)
+        moles = {elem: w / xraydb.atomic_mass(elem) for elem, w in fractions.items()}
+        if formula is not None:
+            composition = dict(xraydb.chemparse(formula))
+        else:
+            total = sum(moles.values())
+            composition = {elem: n / total for elem, n in moles.items()}
+            formula = "".join(f"{elem}{n:.6g}" for elem, n in composition.items())
+        info = MaterialInfo(name, formula, composition, float(density), True, fractions)
+
+        with self._lock:
+            existing = self._compounds.get(name)
+            if existing is not None:
+                if existing == info:
+                    return existing
+                raise MaterialError(f"Compound '{name}' is already defined")
+            if self._resolve(name) is not None:
+                raise MaterialError(f"'{name}' is already a material or formula")
+            self._compounds[name] = info
+            self._resolved[name] = info
+        return info
+
+    def _element_fractions(self, components: dict) -> dict:
+        fractions: dict[str, float] = {}
+        for component, weight in components.items():
+            if not (isinstance(weight, Real) and weight > 0):
+                raise MaterialError(f"Mass fraction of '{component}' must be positive")
+            info = self.resolve(component) if isinstance(component, str) else None
+            if info is None:
+                raise MaterialNotFoundError(f"Material '{component}' not found in database")
+            if info.custom:
+                parts = info.mass_fractions
+            else:
+                masses = {elem: n * xraydb.atomic_mass(elem) for elem, n in info.composition.items()}
+                total = sum(masses.values())
+                parts = {elem: m / total for elem, m in masses.items()}
+            for elem, w in parts.items():
+                fractions[elem] = fractions.get(elem, 0.0) + float(weight) * w
+        total = sum(fractions.values())
+        return {elem: w / total for elem, w in fractions.items()}
+
+    def resolve(self, name: str) -> MaterialInfo | None:
+        """``MaterialInfo`` for a material name or formula, None if unknown."""
+        try:
+            return self._resolved[name]
+        except KeyError:
+            pass
+        info = self._resolve(name)
+        self._resolved[name] = info
+        return info
+
+    def _resolve(self, name: str) -> MaterialInfo | None:
+        if name in self._compounds:
+            return self._compounds[name]
+        by_name = self._index()
+        mat = by_name.get(name.lower()) or self._by_formula.get(name)
+        if mat is not None:
+            return MaterialInfo(name, mat.formula, dict(xraydb.chemparse(mat.formula)), float(mat.density), True)
+        try:
+            composition = dict(xraydb.chemparse(name))
+        except ValueError:
+            return None
+        if not composition:
+            return None
+        density = None
+        if len(composition) == 1 and name in composition:
+            density = float(xraydb.atomic_density(name))
+        return MaterialInfo(name, name, composition, density, False)
+
+    def validate(self, material_name, thickness=None, density=None):
+        """Check that a layer of ``material_name`` can be evaluated.
+
+        Formulas that are not named materials need an explicit ``density``.
+
+        Returns:
+            (is_valid: bool, error_message: str)
+        """
+        try:
+            if not isinstance(material_name, str):
+                raise MaterialError("Material name must be a string")
+
+            info = self.resolve(material_name)
+            if info is None or (not info.named and density is None):
+                raise MaterialNotFoundError(f"Material '{material_name}' not found in database")
+
+            if thickness is not None:
+                if not isinstance(thickness, Real):
+                    raise InvalidThicknessError("Thickness must be a number")
+                if thickness <= 0:
+                    raise InvalidThicknessError("Thickness must be positive")
+
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+
+    def validate_many(self, materials, thicknesses=None, densities=None):
+        """Validate many layers at once; each distinct material is resolved once.
+
+        Args:
+            materials: material name per layer
+            thicknesses: thickness per layer (optional)
+            densities: density per layer, None/NaN for the default (optional)
+
+        Returns:
+            (valid: bool array, messages: list of str, "" where valid)
+        """
+        materials = list(materials)
+        n = len(materials)
+        if densities is None:
+            has_density = np.zeros(n, dtype=bool)
+        else:
+            has_density = np.array([d is not None and not np.isnan(d) for d in densities], dtype=bool)
+        messages = [""] * n
+        checked = {}
+        for i, (material, explicit) in enumerate(zip(materials, has_density.tolist())):
+            key = (material, explicit) if isinstance(material, str) else (None, explicit)
+            result = checked.get(key)
+            if result is None:
+                result = checked[key] = self.validate(material, density=1.0 if explicit else None)
+            messages[i] = result[1]
+        if thicknesses is not None:
+            thickness = np.asarray(thicknesses, dtype=np.float64).reshape(-1)
+            if thickness.size != n:
+                raise ValueError("Materials and thicknesses differ in length")
+            for i in np.flatnonzero(~(thickness > 0)):
+                if not messages[i]:
+                    messages[i] = "Thickness must be positive"
+        valid = np.array([not m for m in messages], dtype=bool)
+        return valid, messages
+
+    def warm_up(self) -> int:
+        """Resolve every named material now; returns how many were resolved."""
+        for name in self.names():
+            self.resolve(name)
+        return len(self._names)
+
+    def warm_up_async(self) -> threading.Thread:
+        """Run ``warm_up`` on a daemon thread (once) and return the thread."""
+        with self._lock:
+            if self._warm_thread is None:
+                self._warm_thread = threading.Thread(target=self.warm_up, name="material-warm-up", daemon=True)
+                self._warm_thread.start()
+            return self._warm_thread
+
+
+_registry = MaterialRegistry()
+
+
+def get_material_registry() -> MaterialRegistry:
+    """The process-wide material registry."""
+    return _registry
+
+
+def define_compound(name: str, density: float, *, formula: str | None = None,
+                    mass_fractions: dict | None = None) -> MaterialInfo:
+    """Register a custom compound usable wherever a material name is accepted.
+
+    Example:
+        define_compound("steel", 7.9, mass_fractions={"Fe": 0.7, "Cr": 0.19, "Ni": 0.11})
+    """
+    return _registry.define(name, density, formula=formula, mass_fractions=mass_fractions)
+
+
 def get_material_list() -> list[str]:
-    """Get list of available materials from xraydb."""
+    """Get list of available materials from xraydb and custom compounds."""
     try:
-        return sorted(xraydb.get_materials())
+        return _registry.names()
     except Exception as e:
         print(f"Error loading materials: {str(e)}")
         return []
@@ -40,26 +283,12 @@ def find_material(name: str):
         return None
 
 
-def validate_material(material_name: str, thickness=None):
+def validate_material(material_name: str, thickness=None, density=None):
     """Validate if material exists in xraydb and thickness is valid.
 
+    Formulas that are not named materials are accepted with a ``density``.
+
     Returns:
         (is_valid: bool, error_message: str)
     """
-    try:
-        if not isinstance(material_name, str):
-            raise MaterialError("Material name must be a string")
-
-        material = find_material(material_name)
-        if material is None:
-            raise MaterialNotFoundError(f"Material '{material_name}' not found in database")
-
-        if thickness is not None:
-            if not isinstance(thickness, (int, float)):
-                raise InvalidThicknessError("Thickness must be a number")
-            if thickness <= 0:
-                raise InvalidThicknessError("Thickness must be positive")
-
-        return True, ""
-    except Exception as e:
-        return False, str(e)
+    return _registry.validate(material_name, thickness, density)
@@ -0,0 +1,134 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .edges import get_edge_index
+from .elam import ELAM_MAX_EV, ELAM_MIN_EV, material_mu
+from .material import get_material_registry
+
+# Relative half-width of the point pair bracketing each absorption edge.
+# xraydb's edge list and the Elam spline knots agree to ~5e-5.
+EDGE_RTOL = 1e-4
+
+# Most recently used tables kept by get_mu_table.
+MAX_TABLES = 64
+
+
+def material_elements(material: str) -> list[str]:
+    """Element symbols in a named material or chemical formula."""
+    info = get_material_registry().resolve(material)
+    if info is None:
+        raise ValueError(f"Unknown material or formula '{material}'")
+    return list(info.composition)
+
+
+def edge_energies(elements, emin: float = ELAM_MIN_EV, emax: float = ELAM_MAX_EV) -> np.ndarray:
+    """Sorted, unique absorption edge energies (eV) of ``elements`` in (emin, emax)."""
+    return get_edge_index().energies(emin, emax, elements=list(elements))
+
+
+class MuTable:
+    """mu(E) of one material sampled once on a dense log-energy grid.
+
+    Each absorption edge is bracketed by a pair of points at
+    E * (1 -/+ EDGE_RTOL) so the jump stays sharp. Queries are answered by
+    log-log interpolation. Starting from ``points_per_decade``, intervals
+    whose interpolation error (probed at 1/4, 1/2 and 3/4 of the interval)
+    exceeds ``rtol / 2`` are bisected in log energy until every interval
+    meets it or is narrower than ``min_rel_width``. The halved target leaves
+    headroom for the error between probes; the achieved probe bound is kept
+    in ``max_error``.
+    """
+
+    def __init__(self, material: str, density: float | None = None, *,
+                 rtol: float = 1e-4,
+                 emin: float = ELAM_MIN_EV,
+                 emax: float = ELAM_MAX_EV,
+                 points_per_decade: int = 64,
+                 min_rel_width: float = 1e-6):
+        self.material = material
+        self.density = density
+        self.rtol = rtol
+        self.emin = emin
+        self.emax = emax
+        self.edges = edge_energies(material_elements(material), emin, emax)
+
+        energy, below_edge = self._grid(points_per_decade)
+        log_mu = np.log(self._direct(energy))
+        while True:
+            log_e = np.log(energy)
+            # Probe each interval at 1/4, 1/2 and 3/4 in log energy; kinks in
+            # the Elam splines are not always caught by the midpoint alone.
+            frac = np.array([0.25, 0.5, 0.75])[:, None]
+            log_probe = log_e[:-1] + frac * np.diff(log_e)
+            direct = np.log(self._direct(np.exp(log_probe).ravel())).reshape(log_probe.shape)
+            interp = log_mu[:-1] + frac * np.diff(log_mu)
+            error = np.abs(np.expm1(interp - direct)).max(axis=0)
+            error[below_edge[:-1]] = 0.0
+            mid, log_mid = np.exp(log_probe[1]), direct[1]
+            wide = energy[1:] / energy[:-1] - 1.0 > min_rel_width
+            refine = (error > 0.5 * rtol) & wide
+            if not refine.any():
+                break
+            idx = np.flatnonzero(refine) + 1
+            energy = np.insert(energy, idx, mid[refine])
+            log_mu = np.insert(log_mu, idx, log_mid[refine])
+            below_edge = np.insert(below_edge, idx, False)
+
+        self.log_energy = np.log(energy)
+        self.log_mu = log_mu
+        self.max_error = float(error[wide].max(initial=0.0))
+
+    def __len__(self) -> int:
+        return self.log_energy.size
+
+    def __call__(self, energy_ev) -> np.ndarray:
+        energy_ev = np.clip(np.asarray(energy_ev, dtype=np.float64), self.emin, self.emax)
+        return np.exp(np.interp(np.log(energy_ev), self.log_energy, self.log_mu))
+
+    def _direct(self, energy_ev) -> np.ndarray:
+        return material_mu(self.material, energy_ev, self.density)
+
+    def _grid(self, points_per_decade: int):
+        """Log grid plus edge brackets; also flags the low point of each bracket."""
+        decades = np.log10(self.emax / self.emin)
+        n = max(int(np.ceil(decades * points_per_decade)) + 1, 2)
+        base = np.geomspace(self.emin, self.emax, n)
+
+        lo = self.edges * (1 - EDGE_RTOL)
+        hi = self.edges * (1 + EDGE_RTOL)
+        if self.edges.size:
+            # Drop base points that would fall inside a bracket.
+            idx = np.clip(np.searchsorted(lo, base, side="right") - 1, 0, None)
+            inside = (base >= lo[idx]) & (base < hi[idx])
+            base = base[~inside]
+
+        energy = np.sort(np.concatenate([base, lo, hi]))
+        below_edge = np.zeros(energy.size, dtype=bool)
+        below_edge[np.searchsorted(energy, lo)] = True
+        return energy, below_edge
+
+
+_tables: OrderedDict[tuple, MuTable] = OrderedDict()
+_tables_lock = threading.Lock()
+
+
+def get_mu_table(material: str, density: float | None = None, rtol: float = 1e-4) -> MuTable:
+    """Return the shared table for (material, density, rtol), building it on first use.
+
+    At most ``MAX_TABLES`` tables are kept; the least recently used is dropped.
+    """
+    key = (material, density, rtol)
+    with _tables_lock:
+        table = _tables.get(key)
+        if table is not None:
+            _tables.move_to_end(key)
+            return table
+    table = MuTable(material, density, rtol=rtol)
+    with _tables_lock:
+        table = _tables.setdefault(key, table)
+        _tables.move_to_end(key)
+        while len(_tables) > MAX_TABLES:
+            _tables.popitem(last=False)
+    return table
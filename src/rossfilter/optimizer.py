@@ -0,0 +1,118 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .batch import default_densities, mass_attenuation_matrix
+
+_GOLDEN = (np.sqrt(5.0) - 1.0) / 2.0
+
+
+@dataclass
+class PairSolution:
+    """Matched thicknesses for a Ross filter pair."""
+    material1: str
+    material2: str
+    thickness1_cm: float
+    thickness2_cm: float
+    band_ev: tuple[float, float]
+    rms_mismatch: float  # out-of-band RMS of T1 - T2
+    max_mismatch: float  # out-of-band max |T1 - T2|
+
+
+def match_pairs(pairs, bands_ev, thickness1_cm, energy_ev, *,
+                densities=None,
+                table_rtol: float | None = None,
+                span: float = 100.0,
+                iterations: int = 80) -> list[PairSolution]:
+    """Solve many Ross pairs at once for the thickness of the second filter.
+
+    For each pair the first filter keeps ``thickness1_cm``; the second
+    thickness minimizes the mean squared out-of-band mismatch
+    ``(T1 - T2)**2`` over ``energy_ev`` outside ``[band_lo, band_hi]``.
+    A closed-form log-space estimate seeds a golden-section search over
+    ``[t0 / span, t0 * span]`` that runs on all pairs simultaneously.
+
+    Args:
+        pairs: sequence of (material1, material2)
+        bands_ev: (2,) band shared by all pairs, or (P, 2) per pair
+        thickness1_cm: scalar or (P,) thickness of the first filter
+        energy_ev: evaluation grid (eV) shared by all pairs
+        densities: optional sequence of (density1, density2); None entries
+            use the material's default density
+        table_rtol: evaluate mu from interpolated tables with this accuracy
+    """
+    pairs = list(pairs)
+    n = len(pairs)
+    if n == 0:
+        return []
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    bands = np.broadcast_to(np.asarray(bands_ev, dtype=np.float64), (n, 2))
+    t1 = np.broadcast_to(np.asarray(thickness1_cm, dtype=np.float64), (n,))
+
+    materials = sorted({m for pair in pairs for m in pair})
+    row = {m: i for i, m in enumerate(materials)}
+    mass_mu = mass_attenuation_matrix(materials, energy_ev, table_rtol=table_rtol)
+    defaults = default_densities(materials)
+
+    rho = np.empty((n, 2))
+    for p, pair in enumerate(pairs):
+        for k in range(2):
+            given = None if densities is None else densities[p][k]
+            rho[p, k] = defaults[row[pair[k]]] if given is None else given
+    if np.any(np.isnan(rho)):
+        raise ValueError("Density required for materials without a default density")
+
+    idx1 = np.array([row[a] for a, _ in pairs])
+    idx2 = np.array([row[b] for _, b in pairs])
+    mu1 = mass_mu[idx1] * rho[:, :1]
+    mu2 = mass_mu[idx2] * rho[:, 1:]
+    outside = (energy_ev < bands[:, :1]) | (energy_ev > bands[:, 1:])
+    if not np.all(outside.any(axis=1)):
+        raise ValueError("Band covers the whole energy grid")
+    weight = outside / outside.sum(axis=1, keepdims=True)
+    target = np.exp(-mu1 * t1[:, None])
+
+    def objective(t2):
+        return np.sum(weight * (target - np.exp(-mu2 * t2[:, None])) ** 2, axis=1)
+
+    # Matching optical depths (mu1 t1 = mu2 t2) in a T1-weighted least squares sense.
+    w = weight * target ** 2
+    t0 = t1 * np.sum(w * mu1 * mu2, axis=1) / np.maximum(np.sum(w * mu2 * mu2, axis=1), 1e-300)
+    t0 = np.where(t0 > 0, t0, t1)
+
+    lo, hi = np.log(t0 / span), np.log(t0 * span)
+    x1 = hi - _GOLDEN * (hi - lo)
+    x2 = lo + _GOLDEN * (hi - lo)
+    f1, f2 = objective(np.exp(x1)), objective(np.exp(x2))
+    for _ in range(iterations):
+        left = f1 < f2
+        hi = np.where(left, x2, hi)
+        lo = np.where(left, lo, x1)
+        # Each pair keeps one interior point and needs one new evaluation.
+        x_new = np.where(left, hi - _GOLDEN * (hi - lo), lo + _GOLDEN * (hi - lo))
+        f_new = objective(np.exp(x_new))
+        x1, x2 = np.where(left, x_new, x2), np.where(left, x1, x_new)
+        f1, f2 = np.where(left, f_new, f2), np.where(left, f1, f_new)
+    t2 = np.exp(0.5 * (lo + hi))
+
+    mismatch = np.abs(target - np.exp(-mu2 * t2[:, None]))
+    rms = np.sqrt(np.sum(weight * mismatch ** 2, axis=1))
+    peak = np.max(np.where(outside, mismatch, 0.0), axis=1)
+
+    return [
+        PairSolution(
+            material1=pairs[p][0],
+            material2=pairs[p][1],
+            thickness1_cm=float(t1[p]),
+            thickness2_cm=float(t2[p]),
+            band_ev=(float(bands[p, 0]), float(bands[p, 1])),
+            rms_mismatch=float(rms[p]),
+            max_mismatch=float(peak[p]),
+        )
+        for p in range(n)
+    ]
+
+
+def match_pair(material1: str, material2: str, band_ev, thickness1_cm: float, energy_ev, **kwargs) -> PairSolution:
+    """Single-pair convenience wrapper around ``match_pairs``."""
+    return match_pairs([(material1, material2)], band_ev, thickness1_cm, energy_ev, **kwargs)[0]
@@ -0,0 +1,117 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+
+from . import elam
+from .attenuation import get_attenuation_cache
+from .material import get_material_registry
+from .mu_table import get_mu_table
+
+
+def _table_mu(material: str, energy_ev, density: float | None, table_rtol: float) -> np.ndarray:
+    return get_mu_table(material, density, table_rtol)(energy_ev)
+
+
+def make_executor(kind: str = "thread", max_workers: int | None = None, initializer=None,
+                  initargs: tuple = ()) -> Executor:
+    """Create a ``"thread"`` or ``"process"`` pool; process workers open their own database connections.
+
+    ``initializer(*initargs)`` runs once in every worker.
+    """
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=max_workers, initializer=initializer, initargs=initargs)
+    raise ValueError(f"Unknown executor '{kind}' (expected 'thread' or 'process')")
+
+
+def prefetch_mu(layers, energy_ev, *,
+                executor: str | Executor | None = "thread",
+                max_workers: int | None = None,
+                split: str = "materials",
+                table_rtol: float | None = None) -> int:
+    """Evaluate mu(E) for ``(material, density)`` layers in parallel into the shared cache.
+
+    Work is spread over the unique (material, density) pairs of all channels
+    (``split="materials"``), or additionally over chunks of the energy grid
+    (``split="energy"``), which helps when only a few materials are involved.
+    Chunks are reassembled in order, and every value is computed by the same
+    element-wise code as the serial path, so results are identical.
+
+    Args:
+        layers: iterable of (material, density)
+        energy_ev: energy grid in eV
+        executor: ``"thread"``, ``"process"``, an existing ``Executor``, or
+            None to evaluate in the calling thread (on its own connection)
+        max_workers: pool size when a new pool is created
+        split: ``"materials"`` or ``"energy"``
+
+    Returns:
+        number of arrays computed (layers already cached are skipped)
+    """
+    if split not in ("materials", "energy"):
+        raise ValueError(f"Unknown split '{split}' (expected 'materials' or 'energy')")
+    energy_ev = np.atleast_1d(np.asarray(energy_ev, dtype=np.float64))
+    cache = get_attenuation_cache()
+    registry = get_material_registry()
+    todo, compounds = [], []
+    for material, density in dict.fromkeys(layers):
+        key = cache.key(material, energy_ev, density, table_rtol)
+        if key in cache:
+            continue
+        compound = registry.compound(material)
+        if compound is None:
+            todo.append((key, material, density))
+        else:
+            # Workers do not know custom compounds; prefetch their elements
+            # and combine them here.
+            compounds.append((material, density))
+            for elem in compound.mass_fractions:
+                elem_key = cache.key(elem, energy_ev, 1.0, table_rtol)
+                if elem_key not in cache:
+                    todo.append((elem_key, elem, 1.0))
+    todo = list(dict.fromkeys(todo))
+    if not todo:
+        for material, density in compounds:
+            cache.get(material, energy_ev, density, table_rtol)
+        return len(compounds)
+
+    # Shared state used by workers: resolved materials and their element
+    # tables, fetched in one query (forked processes inherit them), and for
+    # threads the mu tables.
+    elam.prefetch_elements(material for _, material, _ in todo)
+    in_process = executor == "process" or isinstance(executor, ProcessPoolExecutor)
+    if table_rtol is not None and executor is not None and not in_process:
+        for _, material, density in todo:
+            get_mu_table(material, density, table_rtol)
+
+    # elam.material_mu opens one read-only connection per thread and process
+    # (re-opened after a fork) and shares the parsed element tables.
+    evaluate, extra = (elam.material_mu, ()) if table_rtol is None else (_table_mu, (table_rtol,))
+    n_chunks = 1
+    if executor is not None and split == "energy":
+        n_chunks = max_workers or os.cpu_count() or 1
+    tasks = [
+        (material, chunk, density) + extra
+        for _, material, density in todo
+        for chunk in np.array_split(energy_ev, n_chunks)
+        if chunk.size
+    ]
+    if executor is None:
+        results = [evaluate(*task) for task in tasks]
+    else:
+        own = not isinstance(executor, Executor)
+        pool = make_executor(executor, max_workers) if own else executor
+        try:
+            results = list(pool.map(evaluate, *zip(*tasks)))
+        finally:
+            if own:
+                pool.shutdown()
+
+    per_layer = len(results) // len(todo)
+    for i, (key, _, _) in enumerate(todo):
+        cache.put(key, np.concatenate(results[i * per_layer:(i + 1) * per_layer]))
+    for material, density in compounds:
+        cache.get(material, energy_ev, density, table_rtol)
+    return len(todo) + len(compounds)
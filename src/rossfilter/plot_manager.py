@@ -1,11 +1,28 @@
 import customtkinter as ctk
+import numpy as np
 from matplotlib.backends._backend_tk import NavigationToolbar2Tk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+from .lod import envelope_indices, pixel_columns
+
+LOD_OVERSCAN = 1.0  # view widths decimated beyond each side, so short pans need no recompute
+
 
 class PlotManager:
-    """Wrap Matplotlib figure + toolbar for the RossFilter GUI."""
+    """Wrap Matplotlib figure + toolbar for the RossFilter GUI.
+
+    Each series key keeps one persistent ``Line2D`` (and fill collection);
+    plotting it again only swaps its data, and ``clear`` hides artists
+    instead of rebuilding the axes. Redraws go through ``draw_idle`` so
+    bursts of updates (e.g. toolbar pan/zoom events) render once.
+
+    Lines are drawn from a min/max envelope of their data at screen
+    resolution (``lod``), recomputed when the x-range changes; the full data
+    stays available through ``series_data``.
+
+    ``set_markers`` overlays labelled vertical lines, e.g. absorption edges.
+    """
 
     def __init__(self, master):
         self.container = ctk.CTkFrame(master, corner_radius=0)
@@ -13,6 +30,13 @@ class PlotManager:
         self.figure = Figure(figsize=(6, 4), dpi=100)
         self.ax = self.figure.add_subplot(111)
         self._configure_axes(title="Ross Filter Transmission")
+        self._lines = {}  # key -> Line2D
+        self._fills = {}  # key -> PolyCollection
+        self._sources = {}  # key -> full-resolution (x, y) of its line
+        self._fill_sources = {}  # key -> full-resolution (x, lower, upper) of its fill
+        self._lod = None  # (x_min, x_max, view width) the drawn envelopes cover
+        self._drawn = {}  # key -> (x, y, window) its line currently shows
+        self._markers = []  # artists of the vertical markers
 
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.container)
         self.canvas.draw()
@@ -21,14 +45,30 @@ class PlotManager:
         self.toolbar = NavigationToolbar2Tk(self.canvas, self.container)
         self.toolbar.update()
 
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
+
     @property
     def widget(self):
         return self.container
 
     def clear(self, title: str | None = None):
-        self.ax.clear()
+        """Hide every series; their artists are kept for reuse."""
+        for artist in self._artists():
+            artist.set_visible(False)
+        self.set_markers(())
+        self.ax.set_autoscale_on(True)
         self._configure_axes(title=title)
 
+    def forget(self, keep=()):
+        """Remove the artists of all series whose key is not in ``keep``."""
+        keep = set(keep)
+        for sources in (self._sources, self._fill_sources, self._drawn):
+            for key in [k for k in sources if k not in keep]:
+                del sources[key]
+        for store in (self._lines, self._fills):
+            for key in [k for k in store if k not in keep]:
+                store.pop(key).remove()
+
     def _configure_axes(self, title: str | None = None):
         self.ax.set_xlabel("Energy (keV)")
         self.ax.set_ylabel("Transmission")
@@ -36,14 +76,127 @@ class PlotManager:
             self.ax.set_title(title)
         self.ax.grid(True)
 
-    def plot_series(self, energies_kev, transmission, *, label=None, style="-", color=None, alpha=1.0):
-        self.ax.plot(energies_kev, transmission, linestyle=style, label=label, color=color, alpha=alpha)
+    def _artists(self):
+        yield from self._lines.values()
+        yield from self._fills.values()
+
+    def series_data(self, key):
+        """Full-resolution ``(x, y)`` of a plotted series, e.g. for export."""
+        return self._sources[key]
 
-    def fill_between(self, energies_kev, lower, upper=None, *, alpha=0.2, color=None, label=None):
+    def plot_series(self, energies_kev, transmission, *, label=None, style="-", color=None, alpha=1.0, key=None):
+        """Show a line for ``key`` (default: ``label``), reusing its artist."""
+        key = label if key is None else key
+        line = self._lines.get(key)
+        self._sources[key] = (energies_kev, transmission)
+        self._lod = None  # draw() rebuilds the envelopes
+        if line is None:
+            (line,) = self.ax.plot([], [], linestyle=style, label=label, color=color, alpha=alpha)
+            self._lines[key] = line
+        else:
+            line.set_linestyle(style)
+            if label is not None:
+                line.set_label(label)
+            line.set_alpha(alpha)
+            if color is not None:
+                line.set_color(color)
+            line.set_visible(True)
+        return line
+
+    def fill_between(self, energies_kev, lower, upper=None, *, alpha=0.2, color=None, label=None, key=None):
+        """Show a filled band for ``key`` (default: ``label``), reusing its artist."""
         upper = upper if upper is not None else 0
-        self.ax.fill_between(energies_kev, lower, upper, alpha=alpha, color=color, label=label)
+        key = label if key is None else key
+        if key is not None:
+            self._fill_sources[key] = (energies_kev, lower, upper)
+            self._lod = None
+        fill = self._fills.get(key) if key is not None else None
+        if fill is not None and hasattr(fill, "set_data"):
+            fill.set_alpha(alpha)
+            if label is not None:
+                fill.set_label(label)
+            if color is not None:
+                fill.set_color(color)
+            fill.set_visible(True)
+            return fill
+        if fill is not None:  # Matplotlib < 3.10 cannot update a fill in place
+            fill.remove()
+        fill = self.ax.fill_between(energies_kev, lower, upper, alpha=alpha, color=color, label=label)
+        if key is not None:
+            self._fills[key] = fill
+        return fill
+
+    def set_markers(self, positions, labels=()):
+        """Replace the vertical markers with lines at ``positions`` (x units), labelled at the top."""
+        for artist in self._markers:
+            artist.remove()
+        self._markers = []
+        trans = self.ax.get_xaxis_transform()  # x in data, y in axes fraction
+        labels = list(labels) or [None] * len(positions)
+        for x, label in zip(positions, labels):
+            line = self.ax.axvline(x, color="0.5", linestyle=":", linewidth=0.8)
+            line.set_label("_marker")
+            self._markers.append(line)
+            if label:
+                self._markers.append(self.ax.text(x, 0.99, label, transform=trans, rotation=90, ha="right",
+                                                  va="top", fontsize=7, color="0.4"))
+
+    def _update_lod(self, x_min: float, x_max: float, view_width: float):
+        """Set every visible line (and updatable fill) to its envelope over [x_min, x_max]."""
+        n_columns = max(int(self.ax.bbox.width), 100)
+        n_columns = int(n_columns * (x_max - x_min) / view_width) if view_width > 0 else n_columns
+        columns = {}  # series usually share one energy array; bin it once
+
+        def indices(x, *ys):
+            cols = columns.get(id(x))
+            if cols is None:
+                cols = columns[id(x)] = pixel_columns(x, x_min, x_max, n_columns)
+            return np.unique(np.concatenate([envelope_indices(y, cols) for y in ys]))
+
+        window = (x_min, x_max, n_columns)
+        for key, line in self._lines.items():
+            if line.get_visible():
+                x, y = self._sources[key]
+                drawn = self._drawn.get(key)
+                if drawn is not None and drawn[0] is x and drawn[1] is y and drawn[2] == window:
+                    continue
+                idx = indices(x, y)
+                line.set_data(x[idx], y[idx])
+                self._drawn[key] = (x, y, window)
+        for key, fill in self._fills.items():
+            if fill.get_visible() and hasattr(fill, "set_data") and key in self._fill_sources:
+                x, lower, upper = self._fill_sources[key]
+                arrays = [a for a in (lower, upper) if np.ndim(a)]
+                idx = indices(x, *arrays)
+                fill.set_data(x[idx], lower[idx] if np.ndim(lower) else lower, upper[idx] if np.ndim(upper) else upper)
+        self._lod = (x_min, x_max, view_width)
+
+    def _on_xlim_changed(self, ax):
+        lo, hi = ax.get_xlim()
+        width = hi - lo
+        if self._lod is not None:
+            covered_lo, covered_hi, view_width = self._lod
+            if covered_lo <= lo and hi <= covered_hi and 0.5 <= width / view_width <= 2.0:
+                return
+        self._update_lod(lo - LOD_OVERSCAN * width, hi + LOD_OVERSCAN * width, width)
 
     def draw(self):
-        if self.ax.get_legend_handles_labels()[1]:
-            self.ax.legend()
-        self.canvas.draw()
+        handles = [a for a in self._artists() if a.get_visible() and (a.get_label() or "_")[0] != "_"]
+        legend = self.ax.get_legend()
+        if handles:
+            # loc="best" scans every point of every series; transmissions start
+            # near zero at low energy, so the upper left is usually free.
+            self.ax.legend(handles=handles, loc="upper left")
+        elif legend is not None:
+            legend.remove()
+        xs = [self._sources[k][0] for k, line in self._lines.items() if line.get_visible()]
+        if xs and self.ax.get_autoscale_on():
+            # Envelopes over the full data so autoscaling sees its extent.
+            x_min, x_max = min(float(x[0]) for x in xs), max(float(x[-1]) for x in xs)
+            self._update_lod(x_min, x_max, x_max - x_min)
+            self._lod = (-np.inf, np.inf, x_max - x_min)  # nothing lies beyond the data
+        elif xs and self._lod is None:
+            self._on_xlim_changed(self.ax)
+        self.ax.relim(visible_only=True)
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
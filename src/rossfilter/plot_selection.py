@@ -1,13 +1,23 @@
 import customtkinter as ctk
 
+from .virtual_list import VirtualList
+
+ROW_HEIGHT = 26
+
 
 class PlotSelectionPanel(ctk.CTkFrame):
-    """Checkbox-based series selector for channels, filters, and differences."""
+    """Checkbox-based series selector for channels, filters, and differences.
+
+    The list is virtualized: only visible rows exist as widgets, and the
+    selection lives in ``_selected`` (key -> bool, in row order). Rows of a
+    channel are rebuilt only when its ``version`` changes.
+    """
 
     def __init__(self, master, on_change):
         super().__init__(master, fg_color="transparent")
         self.on_change = on_change
-        self._variables: dict[tuple, ctk.BooleanVar] = {}
+        self._selected: dict[tuple, bool] = {}
+        self._channel_rows: dict[int, tuple] = {}  # index -> (channel, version, rows)
 
         header = ctk.CTkFrame(self, fg_color="transparent")
         header.pack(fill="x", pady=(0, 4))
@@ -24,65 +34,92 @@ class PlotSelectionPanel(ctk.CTkFrame):
         self.clear_btn = ctk.CTkButton(btn_frame, text="Clear", width=60, command=self._clear_selection)
         self.clear_btn.pack(side="left", padx=2)
 
-        self.list_frame = ctk.CTkScrollableFrame(self, fg_color="transparent", height=220)
+        self._heading_font = ctk.CTkFont(weight="bold")
+        self.list_frame = VirtualList(self, self._make_row, self._bind_row, row_height=ROW_HEIGHT, height=220)
         self.list_frame.pack(fill="both", expand=True)
 
     def refresh(self, channels, differences=None, preserve_selection=True):
         differences = differences or []
         existing_selected = set(self.get_selected_keys()) if preserve_selection else set()
 
-        for child in self.list_frame.winfo_children():
-            child.destroy()
-        self._variables.clear()
-
+        items = []
+        cache = {}
         for c_idx, channel in enumerate(channels):
-            chan_key = ("channel", c_idx)
-            chan_label = f"Channel {c_idx + 1}"
-            self._add_checkbox(chan_label, chan_key, padx=4, pady=2)
-            for f_idx, flt in enumerate(channel.filters):
-                flt_key = ("filter", c_idx, f_idx)
-                flt_label = f"   • {flt.material} ({flt.thickness * 1e4:.1f} µm)"
-                self._add_checkbox(flt_label, flt_key, padx=10, pady=1)
+            cached = self._channel_rows.get(c_idx)
+            if cached is None or cached[0] is not channel or cached[1] != channel.version:
+                cached = (channel, channel.version, self._rows_for_channel(c_idx, channel))
+            cache[c_idx] = cached
+            items.extend(cached[2])
+        self._channel_rows = cache
 
         if differences:
-            divider = ctk.CTkLabel(self.list_frame, text="Differences", anchor="w", font=ctk.CTkFont(weight="bold"))
-            divider.pack(fill="x", padx=4, pady=(6, 2))
-            for label, key in differences:
-                self._add_checkbox(f"   • {label}", key, padx=10, pady=1)
+            items.append(("heading", "Differences"))
+            items.extend(("check", key, f"   • {label}", 10) for label, key in differences)
 
+        self._selected = {item[1]: item[1] in existing_selected for item in items if item[0] == "check"}
+        self.list_frame.set_items(items)
+        self.list_frame.rebind(lambda item: item[0] == "check", self._sync_row)
         if existing_selected:
-            self.set_selected_keys([k for k in existing_selected if k in self._variables], exclusive=True)
+            self._notify()
+
+    @staticmethod
+    def _rows_for_channel(c_idx, channel):
+        rows = [("check", ("channel", c_idx), f"Channel {c_idx + 1}", 4)]
+        for f_idx, (material, _, thickness) in enumerate(channel.layers()):
+            rows.append(("check", ("filter", c_idx, f_idx), f"   • {material} ({thickness * 1e4:.1f} µm)", 10))
+        return rows
+
+    def _make_row(self, parent):
+        row = ctk.CTkFrame(parent, fg_color="transparent", corner_radius=0)
+        row.key = None
+        row.var = ctk.BooleanVar(value=False)
+        row.check = ctk.CTkCheckBox(row, text="", variable=row.var, command=lambda: self._on_toggle(row))
+        row.heading = ctk.CTkLabel(row, text="", anchor="w", font=self._heading_font)
+        return row
+
+    def _bind_row(self, row, item):
+        if item[0] == "heading":
+            row.key = None
+            row.check.pack_forget()
+            row.heading.configure(text=item[1])
+            row.heading.pack(fill="x", padx=4)
         else:
-            self.list_frame.update_idletasks()
-
-    def _add_checkbox(self, label, key, padx=4, pady=2):
-        var = ctk.BooleanVar(value=False)
-        cb = ctk.CTkCheckBox(self.list_frame, text=label, variable=var, command=self._notify)
-        cb.pack(anchor="w", padx=padx, pady=pady)
-        self._variables[key] = var
+            _, row.key, label, padx = item
+            row.heading.pack_forget()
+            row.check.configure(text=label)
+            row.var.set(self._selected.get(row.key, False))
+            row.check.pack(anchor="w", padx=padx)
+
+    def _sync_row(self, row, item):
+        row.var.set(self._selected.get(row.key, False))
+
+    def _on_toggle(self, row):
+        if row.key in self._selected:
+            self._selected[row.key] = row.var.get()
+        self._notify()
 
     def _notify(self):
         if self.on_change:
             self.on_change(self.get_selected_keys())
 
     def get_selected_keys(self):
-        return [key for key, var in self._variables.items() if var.get()]
+        return [key for key, selected in self._selected.items() if selected]
 
     def set_selected_keys(self, keys, exclusive=True):
         if exclusive:
-            for var in self._variables.values():
-                var.set(False)
+            self._selected = dict.fromkeys(self._selected, False)
         for key in keys:
-            if key in self._variables:
-                self._variables[key].set(True)
+            if key in self._selected:
+                self._selected[key] = True
+        self.list_frame.rebind(lambda item: item[0] == "check", self._sync_row)
         self._notify()
 
     def _select_all(self):
-        for var in self._variables.values():
-            var.set(True)
+        self._selected = dict.fromkeys(self._selected, True)
+        self.list_frame.rebind(lambda item: item[0] == "check", self._sync_row)
         self._notify()
 
     def _clear_selection(self):
-        for var in self._variables.values():
-            var.set(False)
+        self._selected = dict.fromkeys(self._selected, False)
+        self.list_frame.rebind(lambda item: item[0] == "check", self._sync_row)
         self._notify()
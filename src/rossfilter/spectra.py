@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .attenuation import grid_key
+from .calculator import TransmissionResult
+
+RULES = ("trapezoid", "simpson")
+
+
+@dataclass
+class ChannelSignals:
+    """Spectrum-weighted signals, one row per spectrum."""
+    channels: np.ndarray  # (S, C)
+    differences: np.ndarray  # (S, C - 1), band-pass signal of each channel pair
+
+
+def quadrature_weights(energy_ev, rule: str = "trapezoid") -> np.ndarray:
+    """Weights w such that ``f @ w`` integrates f sampled on ``energy_ev`` (any spacing).
+
+    ``"simpson"`` uses the composite Simpson rule for non-uniform spacing on
+    pairs of intervals; with an odd number of intervals the last one falls
+    back to the trapezoid rule.
+    """
+    e = np.asarray(energy_ev, dtype=np.float64)
+    w = np.zeros_like(e)
+    if e.size < 2:
+        return w
+    h = np.diff(e)
+    if rule == "trapezoid" or e.size < 3:
+        w[:-1] += 0.5 * h
+        w[1:] += 0.5 * h
+        return w
+    if rule != "simpson":
+        raise ValueError(f"Unknown rule '{rule}' (expected one of {', '.join(RULES)})")
+
+    n_pairs = h.size // 2
+    h0, h1 = h[0:2 * n_pairs:2], h[1:2 * n_pairs:2]
+    s = (h0 + h1) / 6.0
+    w[0:2 * n_pairs:2] += s * (2.0 - h1 / h0)
+    w[1:2 * n_pairs:2] += s * (h0 + h1) ** 2 / (h0 * h1)
+    w[2:2 * n_pairs + 1:2] += s * (2.0 - h0 / h1)
+    if h.size % 2:
+        w[-2:] += 0.5 * h[-1]
+    return w
+
+
+def fold_interpolation(kernel: np.ndarray, energy_ev, table_ev) -> np.ndarray:
+    """Fold a (K, E) kernel on ``energy_ev`` onto tabulated energies: (K, T).
+
+    Equivalent to ``kernel @ M`` where M linearly interpolates a spectrum
+    tabulated on ``table_ev`` onto ``energy_ev`` (zero outside the table),
+    without forming the (E, T) matrix M.
+    """
+    table_ev = np.asarray(table_ev, dtype=np.float64)
+    if table_ev.ndim != 1 or table_ev.size < 2 or np.any(np.diff(table_ev) <= 0):
+        raise ValueError("Spectrum energies must be a strictly increasing 1-D array")
+    energy_ev = np.asarray(energy_ev, dtype=np.float64)
+    inside = (energy_ev >= table_ev[0]) & (energy_ev <= table_ev[-1])
+    idx = np.clip(np.searchsorted(table_ev, energy_ev, side="right") - 1, 0, table_ev.size - 2)
+    frac = (energy_ev - table_ev[idx]) / (table_ev[idx + 1] - table_ev[idx])
+
+    out = np.zeros((kernel.shape[0], table_ev.size))
+    k = kernel[:, inside]
+    idx, frac = idx[inside], frac[inside]
+    for row in range(kernel.shape[0]):
+        out[row] = (np.bincount(idx, weights=k[row] * (1.0 - frac), minlength=table_ev.size)
+                    + np.bincount(idx + 1, weights=k[row] * frac, minlength=table_ev.size))
+    return out
+
+
+class SpectrumIntegrator:
+    """Expected signals of Ross channels for given source spectra.
+
+    The signal of channel c for spectrum S is
+    ``∫ S(E) D(E) T_c(E) dE`` over the result's energy grid (eV), with D
+    the detector response; difference signals use ``|T_c - T_c+1|``.
+    Channel and difference kernels ``D T w`` (w the quadrature weights)
+    are built once, so the signals of many spectra are one matrix product.
+    Spectra tabulated on their own energies are handled by folding the
+    interpolation into the kernels (cached per table).
+    """
+
+    def __init__(self, result: TransmissionResult, detector=None, rule: str = "trapezoid"):
+        """Build the channel and difference kernels for ``result``.
+
+        Args:
+            result: transmissions (uniform or adaptive grid)
+            detector: None (ideal), a callable D(E_ev), or an
+                ``(energies_ev, response)`` table (zero outside it)
+            rule: ``"trapezoid"`` or ``"simpson"``
+        """
+        self.energies_ev = np.asarray(result.energies_ev, dtype=np.float64)
+        weights = quadrature_weights(self.energies_ev, rule)
+        if detector is not None:
+            weights = weights * self._detector_response(detector)
+        n = self.energies_ev.size
+        transmissions = np.asarray(result.transmissions, dtype=np.float64).reshape(-1, n)
+        differences = np.asarray(result.differences, dtype=np.float64).reshape(-1, n)
+        self.n_channels = transmissions.shape[0]
+        # (C + C - 1, E): channel kernels followed by difference kernels
+        self.kernel = np.vstack([transmissions, differences]) * weights
+        self._table_kernels: dict[tuple, np.ndarray] = {}
+
+    def _detector_response(self, detector) -> np.ndarray:
+        if callable(detector):
+            return np.asarray(detector(self.energies_ev), dtype=np.float64)
+        energies, response = detector
+        return np.interp(self.energies_ev, energies, response, left=0.0, right=0.0)
+
+    def kernel_for(self, spectrum_energies_ev=None) -> np.ndarray:
+        """(C + C - 1, T) kernel for spectra tabulated on ``spectrum_energies_ev``."""
+        if spectrum_energies_ev is None:
+            return self.kernel
+        key = grid_key(spectrum_energies_ev)
+        kernel = self._table_kernels.get(key)
+        if kernel is None:
+            kernel = fold_interpolation(self.kernel, self.energies_ev, spectrum_energies_ev)
+            self._table_kernels[key] = kernel
+        return kernel
+
+    def signals(self, spectra, spectrum_energies_ev=None) -> ChannelSignals:
+        """Signals for one (T,) or many (S, T) spectra.
+
+        Args:
+            spectra: spectral densities per eV, sampled on the result grid or
+                on ``spectrum_energies_ev`` (linearly interpolated, zero outside)
+        """
+        spectra = np.atleast_2d(np.asarray(spectra, dtype=np.float64))
+        kernel = self.kernel_for(spectrum_energies_ev)
+        if spectra.shape[1] != kernel.shape[1]:
+            raise ValueError(f"Spectra have {spectra.shape[1]} points, expected {kernel.shape[1]}")
+        out = spectra @ kernel.T
+        return ChannelSignals(channels=out[:, :self.n_channels], differences=out[:, self.n_channels:])
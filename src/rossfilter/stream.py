@@ -0,0 +1,150 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .attenuation import stacks_transmission
+
+DEFAULT_CHUNK_POINTS = 1 << 16
+
+
+@dataclass
+class TransmissionChunk:
+    """Transmissions and sequential differences on one slice of the energy grid."""
+    energies_ev: np.ndarray
+    transmissions: np.ndarray  # (C, n)
+    differences: np.ndarray  # (C - 1, n), |T_i - T_i+1|
+
+
+def grid_size(start_ev: float, stop_ev: float, step_ev: float) -> int:
+    """Number of points of ``energy_grid(start_ev, stop_ev, step_ev)``."""
+    return max(0, int(np.ceil((stop_ev + step_ev - start_ev) / step_ev)))
+
+
+def energy_chunks(start_ev: float, stop_ev: float, step_ev: float, chunk_points: int = DEFAULT_CHUNK_POINTS):
+    """Yield the uniform grid ``energy_grid(start, stop, step)`` in slices of ``chunk_points``.
+
+    Points are ``start + i * step``, computed as ``np.arange`` does, so the
+    concatenated chunks equal the whole grid without ever building it.
+    """
+    n = grid_size(start_ev, stop_ev, step_ev)
+    delta = (start_ev + step_ev) - start_ev  # the rounded step np.arange fills with
+    for i in range(0, n, chunk_points):
+        yield start_ev + np.arange(i, min(i + chunk_points, n), dtype=np.float64) * delta
+
+
+def iter_transmission_chunks(layers, chunks, table_rtol: float | None = None):
+    """Yield a ``TransmissionChunk`` per energy chunk for stacks of filters.
+
+    Args:
+        layers: one sequence of ``(material, density, thickness_cm)`` per channel
+        chunks: iterable of energy arrays (eV), e.g. from ``energy_chunks``
+        table_rtol: evaluate mu from interpolated tables with this accuracy
+
+    mu is evaluated per chunk without going through the attenuation cache,
+    so memory stays proportional to the chunk size.
+    """
+    for energy_ev in chunks:
+        transmissions = stacks_transmission(layers, energy_ev, table_rtol)
+        yield TransmissionChunk(energy_ev, transmissions, np.abs(np.diff(transmissions, axis=0)))
+
+
+def reduce_chunks(chunks, reducers) -> list:
+    """Feed every chunk to every reducer and return their results."""
+    for chunk in chunks:
+        for reducer in reducers:
+            reducer.update(chunk)
+    return [reducer.result() for reducer in reducers]
+
+
+class BandIntegral:
+    """Trapezoid integrals of channel transmissions and differences over energy bands.
+
+    Intervals whose both end points lie in a band count toward it; the last
+    point of each chunk is carried over so chunk boundaries are seamless.
+    ``result()`` returns ``(channels[B, C], differences[B, C - 1])`` in eV.
+    """
+
+    def __init__(self, bands_ev):
+        self.bands = np.atleast_2d(np.asarray(bands_ev, dtype=np.float64))
+        self.channels = None
+        self.differences = None
+        self._last = None
+
+    def update(self, chunk: TransmissionChunk):
+        e, t, d = chunk.energies_ev, chunk.transmissions, chunk.differences
+        if self.channels is None:
+            self.channels = np.zeros((len(self.bands), t.shape[0]))
+            self.differences = np.zeros((len(self.bands), d.shape[0]))
+        if self._last is not None:
+            e = np.concatenate([self._last[0], e])
+            t = np.concatenate([self._last[1], t], axis=1)
+            d = np.concatenate([self._last[2], d], axis=1)
+        self._last = (e[-1:], t[:, -1:], d[:, -1:])
+        if e.size < 2:
+            return
+
+        inside = (e[:-1] >= self.bands[:, :1]) & (e[1:] <= self.bands[:, 1:])  # (B, n - 1)
+        weight = inside * (0.5 * np.diff(e))
+        self.channels += weight @ (t[:, :-1] + t[:, 1:]).T
+        self.differences += weight @ (d[:, :-1] + d[:, 1:]).T
+
+    def result(self):
+        return self.channels, self.differences
+
+
+class MaxDifference:
+    """Peak value and its energy for each sequential difference.
+
+    ``result()`` returns ``(peak[C - 1], energy_ev[C - 1])``.
+    """
+
+    def __init__(self):
+        self.peak = None
+        self.energy_ev = None
+
+    def update(self, chunk: TransmissionChunk):
+        d = chunk.differences
+        if d.shape[1] == 0:
+            return
+        idx = np.argmax(d, axis=1)
+        peak = d[np.arange(d.shape[0]), idx]
+        if self.peak is None:
+            self.peak = np.full(d.shape[0], -np.inf)
+            self.energy_ev = np.full(d.shape[0], np.nan)
+        better = peak > self.peak
+        self.peak[better] = peak[better]
+        self.energy_ev[better] = chunk.energies_ev[idx[better]]
+
+    def result(self):
+        return self.peak, self.energy_ev
+
+
+class EdgeLocator:
+    """Absorption edges seen in each channel: steps where transmission drops with energy.
+
+    Away from edges transmission rises monotonically with energy, so any
+    decrease larger than ``min_drop`` between neighbouring points marks an
+    edge. ``result()`` returns one list of ``(energy_ev, drop)`` per channel,
+    with the energy taken as the midpoint of the step.
+    """
+
+    def __init__(self, min_drop: float = 1e-3):
+        self.min_drop = min_drop
+        self.edges = None
+        self._last = None
+
+    def update(self, chunk: TransmissionChunk):
+        e, t = chunk.energies_ev, chunk.transmissions
+        if self.edges is None:
+            self.edges = [[] for _ in range(t.shape[0])]
+        if self._last is not None:
+            e = np.concatenate([self._last[0], e])
+            t = np.concatenate([self._last[1], t], axis=1)
+        self._last = (e[-1:], t[:, -1:])
+
+        drop = t[:, :-1] - t[:, 1:]
+        for c, i in zip(*np.nonzero(drop > self.min_drop)):
+            self.edges[c].append((0.5 * float(e[i] + e[i + 1]), float(drop[c, i])))
+
+    def result(self):
+        return self.edges
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+
+import numpy as np
+from scipy.optimize import nnls
+
+from .calculator import TransmissionResult
+from .spectra import SpectrumIntegrator
+
+
+@dataclass
+class UnfoldResult:
+    """Binned spectra reconstructed from channel signals, one row per shot."""
+    bins_ev: np.ndarray  # (B + 1,) bin edges
+    spectra: np.ndarray  # (S, B) mean spectral density per eV in each bin
+    residuals: np.ndarray  # (S,) norm of measured minus predicted signals
+
+    @property
+    def fluence(self) -> np.ndarray:
+        """(S, B) integrated spectrum in each bin."""
+        return self.spectra * np.diff(self.bins_ev)
+
+
+def bin_response(kernel: np.ndarray, energy_ev, bins_ev) -> np.ndarray:
+    """(C, B) signal of each channel per unit flat spectral density in each bin.
+
+    ``kernel`` holds the quadrature-weighted channel responses on
+    ``energy_ev`` (``SpectrumIntegrator.kernel``); grid points are assigned
+    to the bin containing them, points outside all bins are dropped.
+    """
+    bins_ev = np.asarray(bins_ev, dtype=np.float64)
+    if bins_ev.ndim != 1 or bins_ev.size < 2 or np.any(np.diff(bins_ev) <= 0):
+        raise ValueError("Bin edges must be a strictly increasing 1-D array")
+    energy_ev = np.asarray(energy_ev, dtype=np.float64)
+    which = np.searchsorted(bins_ev, energy_ev, side="right") - 1
+    which[energy_ev == bins_ev[-1]] = bins_ev.size - 2  # close the last bin
+    inside = (which >= 0) & (which < bins_ev.size - 1)
+    response = np.zeros((kernel.shape[0], bins_ev.size - 1))
+    for c in range(kernel.shape[0]):
+        response[c] = np.bincount(which[inside], weights=kernel[c, inside], minlength=bins_ev.size - 1)
+    return response
+
+
+class Unfolder:
+    """Reconstruct binned source spectra from measured Ross channel signals.
+
+    Solves ``min ||R x - s||^2 + lam ||L x||^2`` (subject to ``x >= 0`` when
+    ``nonneg``) for every shot, where R is the (channels x bins) response
+    built from the transmissions and L is the identity (``"ridge"``) or the
+    first difference between neighbouring bins (``"smooth"``). ``lam`` is
+    ``regularization`` scaled by ``||R||^2`` so it is dimensionless.
+
+    The response matrix and the regularized pseudo-inverse are built once
+    per Unfolder and reused for every shot. A batch is solved with one
+    matrix product. Only shots whose unconstrained solution has negative
+    bins fall back to an exact NNLS solve.
+    """
+
+    def __init__(self, result: TransmissionResult, bins_ev, *, detector=None, rule: str = "trapezoid",
+                 regularization: float = 0.0, penalty: str = "smooth", nonneg: bool = True):
+        """Build the response matrix for ``result`` binned by ``bins_ev``.
+
+        Args:
+            result: channel transmissions (uniform or adaptive grid)
+            bins_ev: (B + 1,) edges of the bins to reconstruct
+            detector: detector response, as for ``SpectrumIntegrator``
+            rule: quadrature rule, ``"trapezoid"`` or ``"simpson"``
+            regularization: Tikhonov weight relative to ``||R||^2`` (0 for none)
+            penalty: ``"smooth"`` or ``"ridge"``
+            nonneg: constrain the reconstructed spectrum to be non-negative
+        """
+        integrator = SpectrumIntegrator(result, detector=detector, rule=rule)
+        self.bins_ev = np.asarray(bins_ev, dtype=np.float64)
+        self.response = bin_response(integrator.kernel[:integrator.n_channels], integrator.energies_ev, self.bins_ev)
+        self.nonneg = nonneg
+
+        n_bins = self.response.shape[1]
+        if penalty == "ridge":
+            penalty_matrix = np.eye(n_bins)
+        elif penalty == "smooth":
+            penalty_matrix = np.diff(np.eye(n_bins), axis=0)
+        else:
+            raise ValueError(f"Unknown penalty '{penalty}' (expected 'smooth' or 'ridge')")
+        scale = np.sqrt(regularization) * np.linalg.norm(self.response, 2) if regularization > 0 else 0.0
+        # Augmented system [R; sqrt(lam) L] x = [s; 0]
+        self.system = np.vstack([self.response, scale * penalty_matrix]) if scale else self.response
+        # Only the signal columns of the pseudo-inverse matter; the rest multiply zeros.
+        self.solve_matrix = np.linalg.pinv(self.system)[:, :self.response.shape[0]]
+
+    def unfold(self, signals) -> UnfoldResult:
+        """Unfold one (C,) or many (S, C) shots."""
+        signals = np.atleast_2d(np.asarray(signals, dtype=np.float64))
+        n_channels = self.response.shape[0]
+        if signals.shape[1] != n_channels:
+            raise ValueError(f"Expected {n_channels} channel signals, got {signals.shape[1]}")
+
+        spectra = signals @ self.solve_matrix.T
+        if self.nonneg:
+            rhs = np.zeros(self.system.shape[0])
+            for shot in np.flatnonzero(np.any(spectra < 0, axis=1)):
+                rhs[:n_channels] = signals[shot]
+                spectra[shot] = nnls(self.system, rhs)[0]
+        residuals = np.linalg.norm(spectra @ self.response.T - signals, axis=1)
+        return UnfoldResult(bins_ev=self.bins_ev, spectra=spectra, residuals=residuals)
@@ -0,0 +1,130 @@
+import tkinter as tk
+
+import customtkinter as ctk
+
+
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list of equal-height rows that only creates the visible ones.
+
+    ``make_row(parent)`` builds a row widget and ``bind_row(widget, item)``
+    shows an item in it. Item i is drawn by pooled row ``i % len(pool)``, so
+    scrolling re-binds only rows that come into view, and ``set_items``
+    re-binds only visible rows whose item changed. Items should be
+    immutable values (e.g. tuples) that compare equal when they look the
+    same.
+    """
+
+    def __init__(self, master, make_row, bind_row, row_height: int = 26, **kwargs):
+        kwargs.setdefault("fg_color", "transparent")
+        super().__init__(master, **kwargs)
+        self.make_row = make_row
+        self.bind_row = bind_row
+        self.row_height = row_height
+        self.items: list = []
+        self._pool: list[tuple] = []  # (widget, canvas window id)
+        self._shown: list = []  # item bound to each pooled row
+        self._visible = range(0)
+        self._width = 0
+
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0, height=self._apply_widget_scaling(kwargs.get("height", 200)))
+        self.scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll, yscrollincrement=self._row_px())
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
+        self.canvas.bind("<Configure>", lambda e: self._render())
+        self.bind_all("<MouseWheel>", self._on_wheel, add=True)
+        self.bind_all("<Button-4>", self._on_wheel, add=True)
+        self.bind_all("<Button-5>", self._on_wheel, add=True)
+        self._update_canvas_bg()
+
+    def _row_px(self) -> int:
+        return max(1, round(self._apply_widget_scaling(self.row_height)))
+
+    def _update_canvas_bg(self):
+        color = self.cget("fg_color")
+        if color == "transparent":
+            color = self.cget("bg_color")
+        self.canvas.configure(bg=self._apply_appearance_mode(color))
+
+    def _set_appearance_mode(self, mode_string):
+        super()._set_appearance_mode(mode_string)
+        if hasattr(self, "canvas"):
+            self._update_canvas_bg()
+
+    def set_items(self, items):
+        """Show ``items``; rows whose item is unchanged are left alone."""
+        self.items = list(items)
+        self.canvas.configure(scrollregion=(0, 0, self._width, len(self.items) * self._row_px()))
+        self._render()
+
+    def visible(self):
+        """``(widget, item)`` of every row currently on screen."""
+        for i in self._visible:
+            yield self._pool[i % len(self._pool)][0], self.items[i]
+
+    def rebind(self, predicate=None, action=None):
+        """Re-apply ``action`` (default ``bind_row``) to visible rows matching ``predicate``."""
+        action = self.bind_row if action is None else action
+        for widget, item in self.visible():
+            if predicate is None or predicate(item):
+                action(widget, item)
+
+    def see(self, index: int):
+        """Scroll so that row ``index`` is visible."""
+        if not self.items:
+            return
+        top, bottom = self._visible.start, self._visible.stop - 2
+        if index < top or index >= bottom:
+            self.canvas.yview_moveto(index / len(self.items))
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._render()
+
+    def _on_wheel(self, event):
+        widget = str(event.widget)
+        if not widget.startswith(str(self.canvas)) or self.canvas.yview() == (0.0, 1.0):
+            return
+        if event.num in (4, 5):
+            self.canvas.yview_scroll(-1 if event.num == 4 else 1, "units")
+        else:
+            self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
+
+    def _render(self):
+        h = self._row_px()
+        n = len(self.items)
+        height = max(self.canvas.winfo_height(), 1)
+        width = self.canvas.winfo_width()
+        first = min(max(0, int(self.canvas.canvasy(0) // h)), max(0, n - 1))
+        count = min(n - first, height // h + 2)
+        self._visible = range(first, first + max(count, 0))
+
+        if count > len(self._pool):
+            while len(self._pool) < count:
+                widget = self.make_row(self.canvas)
+                window = self.canvas.create_window(0, 0, window=widget, anchor="nw", width=width, height=h)
+                self._pool.append((widget, window))
+            self._shown = [None] * len(self._pool)  # the pool size changed the i % len(pool) mapping
+        if width != self._width:
+            self._width = width
+            self.canvas.configure(scrollregion=(0, 0, width, n * h))
+            for _, window in self._pool:
+                self.canvas.itemconfigure(window, width=width)
+
+        in_view = set()
+        for i in self._visible:
+            k = i % len(self._pool)
+            in_view.add(k)
+            widget, window = self._pool[k]
+            item = self.items[i]
+            if self._shown[k] is None or self._shown[k][0] != i or self._shown[k][1] != item:
+                self.canvas.coords(window, 0, i * h)
+                self.canvas.itemconfigure(window, state="normal")
+                self.bind_row(widget, item)
+                self._shown[k] = (i, item)
+        for k, (_, window) in enumerate(self._pool):
+            if k not in in_view and self._shown[k] is not None:
+                self.canvas.itemconfigure(window, state="hidden")
+                self._shown[k] = None
@@ -0,0 +1,42 @@
+import numpy as np
+
+from rossfilter.adaptive import refine_grid
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.mu_table import EDGE_RTOL
+
+
+def test_refine_grid_meets_tolerance_on_smooth_function():
+    f = lambda e: np.exp(-((e - 5.0) ** 2))
+    grid = refine_grid(f, np.linspace(0.0, 10.0, 5), tol=1e-4)
+    fine = np.linspace(0.0, 10.0, 20001)
+    assert grid[0] == 0.0 and grid[-1] == 10.0
+    assert np.all(np.diff(grid) > 0)
+    assert np.abs(np.interp(fine, grid, f(grid)) - f(fine)).max() < 2e-4
+    # Refinement concentrates where the curve bends, not in the flat tails.
+    assert np.sum((grid > 3) & (grid < 7)) > np.sum((grid < 2) | (grid > 8))
+
+
+def test_adaptive_transmission_brackets_edges_and_is_accurate():
+    calc = RossFilterCalculator()
+    calc.add_channel()
+    calc.add_filter_to_channel(0, "Cu", 10.0)
+    calc.add_channel()
+    calc.add_filter_to_channel(1, "nickel", 10.0)
+
+    ok, result = calc.calculate_transmission(5.0, 20.0, 0.5, adaptive_tol=1e-3)
+    assert ok
+    grid = result.energies_ev
+    assert grid[0] == 5000.0 and grid[-1] == 20000.0
+    for edge in (8979.0, 8333.0):  # Cu K, Ni K
+        assert np.any(np.isclose(grid, edge * (1 - EDGE_RTOL), rtol=1e-6))
+        assert np.any(np.isclose(grid, edge * (1 + EDGE_RTOL), rtol=1e-6))
+
+    ok, fine = calc.calculate_transmission(5.0, 20.0, 0.001)
+    assert ok and grid.size < fine.energies_ev.size / 20
+    # Away from the edge jumps, linear interpolation is within tolerance.
+    left = np.clip(np.searchsorted(grid, fine.energies_ev, side="right") - 1, 0, grid.size - 2)
+    smooth = grid[left + 1] - grid[left] > 2.5 * EDGE_RTOL * grid[left]
+    for coarse_t, fine_t in zip(result.transmissions, fine.transmissions):
+        err = np.abs(np.interp(fine.energies_ev, grid, coarse_t) - fine_t)
+        assert err[smooth].max() < 2e-3
+    assert len(result.filter_transmissions[0][0]) == grid.size
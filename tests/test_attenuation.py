@@ -0,0 +1,116 @@
+import os
+
+import numpy as np
+import xraydb
+
+from rossfilter.filter import Channel
+
+
+def test_vectorized_matches_per_point():
+    energies = np.arange(100.0, 30000.0, 250.0)
+    channel = Channel()
+    channel.add_filter("Be", 25e-4)
+    channel.add_filter("Al", 10e-4)
+    channel.add_filter("Al", 5e-4)
+
+    expected = np.ones_like(energies)
+    for flt in channel.filters:
+        mu = np.array([xraydb.material_mu(flt.material, e, density=flt.density) for e in energies])
+        expected *= np.exp(-mu * flt.thickness)
+
+    np.testing.assert_allclose(channel.calculate_transmission(energies), expected, rtol=1e-12)
+    mu_al = np.array([xraydb.material_mu("Al", e) for e in energies])
+    np.testing.assert_allclose(channel.calculate_single_filter(1, energies), np.exp(-mu_al * 10e-4), rtol=1e-12)
+
+
+def test_empty_channel_is_transparent():
+    energies = np.linspace(1000.0, 2000.0, 5)
+    np.testing.assert_array_equal(Channel().calculate_transmission(energies), np.ones(5))
+
+
+def test_cache_hits_and_lru_eviction():
+    from rossfilter.attenuation import AttenuationCache, grid_key
+
+    grid_ev = np.arange(1000.0, 5000.0, 100.0)
+    cache = AttenuationCache(max_bytes=2 * grid_ev.nbytes)  # room for two arrays
+    grid_kev_built = np.arange(1.0, 5.0, 0.1) * 1e3
+    assert grid_key(grid_ev) == grid_key(grid_kev_built)
+
+    first = cache.get("Al", grid_ev)
+    assert cache.get("Al", grid_kev_built) is first
+    assert not first.flags.writeable
+    cache.get("Be", grid_ev)
+    cache.get("Cu", grid_ev, density=8.96)  # evicts Al
+    cache.get("Al", grid_ev)
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 4, 2)
+    assert stats["nbytes"] == 2 * grid_ev.nbytes
+
+    cache.resize(grid_ev.nbytes // 2)  # smaller than one array: the newest is kept
+    assert len(cache) == 1 and cache.get("Al", grid_ev) is not None
+    assert cache.stats()["hits"] == 2
+
+
+def test_non_uniform_grid_key_differs():
+    from rossfilter.attenuation import grid_key
+
+    uniform = np.linspace(1000.0, 2000.0, 5)
+    skewed = np.array([1000.0, 1100.0, 1500.0, 1900.0, 2000.0])
+    assert grid_key(uniform) != grid_key(skewed)
+
+
+def test_incremental_depth_matches_full_recompute():
+    from rossfilter.attenuation import get_attenuation_cache
+
+    energies = np.arange(1000.0, 20000.0, 500.0)
+    channel = Channel()
+    channel.add_filter("Be", 25e-4)
+    channel.add_filter("Al", 10e-4)
+    channel.calculate_transmission(energies)
+
+    misses = get_attenuation_cache().stats()["misses"]
+    channel.update_filter(1, "Al", 20e-4)
+    channel.add_filter("Be", 5e-4)
+    channel.remove_filter(0)
+    incremental = channel.calculate_transmission(energies)
+    assert get_attenuation_cache().stats()["misses"] == misses
+
+    fresh = Channel()
+    fresh.add_filter("Al", 20e-4)
+    fresh.add_filter("Be", 5e-4)
+    np.testing.assert_allclose(incremental, fresh.calculate_transmission(energies), rtol=1e-12)
+
+
+def test_disk_cache_roundtrip_and_eviction(tmp_path):
+    from rossfilter.attenuation import AttenuationCache
+    from rossfilter.disk_cache import disable_disk_cache, enable_disk_cache
+
+    stale = tmp_path / "xraydb-0.0.0-v1" / "old.npy"
+    stale.parent.mkdir()
+    np.save(stale, np.zeros(100))
+    os.utime(stale, (0, 0))
+    disk = enable_disk_cache(tmp_path, max_bytes=10_000)
+    try:
+        assert stale.exists()  # another install's cache is left alone
+        assert disk.size_bytes() == stale.stat().st_size  # but counts against the cap
+        grid = np.linspace(1000.0, 5000.0, 200)
+        direct = AttenuationCache().get("Al", grid)
+        assert disk.stats()["misses"] == 1
+
+        reloaded = AttenuationCache().get("Al", grid)
+        assert isinstance(reloaded, np.memmap)
+        np.testing.assert_array_equal(reloaded, direct)
+        assert disk.stats()["hits"] == 1
+
+        for material in ("Be", "Cu", "Fe", "Ni", "Ti"):
+            AttenuationCache().get(material, grid, density=5.0)
+        assert disk.size_bytes() <= 10_000
+        assert disk._size == disk.size_bytes()
+        assert not stale.parent.exists()  # least recently used, so evicted first
+
+        (tmp_path / "xraydb-0.0.0-v1").mkdir()
+        disk.remove_other_versions()
+        assert not (tmp_path / "xraydb-0.0.0-v1").exists() and disk.directory.exists()
+    finally:
+        disable_disk_cache()
@@ -0,0 +1,40 @@
+from rossfilter.autocomplete import MaterialIndex
+
+NAMES = ["aluminum", "copper", "Kapton", "polyimide", "stainless steel", "steel-304", "Copper Oxide", "beryllium"]
+
+
+def brute_force(names, text):
+    return {n for n in names if text.lower() in n.lower()}
+
+
+def test_matches_equal_substring_scan():
+    index = MaterialIndex(NAMES)
+    for text in ["", "c", "co", "cop", "copp", "STEEL", "el", "xyz", "  kap "]:
+        found = index.search(text)
+        expected = brute_force(NAMES, text.strip()) if text.strip() else set(NAMES)
+        assert set(found) == expected, text
+
+
+def test_ranking_and_limit():
+    index = MaterialIndex(NAMES)
+    assert index.search("steel") == ["steel-304", "stainless steel"]  # prefix before word start
+    assert index.search("copper")[0] == "copper"  # exact first
+    assert index.search("e", limit=3) == index.search("e")[:3]
+
+
+def test_incremental_narrowing_after_non_extending_query():
+    index = MaterialIndex(NAMES)
+    index.search("cop")
+    assert index.search("co") == index.search("co", limit=None)
+    assert set(index.search("ste")) == brute_force(NAMES, "ste")  # not a narrowing of "co"
+
+
+def test_large_library_narrows_candidates():
+    names = [f"compound-{i:06d}" for i in range(100_000)] + ["kapton"]
+    index = MaterialIndex(names)
+    index.search("k")
+    assert index._candidates("ka") is index._last_hits  # typing forward narrows the previous hits
+    assert len(index._last_hits) == 1
+    index.search("xkapt")
+    assert len(index._candidates("kapt")) == 1  # a fresh 3+ character query uses its rarest trigram
+    assert index.search("kapto", limit=50) == ["kapton"]
@@ -33,5 +33,29 @@ def test_backend_refactor():
     
     print("Backend refactor test passed!")
 
+def test_result_reused_until_channels_change():
+    calc = RossFilterCalculator()
+    calc.add_channel()
+    calc.add_channel()
+    calc.add_filter_to_channel(0, 'Be', 10.0)
+    calc.add_filter_to_channel(1, 'Al', 5.0)
+
+    _, first = calc.calculate_transmission(1.0, 10.0, 1.0)
+    _, again = calc.calculate_transmission(1.0, 10.0, 1.0)
+    assert again is first
+    assert calc.last_result is first
+    assert len(first.filter_transmissions) == 2
+    np.testing.assert_allclose(first.filter_transmissions[1][0], first.transmissions[1])
+
+    calc.update_filter_in_channel(1, 0, 'Al', 6.0)
+    assert calc.last_result is None
+    _, updated = calc.calculate_transmission(1.0, 10.0, 1.0)
+    assert updated is not first
+    assert np.all(updated.transmissions[1] < first.transmissions[1])
+
+    _, regridded = calc.calculate_transmission(1.0, 10.0, 0.5)
+    assert regridded is not updated
+
+
 if __name__ == "__main__":
     test_backend_refactor()
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from rossfilter.batch import batch_transmission, make_stacks, stacks_from_channels
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.filter import Channel
+
+
+def test_batch_matches_channels_and_chunking():
+    energies = np.arange(1000.0, 20000.0, 250.0)
+    channels = [Channel(), Channel(), Channel()]
+    channels[0].add_filter("Be", 25e-4)
+    channels[0].add_filter("Al", 5e-4)
+    channels[1].add_filter("Al", 10e-4, density=2.6)
+    materials, stacks = stacks_from_channels(channels)
+
+    full = batch_transmission(materials, stacks, energies)
+    chunked = batch_transmission(materials, stacks, energies, chunk_size=1)
+    expected = np.array([c.calculate_transmission(energies) for c in channels])
+    np.testing.assert_allclose(full, expected, rtol=1e-12)
+    np.testing.assert_allclose(chunked, full, rtol=1e-12)
+    np.testing.assert_array_equal(full[2], 1.0)
+
+
+def test_calculator_batch_and_errors():
+    calc = RossFilterCalculator()
+    stacks = make_stacks([[0, 1], [1, 0]], [[10e-4, 0.0], [5e-4, 5e-4]])
+    ok, (energies, transmission) = calc.calculate_batch(["Al", "Be"], stacks, 1.0, 10.0, 1.0)
+    assert ok
+    assert transmission.shape == (2, energies.size)
+
+    ok, msg = calc.calculate_batch(["Al"], stacks, 1.0, 10.0, 1.0)
+    assert not ok and "out of range" in msg
+    with pytest.raises(ValueError):
+        batch_transmission(["AlN2"], make_stacks([[0]], [[1e-4]]), energies)
+    for bad in (-1e-4, np.nan, np.inf):
+        ok, msg = calc.calculate_batch(["Al", "Be"], make_stacks([[0, 1]], [[10e-4, bad]]), 1.0, 10.0, 1.0)
+        assert not ok and "positive" in msg
+
+
+def test_calculator_validates_energy_ranges_alike():
+    calc = RossFilterCalculator()
+    calc.add_filter_to_channel(calc.add_channel(), "Al", 10.0)
+    stacks = make_stacks([[0]], [[10e-4]])
+    for erange, msg in [((-1.0, 10.0, 1.0), "Start energy must be positive"),
+                        ((10.0, 1.0, 1.0), "Start energy must be less than stop energy"),
+                        (("x", 10.0, 1.0), "Invalid energy values")]:
+        assert calc.calculate_transmission(*erange) == (False, msg)
+        assert calc.calculate_batch(["Al"], stacks, *erange) == (False, msg)
+        assert calc.optimize_ross_pair("Al", "Cu", 2.0, 3.0, 10.0, *erange) == (False, msg)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from rossfilter.filter import Channel, Filter, get_material_table
+
+
+def test_filter_uses_slots():
+    flt = Filter("Al", 1e-3)
+    assert not hasattr(flt, "__dict__")
+    with pytest.raises(AttributeError):
+        flt.colour = "red"
+
+
+def test_columns_and_filter_views():
+    channel = Channel()
+    assert channel.add_filters(["Be", "Al", "Be"], [25e-4, 10e-4, 5e-4], [None, 2.6, None]) == (True, "")
+    table = get_material_table()
+    assert [table.name(i) for i in channel.material_ids] == ["Be", "Al", "Be"]
+    assert channel.material_ids[0] == channel.material_ids[2]
+    np.testing.assert_array_equal(channel.thickness, [25e-4, 10e-4, 5e-4])
+    assert np.isnan(channel.density[0]) and channel.density[1] == 2.6
+    with pytest.raises(ValueError):
+        channel.thickness[0] = 1.0
+
+    assert len(channel.filters) == 3
+    assert channel.filters[1] == Filter("Al", 10e-4, 2.6)
+    assert [f.material for f in channel.filters] == ["Be", "Al", "Be"]
+    assert channel.layers()[2] == ("Be", None, 5e-4)
+
+
+def test_bulk_add_is_atomic_and_matches_single_adds():
+    energies = np.arange(1000.0, 20000.0, 250.0)
+    bulk = Channel()
+    ok, msg = bulk.add_filters(["Be", "NotAMaterial"], [1e-3, 1e-3])
+    assert not ok and len(bulk) == 0
+    assert bulk.add_filters(["Be", "Al"], [1e-3, -1.0]) == (False, "Thickness must be positive")
+
+    bulk.add_filters(["Be", "Al", "Be", "Cu"], [25e-4, 10e-4, 5e-4, 2e-4])
+    single = Channel()
+    for flt in bulk.filters:
+        single.add_filter(flt.material, flt.thickness, flt.density)
+    np.testing.assert_allclose(bulk.calculate_transmission(energies),
+                               single.calculate_transmission(energies), rtol=1e-12)
+    assert bulk.key() == single.key() and hash(bulk.key())
+
+    bulk.remove_filter(0)
+    bulk.update_filter(1, "Be", 30e-4)
+    fresh = Channel()
+    fresh.add_filters(["Al", "Be", "Cu"], [10e-4, 30e-4, 2e-4])
+    np.testing.assert_allclose(bulk.calculate_transmission(energies),
+                               fresh.calculate_transmission(energies), rtol=1e-12)
+    np.testing.assert_allclose(bulk.calculate_single_filter(2, energies),
+                               fresh.calculate_single_filter(2, energies), rtol=1e-12)
+
+
+def test_snapshot_is_independent_and_shares_the_state_token():
+    from rossfilter.calculator import RossFilterCalculator
+
+    calc = RossFilterCalculator()
+    calc.add_filter_to_channel(calc.add_channel(), "Al", 10.0)
+    snapshot = calc.snapshot()
+    assert snapshot.state_token() == calc.state_token()
+
+    calc.add_filter_to_channel(0, "Cu", 5.0)
+    assert snapshot.state_token() != calc.state_token()
+    assert snapshot.channel_layers() == [[("Al", None, 10e-4)]]
+    ok, result = snapshot.calculate_transmission(1.0, 10.0, 0.5)
+    assert ok and len(result.transmissions) == 1
+
+
+def test_snapshot_keeps_the_optical_depth_and_can_be_adopted():
+    from rossfilter.calculator import RossFilterCalculator
+
+    calc = RossFilterCalculator()
+    calc.add_filter_to_channel(calc.add_channel(), "Al", 10.0)
+    calc.add_filter_to_channel(0, "Cu", 5.0)
+    assert calc.calculate_transmission(1.0, 10.0, 0.5)[0]
+    snapshot = calc.snapshot()
+    original, copy = calc.channels[0], snapshot.channels[0]
+    assert copy._depth is not None and copy._depth is not original._depth
+
+    snapshot.update_filter_in_channel(0, 1, "Cu", 8.0)
+    calc.update_filter_in_channel(0, 1, "Cu", 8.0)
+    assert copy._depth is not None  # updated in place, not rebuilt
+    np.testing.assert_allclose(copy._depth, original._depth, rtol=1e-12)
+
+    ok, result = snapshot.calculate_transmission(1.0, 10.0, 0.5)
+    assert ok
+    assert calc.adopt(snapshot)
+    assert calc.channels[0] is copy and calc.last_result is result
+    calc.add_channel()
+    assert not calc.adopt(snapshot)
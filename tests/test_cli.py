@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+
+import numpy as np
+
+from rossfilter.__main__ import main
+from rossfilter.calculator import RossFilterCalculator
+
+CONFIG = {
+    "energy": {"start_kev": 5.0, "stop_kev": 10.0, "step_kev": 0.5},
+    "channels": [
+        {"filters": [{"material": "Al", "thickness_um": 10.0}]},
+        {"filters": [{"material": "Cu", "thickness_um": 2.0}, {"material": "kapton", "thickness_um": 25.0}]},
+    ],
+}
+
+
+def test_run_writes_csv_and_npz(tmp_path):
+    (tmp_path / "cfgs").mkdir()
+    (tmp_path / "cfgs" / "a.json").write_text(json.dumps(CONFIG))
+    (tmp_path / "cfgs" / "b.toml").write_text(
+        '[energy]\nstart_kev = 5.0\nstop_kev = 10.0\nstep_kev = 0.5\n\n'
+        '[[channels]]\nfilters = [{material = "Al", thickness_um = 10.0}]\n'
+    )
+
+    calc = RossFilterCalculator()
+    calc.add_channel()
+    calc.add_filter_to_channel(0, "Al", 10.0)
+    calc.add_channel()
+    calc.add_filter_to_channel(1, "Cu", 2.0)
+    calc.add_filter_to_channel(1, "kapton", 25.0)
+    _, expected = calc.calculate_transmission(5.0, 10.0, 0.5)
+
+    out = tmp_path / "out"
+    assert main(["run", str(tmp_path / "cfgs"), "-o", str(out), "--no-disk-cache"]) == 0
+    table = np.genfromtxt(out / "a.csv", delimiter=",", names=True)
+    assert table.dtype.names == ("energy_kev", "channel_1", "channel_2", "diff_1_2")
+    np.testing.assert_allclose(table["channel_2"], expected.transmissions[1], rtol=1e-9)
+    assert (out / "b.csv").exists()
+
+    assert main(["run", str(tmp_path / "cfgs" / "a.json"), "-o", str(out), "-f", "npz", "--no-disk-cache"]) == 0
+    data = np.load(out / "a.npz")
+    np.testing.assert_array_equal(data["transmissions"], np.array(expected.transmissions))
+
+
+def test_run_reports_bad_config(tmp_path, capsys):
+    bad = dict(CONFIG, channels=[{"filters": [{"material": "Al"}]}])
+    (tmp_path / "bad.json").write_text(json.dumps(bad))
+    assert main(["run", str(tmp_path / "bad.json"), "-o", str(tmp_path), "--no-disk-cache"]) == 1
+    assert "thickness_um" in capsys.readouterr().err
+
+
+def test_run_keeps_going_after_a_failing_config(tmp_path, capsys):
+    cfgs = tmp_path / "cfgs"
+    cfgs.mkdir()
+    (cfgs / "a_bad.json").write_text(json.dumps(dict(CONFIG, channels=[{"filters": [{"material": "Nope"}]}])))
+    (cfgs / "b_list.json").write_text("[1, 2]")
+    (cfgs / "c_good.json").write_text(json.dumps(CONFIG))
+    out = tmp_path / "out"
+    assert main(["run", str(cfgs), "-o", str(out), "--no-disk-cache"]) == 1
+    err = capsys.readouterr().err
+    assert "a_bad.json" in err and "b_list.json" in err and "top level" in err
+    assert (out / "c_good.csv").exists()
+
+
+def test_run_rejects_clashing_output_names(tmp_path, capsys):
+    (tmp_path / "a.json").write_text(json.dumps(CONFIG))
+    (tmp_path / "a.toml").write_text('[energy]\nstart_kev = 5.0\nstop_kev = 10.0\nstep_kev = 0.5\n')
+    out = tmp_path / "out"
+    assert main(["run", str(tmp_path), "-o", str(out), "--no-disk-cache"]) == 1
+    assert "a.csv" in capsys.readouterr().err
+    assert not out.exists()
+
+
+def test_run_rejects_names_outside_the_output_directory(tmp_path, capsys):
+    for i, name in enumerate(["../escape", "/tmp/abs", "sub\\dir"]):
+        (tmp_path / f"{i}.json").write_text(json.dumps(dict(CONFIG, name=name)))
+    out = tmp_path / "out"
+    assert main(["run", str(tmp_path), "-o", str(out), "--no-disk-cache"]) == 1
+    assert capsys.readouterr().err.count("without directories") == 3
+    assert not (tmp_path / "escape.csv").exists()
+
+
+def test_workers_open_the_parents_disk_cache(tmp_path):
+    from rossfilter import cli
+    from rossfilter.disk_cache import disable_disk_cache, get_disk_cache
+
+    try:
+        cli._init_worker(tmp_path, 10_000)
+        assert get_disk_cache().root == tmp_path and get_disk_cache().max_bytes == 10_000
+    finally:
+        disable_disk_cache()
+
+
+def test_cli_does_not_import_gui_toolkits():
+    code = (
+        "import sys, rossfilter.cli; "
+        "print([m for m in ('tkinter', 'customtkinter', 'matplotlib') if m in sys.modules])"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import xraydb
+
+from rossfilter import material
+from rossfilter.attenuation import cached_mu, get_attenuation_cache, stacks_transmission
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.filter import Channel
+from rossfilter.material import MaterialError, MaterialRegistry, define_compound, get_material_list
+from rossfilter.parallel import prefetch_mu
+
+E = np.linspace(5000.0, 30000.0, 401)
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry(monkeypatch):
+    """Swap in an empty process-wide registry so the test compounds do not leak into other tests."""
+    monkeypatch.setattr(material, "_registry", MaterialRegistry())
+
+
+def test_formula_compound_matches_xraydb():
+    define_compound("test-zinc-selenide", 5.27, formula="ZnSe")
+    expected = xraydb.material_mu("ZnSe", E, density=5.27)
+    np.testing.assert_allclose(cached_mu("test-zinc-selenide", E), expected, rtol=1e-12)
+    assert "test-zinc-selenide" in get_material_list()
+
+
+def test_mass_fraction_mixture_of_materials():
+    info = define_compound("test-doped-kapton", 1.5, mass_fractions={"kapton": 0.95, "W": 0.05})
+    assert sum(info.mass_fractions.values()) == pytest.approx(1.0)
+    assert info.mass_fractions["W"] == pytest.approx(0.05)
+    # A mixture's mass attenuation is the mass-weighted sum of its components'.
+    expected = 1.5 * (0.95 * xraydb.material_mu("kapton", E, density=1.0)
+                      + 0.05 * xraydb.material_mu("W", E, density=1.0))
+    np.testing.assert_allclose(cached_mu("test-doped-kapton", E), expected, rtol=1e-10)
+    # Explicit densities override the compound default.
+    np.testing.assert_allclose(cached_mu("test-doped-kapton", E, density=3.0),
+                               2 * cached_mu("test-doped-kapton", E), rtol=1e-12)
+
+
+def test_new_mixture_reuses_elemental_rows():
+    define_compound("test-steel-a", 7.9, mass_fractions={"Fe": 0.7, "Cr": 0.19, "Ni": 0.11})
+    cached_mu("test-steel-a", E)
+    define_compound("test-steel-b", 7.9, mass_fractions={"Fe": 0.74, "Cr": 0.18, "Ni": 0.08})
+    misses = get_attenuation_cache().stats()["misses"]
+    cached_mu("test-steel-b", E)
+    assert get_attenuation_cache().stats()["misses"] == misses + 1  # only the mixture itself
+
+
+def test_uncached_and_prefetch_paths_agree():
+    define_compound("test-brass", 8.5, mass_fractions={"Cu": 0.65, "Zn": 0.35})
+    direct = stacks_transmission([[("test-brass", None, 1e-3)]], E)[0]
+    assert prefetch_mu([("test-brass", None)], E + 1.0, executor="thread") >= 1
+    np.testing.assert_allclose(direct, np.exp(-cached_mu("test-brass", E) * 1e-3), rtol=1e-12)
+
+
+def test_channel_and_calculator_accept_compounds():
+    define_compound("test-bronze", 8.8, formula="Cu0.88Sn0.12")
+    channel = Channel()
+    assert channel.add_filter("test-bronze", 1e-3) == (True, "")
+    assert np.all(channel.calculate_transmission(E) < 1)
+
+    calc = RossFilterCalculator()
+    assert calc.define_compound("test-bronze", 8.8, formula="Cu0.88Sn0.12")[0]  # same definition
+    ok, msg = calc.define_compound("test-bronze", 9.0, formula="Cu0.88Sn0.12")
+    assert not ok and "already defined" in msg
+
+
+def test_invalid_definitions():
+    registry = MaterialRegistry()
+    with pytest.raises(MaterialError):
+        registry.define("copper", 8.9, formula="Cu")  # named material
+    with pytest.raises(MaterialError):
+        registry.define("x", 1.0, mass_fractions={"unobtainium": 1.0})
+    with pytest.raises(MaterialError):
+        registry.define("x", 1.0, mass_fractions={"Fe": -0.1})
+    with pytest.raises(MaterialError):
+        registry.define("x", 0.0, formula="Fe")
+    with pytest.raises(MaterialError):
+        registry.define("x", 1.0)
+    assert registry.resolve("x") is None
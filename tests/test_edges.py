@@ -0,0 +1,50 @@
+import numpy as np
+import xraydb
+
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.edges import BAND_LEVELS, difference_bands, get_edge_index
+
+trapezoid = getattr(np, "trapezoid", None) or np.trapz  # np.trapz before NumPy 2.0
+
+
+def test_index_matches_xraydb_edges():
+    index = get_edge_index()
+    assert np.all(np.diff(index.energy_ev) >= 0)
+    for elem in ("O", "Cu", "W", "U"):
+        idx = index.select(elements=[elem])
+        expected = {lv: edge.energy for lv, edge in xraydb.xray_edges(elem).items()}
+        assert dict(zip([label.split()[1] for label in index.labels(idx)], index.energy_ev[idx])) == expected
+
+
+def test_select_by_material_and_level():
+    index = get_edge_index()
+    idx = index.select(5000.0, 15000.0, materials=["kapton", "Cu", "nickel"], levels=BAND_LEVELS)
+    assert index.labels(idx) == ["Ni K", "Cu K"]
+    np.testing.assert_array_equal(index.energy_ev[idx], [xraydb.xray_edges("Ni")["K"].energy,
+                                                          xraydb.xray_edges("Cu")["K"].energy])
+
+
+def test_difference_bands_pick_the_largest_segment():
+    energy = np.linspace(0.0, 10.0, 1001)
+    box = np.where((energy > 4.0) & (energy < 6.0), 1.0 - 0.1 * np.abs(energy - 4.5), 0.0)
+    band, = difference_bands(energy, [box], [np.array([2.0, 4.0, 6.0])])
+    assert (band.lo_ev, band.hi_ev) == (4.0, 6.0)
+    assert band.peak_ev == energy[np.argmax(box)] and band.peak == box.max()
+    np.testing.assert_allclose(band.integral, trapezoid(box, energy))
+    assert difference_bands(energy, [], []) == []
+
+
+def test_calculator_annotates_ross_pair_bands():
+    calc = RossFilterCalculator()
+    for material in ("Ni", "Cu", "Zn"):
+        calc.add_filter_to_channel(calc.add_channel(), material, 10.0)
+    ok, result = calc.calculate_transmission(5.0, 15.0, 0.01)
+    assert ok, result
+    k = {e: xraydb.xray_edges(e)["K"].energy for e in ("Ni", "Cu", "Zn")}
+    assert [(b.lo_ev, b.hi_ev) for b in result.bands] == [(k["Ni"], k["Cu"]), (k["Cu"], k["Zn"])]
+    for band, diff in zip(result.bands, result.differences):
+        inside = (result.energies_ev >= band.lo_ev) & (result.energies_ev <= band.hi_ev)
+        assert band.peak == diff[inside].max()
+
+    ok, (energies, labels) = calc.absorption_edges(5000.0, 15000.0, [0, 2])
+    assert ok and labels == ["Ni K", "Zn K"]
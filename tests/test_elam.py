@@ -0,0 +1,39 @@
+import threading
+
+import numpy as np
+import pytest
+import xraydb
+
+from rossfilter import elam
+
+
+@pytest.mark.parametrize("material,density", [("Cu", None), ("kapton", None), ("water", None), ("ZnSe", 5.27)])
+def test_material_mu_matches_xraydb(material, density):
+    energy = np.geomspace(100.0, 800_000.0, 5001)
+    expected = xraydb.material_mu(material, energy, density=density)
+    np.testing.assert_array_equal(elam.material_mu(material, energy, density), expected)
+
+
+def test_mu_elam_matches_xraydb_at_knots_and_edges():
+    tables = elam.get_elam_store().load(["Pb"])["Pb"]
+    knots = np.exp(tables.photo[0])
+    energy = np.append(knots[(knots >= 100.0) & (knots <= 800_000.0)], xraydb.xray_edges("Pb")["K"].energy)
+    np.testing.assert_array_equal(elam.mu_elam("Pb", energy), xraydb.mu_elam("Pb", energy))
+
+
+def test_unknown_material_and_missing_density():
+    with pytest.raises(ValueError):
+        elam.material_mu("NotAMaterial", 1000.0)
+    with pytest.raises(ValueError):
+        elam.material_mu("ZnSe", 1000.0)
+
+
+def test_one_connection_per_thread():
+    conns = []
+    thread = threading.Thread(target=lambda: conns.append(elam.get_connection()))
+    thread.start()
+    thread.join()
+    assert elam.get_connection() is elam.get_connection()
+    assert conns[0] is not elam.get_connection()
+    with pytest.raises(Exception):
+        elam.get_connection().execute("CREATE TABLE t (x)")
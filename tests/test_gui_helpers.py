@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from rossfilter.gui import _parse_composition  # noqa: E402
+
+
+def test_parse_formula():
+    assert _parse_composition("  Fe0.7Cr0.19Ni0.11 ") == ("Fe0.7Cr0.19Ni0.11", None)
+
+
+def test_parse_mass_fractions():
+    assert _parse_composition("kapton: 0.95, W: 0.05") == (None, {"kapton": 0.95, "W": 0.05})
+
+
+@pytest.mark.parametrize("text", ["", "   ", "kapton: x", "kapton: 0.9, W"])
+def test_parse_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        _parse_composition(text)
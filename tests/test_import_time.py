@@ -0,0 +1,31 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("xraydb", "scipy", "sqlalchemy", "matplotlib")
+
+
+def imported_modules(module: str) -> set[str]:
+    """Modules reported by ``-X importtime`` for a cold ``import module``."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, check=True)
+    return {
+        line.rsplit("|", 1)[1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:") and "cumulative" not in line
+    }
+
+
+@pytest.mark.parametrize("module", ["rossfilter", "rossfilter.units"])
+def test_library_import_defers_xraydb(module):
+    loaded = imported_modules(module)
+    assert module in loaded
+    assert not [m for m in HEAVY if m in loaded]
+
+
+def test_gui_import_defers_backend():
+    pytest.importorskip("customtkinter")
+    loaded = imported_modules("rossfilter.gui")
+    assert "rossfilter.gui" in loaded
+    assert not [m for m in HEAVY if m in loaded]
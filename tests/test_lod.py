@@ -0,0 +1,40 @@
+import numpy as np
+
+from rossfilter.lod import decimate, envelope_indices, pixel_columns
+
+
+def edge_curve(n):
+    x = np.linspace(1000.0, 30000.0, n)
+    y = np.exp(-2e8 / x ** 2) * np.where(x > 8979.0, 0.3, 1.0)
+    return x, y
+
+
+def test_envelope_keeps_extremes_and_edge():
+    x, y = edge_curve(1_000_000)
+    xd, yd = decimate(x, y, n_columns=1000)
+    assert xd.size <= 4 * 1000
+    assert np.all(np.diff(xd) > 0)
+    # Per column the decimated min/max equal the full-resolution ones.
+    starts = pixel_columns(x, x[0], x[-1], 1000).starts
+    kept = np.searchsorted(xd, x[starts])
+    np.testing.assert_array_equal(np.maximum.reduceat(y, starts), np.maximum.reduceat(yd, kept))
+    np.testing.assert_array_equal(np.minimum.reduceat(y, starts), np.minimum.reduceat(yd, kept))
+    # The points on both sides of the edge survive.
+    i = np.searchsorted(x, 8979.0)
+    assert x[i - 1] in xd and x[i] in xd
+
+
+def test_visible_range_and_small_inputs():
+    x, y = edge_curve(100_000)
+    xd, yd = decimate(x, y, 5000.0, 6000.0, n_columns=200)
+    assert xd[0] < 5000.0 <= xd[1] and xd[-2] <= 6000.0 < xd[-1]  # one neighbour outside each side
+    small_x, small_y = edge_curve(50)
+    xd, yd = decimate(small_x, small_y, n_columns=200)
+    np.testing.assert_array_equal(xd, small_x)
+
+
+def test_nan_is_ignored():
+    x, y = edge_curve(10_000)
+    y[100:200] = np.nan
+    idx = envelope_indices(y, pixel_columns(x, x[0], x[-1], 50))
+    assert np.all(np.diff(idx) > 0) and idx[-1] == x.size - 1
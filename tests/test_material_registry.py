@@ -0,0 +1,57 @@
+import numpy as np
+
+from rossfilter.batch import default_densities
+from rossfilter.filter import Channel
+from rossfilter.material import MaterialRegistry, get_material_list, validate_material
+
+
+def test_resolve_names_formulas_and_unknowns():
+    registry = MaterialRegistry()
+    kapton = registry.resolve("Kapton")
+    assert kapton.named and kapton.formula == "C22H10N2O5" and kapton.density == 1.42
+    assert registry.resolve("Cu").named  # formula of the named material "copper"
+    znse = registry.resolve("ZnSe")
+    assert not znse.named and znse.composition == {"Zn": 1, "Se": 1} and znse.density is None
+    assert registry.resolve("V").density > 0  # bare element: elemental density
+    assert registry.resolve("notamaterial") is None
+    assert registry.resolve("") is None
+    assert registry.resolve("ZnSe") is znse  # cached
+
+
+def test_validation_matches_previous_rules():
+    assert validate_material("copper", 0.01) == (True, "")
+    ok, msg = validate_material("unobtainium")
+    assert not ok and "not found" in msg
+    assert not validate_material("copper", -1.0)[0]
+    assert not validate_material("ZnSe")[0]  # formula without density
+    assert validate_material("ZnSe", density=5.27)[0]
+    assert get_material_list() == sorted(get_material_list()) and "kapton" in get_material_list()
+
+
+def test_validate_many_resolves_each_material_once():
+    registry = MaterialRegistry()
+    materials = ["copper", "ZnSe", "bogus", "aluminum"] * 1000
+    densities = [None, 5.27, None, None] * 1000
+    thicknesses = np.full(len(materials), 1e-3)
+    thicknesses[3] = 0.0
+    valid, messages = registry.validate_many(materials, thicknesses, densities)
+    assert valid.sum() == 3 * 1000 - 1
+    assert not valid[2] and "bogus" in messages[2]
+    assert messages[3] == "Thickness must be positive"
+    assert len(registry._resolved) == 4
+
+
+def test_channel_accepts_formula_with_density():
+    channel = Channel()
+    assert channel.add_filter("ZnSe", 1e-3, density=5.27) == (True, "")
+    assert not channel.add_filter("ZnSe", 1e-3)[0]
+    assert len(channel) == 1
+    assert np.all(channel.calculate_transmission([5000.0, 8000.0]) < 1.0)
+
+
+def test_warm_up_and_default_densities():
+    registry = MaterialRegistry()
+    registry.warm_up_async().join()
+    assert len(registry._resolved) == len(registry.names())
+    densities = default_densities(["copper", "Ni", "ZnSe"])
+    assert densities[0] > 8 and densities[1] > 8 and np.isnan(densities[2])
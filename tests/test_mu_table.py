@@ -0,0 +1,42 @@
+import numpy as np
+import xraydb
+
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter import mu_table
+from rossfilter.mu_table import EDGE_RTOL, MuTable, get_mu_table
+
+
+def test_table_within_bound_and_keeps_edges_sharp():
+    table = MuTable("Cu", rtol=1e-3)
+    energy = np.geomspace(200.0, 50000.0, 5000)
+    direct = xraydb.material_mu("Cu", energy)
+    err = np.abs(table(energy) / direct - 1.0)
+    for edge in table.edges:
+        err[(energy > edge * (1 - EDGE_RTOL)) & (energy < edge * (1 + EDGE_RTOL))] = 0.0
+    assert err.max() < 1e-3
+
+    k_edge = xraydb.xray_edges("Cu")["K"].energy
+    below, above = table(np.array([k_edge * 0.999, k_edge * 1.001]))
+    assert above / below > 5
+
+
+def test_calculator_table_mode_matches_direct():
+    results = []
+    for rtol in (None, 1e-4):
+        calc = RossFilterCalculator(table_rtol=rtol)
+        calc.add_channel()
+        calc.add_filter_to_channel(0, 'Al', 10.0)
+        ok, result = calc.calculate_transmission(1.0, 30.0, 0.1)
+        assert ok, result
+        results.append(result.transmissions[0])
+    np.testing.assert_allclose(results[1], results[0], rtol=1e-3, atol=1e-6)
+
+
+def test_shared_tables_are_bounded(monkeypatch):
+    monkeypatch.setattr(mu_table, "MAX_TABLES", 2)
+    monkeypatch.setattr(mu_table, "_tables", mu_table.OrderedDict())
+    al = get_mu_table("Al", rtol=1e-2)
+    get_mu_table("Cu", rtol=1e-2)
+    assert get_mu_table("Al", rtol=1e-2) is al
+    get_mu_table("Ti", rtol=1e-2)
+    assert list(mu_table._tables) == [("Al", None, 1e-2), ("Ti", None, 1e-2)]
@@ -0,0 +1,34 @@
+import numpy as np
+import xraydb
+
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.optimizer import match_pairs
+
+
+def test_pair_solution_matches_brute_force():
+    energies = np.arange(2000.0, 30000.0, 50.0)
+    band = (xraydb.xray_edges("Ni")["K"].energy, xraydb.xray_edges("Cu")["K"].energy)
+    (solution,) = match_pairs([("Cu", "Ni")], band, 10e-4, energies)
+
+    mu_cu = xraydb.material_mu("Cu", energies)
+    mu_ni = xraydb.material_mu("Ni", energies, density=xraydb.atomic_density("Ni"))
+    outside = (energies < band[0]) | (energies > band[1])
+    grid = np.linspace(0.5, 2.0, 3001) * 10e-4
+    cost = [np.mean((np.exp(-mu_cu * 10e-4) - np.exp(-mu_ni * t))[outside] ** 2) for t in grid]
+    assert abs(solution.thickness2_cm - grid[np.argmin(cost)]) < 1e-3 * solution.thickness2_cm
+    assert solution.max_mismatch < 0.05
+
+
+def test_many_pairs_and_calculator_wrapper():
+    energies = np.arange(2000.0, 30000.0, 100.0)
+    pairs = [("Cu", "Ni"), ("Ni", "Co")] * 5
+    bands = [(8333.0, 8979.0), (7709.0, 8333.0)] * 5
+    solutions = match_pairs(pairs, bands, 5e-4, energies)
+    assert len(solutions) == 10
+    assert solutions[0].thickness2_cm == solutions[2].thickness2_cm
+
+    ok, solution = RossFilterCalculator().optimize_ross_pair("Cu", "Ni", 8.333, 8.979, 10.0, 2.0, 30.0, 0.05)
+    assert ok, solution
+    assert solution.thickness1_cm == 10e-4
+    ok, msg = RossFilterCalculator().optimize_ross_pair("Cu", "Ni", 9.0, 8.0, 10.0, 2.0, 30.0, 0.05)
+    assert not ok
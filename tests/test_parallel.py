@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from rossfilter.attenuation import get_attenuation_cache
+from rossfilter.calculator import RossFilterCalculator
+
+
+def _calculator():
+    calc = RossFilterCalculator()
+    for materials in (("Be", "Al"), ("Al", "Cu"), ("kapton",)):
+        idx = calc.add_channel()
+        for material in materials:
+            calc.add_filter_to_channel(idx, material, 10.0)
+    return calc
+
+
+@pytest.mark.parametrize("executor,split", [("thread", "materials"), ("thread", "energy"), ("process", "energy")])
+def test_parallel_matches_serial(executor, split):
+    get_attenuation_cache().clear()
+    ok, serial = _calculator().calculate_transmission(1.0, 30.0, 0.25)
+    assert ok, serial
+
+    get_attenuation_cache().clear()
+    ok, parallel = _calculator().calculate_transmission(1.0, 30.0, 0.25, executor=executor,
+                                                        max_workers=2, split=split)
+    assert ok, parallel
+    for a, b in zip(serial.transmissions, parallel.transmissions):
+        np.testing.assert_array_equal(a, b)
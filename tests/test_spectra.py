@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from rossfilter.calculator import RossFilterCalculator, TransmissionResult
+from rossfilter.spectra import SpectrumIntegrator, quadrature_weights
+
+trapezoid = getattr(np, "trapezoid", None) or np.trapz  # np.trapz before NumPy 2.0
+
+
+@pytest.mark.parametrize("n", [9, 10])
+def test_simpson_weights_exact_for_quadratics_on_uneven_grid(n):
+    rng = np.random.default_rng(0)
+    e = np.sort(rng.uniform(0.0, 2.0, n))
+    e[0], e[-1] = 0.0, 2.0
+    f = 3 * e**2 - e + 1
+    exact = 8.0 - 2.0 + 2.0
+    w = quadrature_weights(e, "simpson")
+    if n % 2:  # even number of intervals: Simpson throughout
+        assert f @ w == pytest.approx(exact, rel=1e-12)
+    else:
+        assert f @ w == pytest.approx(exact, rel=1e-2)
+    assert np.sum(quadrature_weights(e)) == pytest.approx(2.0)
+
+
+def test_signals_match_direct_integration():
+    calc = RossFilterCalculator()
+    calc.add_channel()
+    calc.add_filter_to_channel(0, "Cu", 10.0)
+    calc.add_channel()
+    calc.add_filter_to_channel(1, "nickel", 10.0)
+    ok, result = calc.calculate_transmission(2.0, 20.0, 0.05, adaptive_tol=1e-3)
+    assert ok
+    e = result.energies_ev
+
+    detector = (np.array([0.0, 30000.0]), np.array([1.0, 0.5]))
+    integrator = SpectrumIntegrator(result, detector=detector)
+
+    # Many shots on their own tabulated grid, folded through the kernels.
+    table = np.linspace(1000.0, 25000.0, 500)
+    rng = np.random.default_rng(1)
+    spectra = rng.uniform(0.5, 1.5, (200, 1)) * np.exp(-table / 8000.0)
+    signals = integrator.signals(spectra, table)
+    assert signals.channels.shape == (200, 2) and signals.differences.shape == (200, 1)
+
+    d = np.interp(e, *detector)
+    for s in (0, 57, 199):
+        on_grid = np.interp(e, table, spectra[s])
+        expected = [trapezoid(on_grid * d * t, e) for t in result.transmissions]
+        np.testing.assert_allclose(signals.channels[s], expected, rtol=1e-10)
+        np.testing.assert_allclose(signals.differences[s], trapezoid(on_grid * d * result.differences[0], e),
+                                   rtol=1e-10)
+
+    # Spectra already on the result grid give the same numbers.
+    on_grid = np.array([np.interp(e, table, sp) for sp in spectra[:3]])
+    np.testing.assert_allclose(integrator.signals(on_grid).channels, signals.channels[:3], rtol=1e-10)
+
+
+def test_rejects_mismatched_spectrum():
+    result = TransmissionResult(np.linspace(1.0, 2.0, 5), [np.ones(5)], [], [[]])
+    with pytest.raises(ValueError):
+        SpectrumIntegrator(result).signals(np.ones(4))
@@ -0,0 +1,61 @@
+import numpy as np
+
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.stream import BandIntegral, EdgeLocator, MaxDifference
+
+trapezoid = getattr(np, "trapezoid", None) or np.trapz  # np.trapz before NumPy 2.0
+
+
+def make_calculator():
+    calc = RossFilterCalculator()
+    calc.add_channel()
+    calc.add_filter_to_channel(0, "Cu", 10.0)
+    calc.add_channel()
+    calc.add_filter_to_channel(1, "nickel", 10.0)
+    calc.add_filter_to_channel(1, "kapton", 25.0)
+    return calc
+
+
+def test_chunks_match_full_result():
+    calc = make_calculator()
+    ok, full = calc.calculate_transmission(5.0, 15.0, 0.01)
+    assert ok
+
+    chunks = list(calc.iter_transmission(5.0, 15.0, 0.01, chunk_points=97))
+    assert max(c.energies_ev.size for c in chunks) == 97
+    np.testing.assert_array_equal(np.concatenate([c.energies_ev for c in chunks]), full.energies_ev)
+    streamed = np.concatenate([c.transmissions for c in chunks], axis=1)
+    np.testing.assert_allclose(streamed, np.array(full.transmissions), rtol=1e-12)
+    diffs = np.concatenate([c.differences for c in chunks], axis=1)
+    np.testing.assert_allclose(diffs, np.array(full.differences), rtol=1e-10, atol=1e-15)
+
+
+def test_reducers_match_full_arrays():
+    calc = make_calculator()
+    _, full = calc.calculate_transmission(5.0, 15.0, 0.01)
+    e, t, d = full.energies_ev, np.array(full.transmissions), np.array(full.differences)
+    bands = [(6000.0, 8000.0), (8400.0, 9200.0)]
+
+    ok, (integrals, peak, edges) = calc.reduce_transmission(
+        5.0, 15.0, 0.01, [BandIntegral(bands), MaxDifference(), EdgeLocator()], chunk_points=50)
+    assert ok
+
+    channels, differences = integrals
+    for b, (lo, hi) in enumerate(bands):
+        m = (e >= lo) & (e <= hi)
+        np.testing.assert_allclose(channels[b], trapezoid(t[:, m], e[m], axis=1), rtol=1e-9)
+        np.testing.assert_allclose(differences[b], trapezoid(d[:, m], e[m], axis=1), rtol=1e-9)
+
+    np.testing.assert_allclose(peak[0], d.max(axis=1))
+    assert peak[1][0] == e[np.argmax(d[0])]
+
+    cu_edges = [energy for energy, _ in edges[0]]
+    ni_edges = [energy for energy, _ in edges[1]]
+    assert len(cu_edges) == 1 and abs(cu_edges[0] - 8979.0) < 10
+    assert len(ni_edges) == 1 and abs(ni_edges[0] - 8333.0) < 10
+
+
+def test_invalid_stream_range():
+    calc = make_calculator()
+    ok, msg = calc.reduce_transmission(10.0, 5.0, 0.1, [MaxDifference()])
+    assert not ok and "less than" in msg
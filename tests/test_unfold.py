@@ -0,0 +1,48 @@
+import numpy as np
+from scipy.optimize import nnls
+
+from rossfilter.calculator import RossFilterCalculator
+from rossfilter.unfold import Unfolder
+
+# Ross channels across the Fe..Cu K edges (eV)
+MATERIALS = ["iron", "cobalt", "nickel", "copper", "zinc"]
+BINS = np.array([5000.0, 7112.0, 7709.0, 8333.0, 8979.0, 9659.0, 15000.0])
+
+
+def make_result():
+    calc = RossFilterCalculator()
+    for material in MATERIALS:
+        idx = calc.add_channel()
+        calc.add_filter_to_channel(idx, material, 10.0)
+    idx = calc.add_channel()
+    calc.add_filter_to_channel(idx, "aluminum", 50.0)
+    ok, result = calc.calculate_transmission(5.0, 15.0, 0.005)
+    assert ok
+    return result
+
+
+def test_unfold_recovers_binned_spectrum():
+    unfolder = Unfolder(make_result(), BINS)
+    truth = np.array([[1.0, 2.0, 0.5, 3.0, 1.5, 0.2], [0.0, 1.0, 1.0, 0.0, 2.0, 0.5]])
+    signals = truth @ unfolder.response.T
+
+    out = unfolder.unfold(signals)
+    np.testing.assert_allclose(out.spectra, truth, atol=1e-8)
+    assert np.all(out.residuals < 1e-8 * np.abs(signals).max())
+    np.testing.assert_allclose(out.fluence, truth * np.diff(BINS), atol=1e-5)
+
+
+def test_batched_nonneg_matches_per_shot_nnls():
+    unfolder = Unfolder(make_result(), BINS, regularization=1e-3)
+    rng = np.random.default_rng(0)
+    truth = rng.uniform(0.0, 2.0, (300, len(BINS) - 1))
+    truth[::3, 2] = 0.0
+    signals = truth @ unfolder.response.T
+    signals *= rng.normal(1.0, 0.05, signals.shape)  # noise pushes some solutions negative
+
+    out = unfolder.unfold(signals)
+    assert np.all(out.spectra >= 0)
+    rhs = np.zeros(unfolder.system.shape[0])
+    for shot in range(0, 300, 7):
+        rhs[:signals.shape[1]] = signals[shot]
+        np.testing.assert_allclose(out.spectra[shot], nnls(unfolder.system, rhs)[0], atol=1e-8)